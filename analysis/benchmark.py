@@ -0,0 +1,272 @@
+import copy
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Prefix of the data line appended to benchmark_solutions output.
+BENCHMARK_MARKER = "📊 Benchmark data: "
+
+# Each timing sample repeats fast calls until it takes at least this long.
+_MIN_SAMPLE_S = 0.002
+_MAX_LOOPS = 1000
+
+
+def _quartiles(samples: List[float]) -> List[float]:
+    if len(samples) < 2:
+        return [samples[0]] * 3
+    return statistics.quantiles(samples, n=4, method="inclusive")
+
+
+def _preview(value: Any, limit: int = 60) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _fitting_variants(
+    active: List[str],
+    per_call: Dict[str, float],
+    growth: float,
+    n: int,
+    calls: int,
+    max_call_s: float,
+    remaining_s: float,
+    too_slow: set,
+    skipped: List[str],
+) -> List[str]:
+    """
+    Keep the variants whose predicted cost at the next size fits.
+
+    The time per call is predicted from the last size assuming quadratic
+    growth (``growth`` is the squared size ratio), which overestimates
+    linear and n log n solutions rather than letting a quadratic one run
+    past the budget. Each variant costs at least one minimum sample per call.
+    """
+    fitting = []
+    for name in active:
+        predicted = per_call.get(name, 0.0) * growth
+        if predicted > max_call_s:
+            too_slow.add(name)
+            skipped.append(f"{name}: predicted {predicted:.2g}s per call at n={n}, not run at this size or larger")
+            continue
+        cost = max(predicted, _MIN_SAMPLE_S) * calls
+        if cost > remaining_s:
+            # Larger sizes would cost even more
+            too_slow.add(name)
+            skipped.append(f"{name}: predicted {cost:.2g}s at n={n} exceeds the remaining time budget, not run at this size or larger")
+            continue
+        remaining_s -= cost
+        fitting.append(name)
+    return fitting
+
+
+def run_benchmark(
+    functions: Dict[str, Callable],
+    make_args: Callable[[int], Any],
+    sizes: Sequence[int],
+    repeats: int = 5,
+    warmup: int = 1,
+    max_call_s: float = 2.0,
+    time_budget_s: float = 20.0,
+    clock: Callable[[], float] = time.perf_counter,
+) -> Dict[str, Any]:
+    """
+    Time solution variants on shared inputs of increasing size.
+
+    For each size the input is generated once and deep-copied for every call,
+    so variants that mutate their arguments cannot affect each other. Warmup
+    calls also compare the variants' results. Timed repeats are interleaved
+    (the variant order rotates each round) so drift such as CPU frequency
+    changes or a noisy neighbour is spread evenly. Each sample loops fast
+    calls long enough to be measurable. Before each size, every variant's
+    cost is predicted from the previous size and variants that would not
+    fit ``max_call_s`` or the remaining budget are skipped; the budget is
+    also checked between calls, so one size cannot overrun it.
+
+    Args:
+        functions: Variant name -> callable; the first is the baseline for speedups
+        make_args: Returns the positional argument tuple for size n (non-tuples are a single argument)
+        sizes: Input sizes, ascending
+        repeats: Timed samples per variant and size
+        warmup: Untimed calls per variant and size before timing
+        max_call_s: Variants slower than this per call (measured, or predicted for the
+            next size) are not run at larger sizes
+        time_budget_s: Total time for the benchmark; variants predicted not to fit are
+            skipped, and timing stops at the budget even partway through a size
+
+    Returns:
+        Dict with variants, sizes, results ({n, variant, median_ms, iqr_ms, speedup}),
+        agree, mismatches, errors and skipped
+    """
+    names = list(functions)
+    started = clock()
+    deadline = started + time_budget_s
+    results: List[Dict[str, Any]] = []
+    mismatches: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    skipped: List[str] = []
+    too_slow: set = set()
+    measured_sizes: List[int] = []
+    # Seconds per call at the last measured size, to predict the next one
+    per_call: Dict[str, float] = {}
+    previous_n: Optional[int] = None
+
+    for n in sizes:
+        if clock() > deadline:
+            skipped.append(f"n={n} and larger: time budget of {time_budget_s:g}s reached")
+            break
+        active = [name for name in names if name not in errors and name not in too_slow]
+        if previous_n is not None:
+            active = _fitting_variants(
+                active, per_call, (n / previous_n) ** 2, n, warmup + repeats,
+                max_call_s, deadline - clock(), too_slow, skipped,
+            )
+        if not active:
+            break
+        args = make_args(n)
+        if not isinstance(args, tuple):
+            args = (args,)
+
+        # Warm up, check that results agree, and size each sample's loop count
+        loops: Dict[str, int] = {}
+        outputs: Dict[str, Any] = {}
+        samples: Dict[str, List[float]] = {}
+        for name in active:
+            if clock() > deadline:
+                break
+            try:
+                for _ in range(max(1, warmup)):
+                    call_args = copy.deepcopy(args)
+                    call_started = clock()
+                    outputs[name] = functions[name](*call_args)
+                    elapsed = clock() - call_started
+                    if elapsed > max_call_s or clock() > deadline:
+                        break
+            except Exception as e:
+                errors[name] = f"n={n}: {type(e).__name__}: {e}"
+                continue
+            if elapsed > max_call_s:
+                # Too slow to time repeatedly: report the one call
+                samples[name] = [elapsed]
+                continue
+            loops[name] = min(_MAX_LOOPS, max(1, int(_MIN_SAMPLE_S / max(elapsed, 1e-9)) + 1))
+        if len(outputs) > 1:
+            reference = names[0] if names[0] in outputs else next(iter(outputs))
+            for name, output in outputs.items():
+                if name != reference and output != outputs[reference]:
+                    mismatches.append({
+                        "n": n,
+                        "variant": name,
+                        "expected": _preview(outputs[reference]),
+                        "got": _preview(output),
+                    })
+
+        samples.update({name: [] for name in loops})
+        out_of_time = False
+        for round_index in range(repeats):
+            order = list(loops)
+            shift = round_index % len(order) if order else 0
+            for name in order[shift:] + order[:shift]:
+                if clock() > deadline:
+                    out_of_time = True
+                    break
+                batch = [copy.deepcopy(args) for _ in range(loops[name])]
+                sample_started = clock()
+                for call_args in batch:
+                    functions[name](*call_args)
+                samples[name].append((clock() - sample_started) / loops[name])
+            if out_of_time:
+                break
+
+        samples = {name: values for name, values in samples.items() if values}
+        if samples:
+            measured_sizes.append(n)
+        baseline = statistics.median(samples[names[0]]) if names[0] in samples else None
+        for name in names:
+            if name not in samples:
+                continue
+            median = statistics.median(samples[name])
+            q1, _, q3 = _quartiles(samples[name])
+            results.append({
+                "n": n,
+                "variant": name,
+                "median_ms": round(median * 1000, 4),
+                "iqr_ms": round((q3 - q1) * 1000, 4),
+                "speedup": round(baseline / median, 2) if baseline and median else None,
+            })
+            per_call[name] = median
+            if median > max_call_s:
+                too_slow.add(name)
+                skipped.append(f"{name}: over {max_call_s:g}s per call at n={n}, not run at larger sizes")
+        if clock() > deadline:
+            partial = " (fewer samples)" if out_of_time or len(samples) < len(active) else ""
+            skipped.append(f"time budget of {time_budget_s:g}s reached at n={n}{partial}")
+            break
+        previous_n = n
+
+    return {
+        "variants": names,
+        "sizes": measured_sizes,
+        "results": results,
+        "agree": not mismatches,
+        "mismatches": mismatches[:5],
+        "errors": errors,
+        "skipped": skipped,
+    }
+
+
+def format_benchmark_table(report: Dict[str, Any]) -> str:
+    """Render the results as a compact markdown table (one row per size)."""
+    baseline = report["variants"][0]
+    header = "| n | " + " | ".join(
+        f"{name} ms (IQR)" + ("" if name == baseline else " ×") for name in report["variants"]
+    ) + " |"
+    lines = [header, "|" + "---|" * (len(report["variants"]) + 1)]
+    by_size: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    for row in report["results"]:
+        by_size.setdefault(row["n"], {})[row["variant"]] = row
+    for n in report["sizes"]:
+        cells = []
+        for name in report["variants"]:
+            row = by_size[n].get(name)
+            if row is None:
+                cells.append("—")
+                continue
+            cell = f"{row['median_ms']:.4g} (±{row['iqr_ms']:.2g})"
+            if name != baseline and row["speedup"]:
+                cell += f" {row['speedup']:g}×"
+            cells.append(cell)
+        lines.append(f"| {n} | " + " | ".join(cells) + " |")
+
+    notes = []
+    notes.append("Outputs agree." if report["agree"] else "⚠️ Outputs differ: " + "; ".join(
+        f"{m['variant']} at n={m['n']} returned {m['got']} (expected {m['expected']})" for m in report["mismatches"]
+    ))
+    notes.extend(f"⚠️ {name} failed at {error}" for name, error in report["errors"].items())
+    notes.extend(f"Skipped {note}" for note in report["skipped"])
+    return "\n".join(lines) + "\n\n" + "\n".join(notes)
+
+
+def format_benchmark(report: Dict[str, Any]) -> str:
+    """Serialize a benchmark for the tool output, on one line after BENCHMARK_MARKER."""
+    return BENCHMARK_MARKER + json.dumps(report, separators=(",", ":"))
+
+
+def parse_benchmark(text: Any) -> Optional[Dict[str, Any]]:
+    """Extract the benchmark data from benchmark_solutions output, or None if it has none."""
+    if not isinstance(text, str) or BENCHMARK_MARKER not in text:
+        return None
+    line = text.rsplit(BENCHMARK_MARKER, 1)[1].split("\n", 1)[0]
+    try:
+        report = json.loads(line)
+    except ValueError:
+        return None
+    return report if isinstance(report, dict) and isinstance(report.get("results"), list) else None
+
+
+def chart_data(report: Dict[str, Any]) -> Dict[str, Dict[int, float]]:
+    """Return {variant: {n: median ms}} for a scaling chart."""
+    data: Dict[str, Dict[int, float]] = {name: {} for name in report.get("variants", [])}
+    for row in report.get("results", []):
+        data.setdefault(row["variant"], {})[row["n"]] = row["median_ms"]
+    return data
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class ResultCache:
+    """Thread-safe LRU cache with TTL and single-flight computation.
+
+    Shared by the tools and the speculative pre-analysis so that work started
+    in the background is reused by the request that needs it.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_s: float = 3600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept (least recently used are dropped)
+            ttl_s: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            return self._get_locked(key, default)
+
+    def _get_locked(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value under key."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_s, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing it at most once.
+
+        Concurrent callers for the same key wait for the first computation
+        instead of repeating it.
+        """
+        missing = object()
+        while True:
+            with self._lock:
+                value = self._get_locked(key, missing)
+                if value is not missing:
+                    self.hits += 1
+                    return value
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another thread is computing this key; wait and re-check.
+            event.wait()
+
+        try:
+            value = compute()
+            self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_result_cache = None
+
+def get_result_cache():
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+    return _result_cache
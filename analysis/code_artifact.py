@@ -0,0 +1,82 @@
+import ast
+from functools import cached_property
+from types import CodeType
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from analysis.cache import ResultCache
+from analysis.fingerprint import ast_fingerprint, parse_code, source_hash
+from analysis.problems import recognize_problem
+from analysis.profiling import USER_FILENAME
+from analysis.static_complexity import analyze_complexity
+
+
+class CodeArtifact:
+    """One source text, parsed once and shared by every stage that handles it.
+
+    Created through ``get_code_artifact`` so the snapshot store, the REPL,
+    the analyzers, the prompt builder and the caches all reuse the same AST,
+    code object and keys. ``hash`` identifies the exact text (line numbers
+    matter, e.g. hotspots); ``fingerprint`` identifies the program structure
+    (formatting and comments do not matter, e.g. test cases). Derived values
+    are computed on first use.
+    """
+
+    def __init__(self, source: str):
+        """
+        Parse the source.
+
+        Args:
+            source: Python source text
+        """
+        self.source = source
+        self.hash = source_hash(source)
+        self.tree, self.syntax_error = parse_code(source)
+        self.fingerprint = ast_fingerprint(self.tree) if self.tree is not None else self.hash
+
+    @property
+    def snapshot_id(self) -> str:
+        """Short ID used for code snapshots in the conversation."""
+        return self.hash[:12]
+
+    @cached_property
+    def compiled(self) -> Optional[CodeType]:
+        """Code object for execution (compiled from the AST, not re-parsed), or None on a syntax error."""
+        if self.tree is None:
+            return None
+        return compile(self.tree, USER_FILENAME, "exec")
+
+    @cached_property
+    def names(self) -> FrozenSet[str]:
+        """Every variable name the code reads or assigns."""
+        if self.tree is None:
+            return frozenset()
+        return frozenset(node.id for node in ast.walk(self.tree) if isinstance(node, ast.Name))
+
+    @cached_property
+    def signatures(self) -> List[str]:
+        """Top-level function signatures, e.g. ``two_sum(nums, target)``."""
+        if self.tree is None:
+            return []
+        return [
+            f"{node.name}({ast.unparse(node.args)})"
+            for node in self.tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+
+    @cached_property
+    def problem(self) -> Optional[str]:
+        """Problem the code solves, if recognized."""
+        return recognize_problem(self.tree) if self.tree is not None else None
+
+    @cached_property
+    def static_complexity(self) -> Dict[str, Any]:
+        """Local static complexity analysis (see ``analyze_complexity``)."""
+        return analyze_complexity(self.source, self.tree)
+
+
+_code_artifacts = ResultCache(max_entries=256)
+
+
+def get_code_artifact(source: str) -> CodeArtifact:
+    """Return the shared artifact for ``source``, creating it on first use."""
+    return _code_artifacts.get_or_compute(source_hash(source), lambda: CodeArtifact(source))
@@ -0,0 +1,66 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+
+class Hotspot(BaseModel):
+    """One line (or construct) that drives the complexity."""
+    line: Optional[int] = Field(None, description="1-based line number, if the note is about a specific line")
+    note: str = Field(description="What happens there, in a few words")
+    cost: str = Field(description="Big-O cost of this part, e.g. O(n)")
+
+
+class ComplexityAnalysis(BaseModel):
+    """Compact complexity result shared by the LLM tool, local analysis and the UI."""
+    time: str = Field(description="Overall time complexity in Big-O, e.g. O(n log n)")
+    space: str = Field(description="Auxiliary space complexity in Big-O, e.g. O(n)")
+    approach: str = Field("", description="One sentence describing the algorithm")
+    hotspots: List[Hotspot] = Field(default_factory=list, description="At most 4 hotspots")
+    suggestions: List[str] = Field(default_factory=list, description="At most 3 short optimization suggestions")
+    confidence: str = Field("high", description="high, medium or low")
+    source: str = Field("llm", description="Where the result came from: llm or static")
+
+
+def from_static(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a local static analysis result to the shared structure."""
+    return ComplexityAnalysis(
+        time=result["time"],
+        space=result["space"],
+        hotspots=[Hotspot(**h) for h in result["hotspots"]],
+        confidence=result["confidence"],
+        source="static",
+    ).model_dump()
+
+
+def parse_analysis(text: Any) -> Optional[Dict[str, Any]]:
+    """Parse a complexity_analyzer result (compact JSON), or None if it is not one."""
+    if not isinstance(text, str) or not text.startswith("{"):
+        return None
+    try:
+        return ComplexityAnalysis.model_validate(json.loads(text)).model_dump()
+    except (ValueError, ValidationError):
+        return None
+
+
+def to_compact_json(data: Dict[str, Any]) -> str:
+    """Serialize a result compactly for the tool message, omitting empty fields."""
+    return json.dumps({k: v for k, v in data.items() if v not in ("", [], None)}, separators=(",", ":"))
+
+
+def format_complexity_markdown(data: Dict[str, Any]) -> str:
+    """Render a structured result as markdown (API replies and chat history)."""
+    lines = [f"**Time Complexity:** {data['time']}", f"**Space Complexity:** {data['space']}"]
+    if data.get("approach"):
+        lines.append(f"**Approach:** {data['approach']}")
+    if data.get("hotspots"):
+        lines.append("**Hotspots:**")
+        for hotspot in data["hotspots"]:
+            where = f"Line {hotspot['line']}: " if hotspot.get("line") else ""
+            lines.append(f"- {where}{hotspot['note']} ({hotspot['cost']})")
+    if data.get("suggestions"):
+        lines.append("**Suggestions:**")
+        lines.extend(f"- {suggestion}" for suggestion in data["suggestions"])
+    if data.get("source") == "static":
+        lines.append(f"*Local static analysis · confidence: {data.get('confidence', 'low')}*")
+    return "\n".join(lines)
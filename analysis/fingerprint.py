@@ -0,0 +1,38 @@
+import ast
+import hashlib
+from typing import Optional, Tuple
+
+
+def source_hash(code: str) -> str:
+    """Return a hash of the exact source text."""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_code(code: str) -> Tuple[Optional[ast.Module], Optional[str]]:
+    """
+    Parse code into an AST.
+
+    Returns:
+        (tree, None) on success, (None, error message) on a syntax error
+    """
+    try:
+        return ast.parse(code), None
+    except SyntaxError as e:
+        return None, f"SyntaxError: {e.msg} (line {e.lineno})"
+
+
+def ast_fingerprint(tree: ast.AST) -> str:
+    """
+    Return a hash of the AST structure.
+
+    Line numbers, comments and formatting do not change the fingerprint, so
+    whitespace-only edits map to the same cached results.
+    """
+    dump = ast.dump(tree, annotate_fields=False, include_attributes=False)
+    return hashlib.sha256(dump.encode("utf-8")).hexdigest()[:16]
+
+
+def code_fingerprint(code: str) -> str:
+    """Return the AST fingerprint of code, or its source hash if it does not parse."""
+    tree, _ = parse_code(code)
+    return ast_fingerprint(tree) if tree is not None else source_hash(code)
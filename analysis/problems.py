@@ -0,0 +1,37 @@
+import ast
+from typing import Optional
+
+# Problem statements for the editor templates, keyed by the function name they define.
+KNOWN_PROBLEMS = {
+    "two_sum": (
+        "Two Sum: given an array of integers nums and an integer target, return the "
+        "indices of the two numbers that add up to target."
+    ),
+    "binary_search": (
+        "Binary Search: search for target in a sorted array and return its index, or -1 if absent."
+    ),
+    "dfs": "Depth-first search: traverse a graph given as an adjacency list from a start node.",
+    "bfs": "Breadth-first search: traverse a graph given as an adjacency list from a start node.",
+    "fibonacci": "Fibonacci: calculate the nth Fibonacci number.",
+}
+
+
+def recognize_problem(tree: ast.Module) -> Optional[str]:
+    """
+    Recognize the problem a piece of code is solving.
+
+    Template function names are matched first; otherwise the docstring of the
+    first top-level function is used as the problem statement.
+
+    Returns:
+        A problem description, or None if the problem is not recognized
+    """
+    functions = [node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    for node in functions:
+        if node.name in KNOWN_PROBLEMS:
+            return KNOWN_PROBLEMS[node.name]
+    for node in functions:
+        docstring = ast.get_docstring(node)
+        if docstring:
+            return f"{node.name}: {' '.join(docstring.split())}"
+    return None
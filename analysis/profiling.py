@@ -0,0 +1,332 @@
+import json
+import math
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Filename user code is compiled under, so the profiler can ignore library frames.
+USER_FILENAME = "<user_code>"
+
+# Prefix of each report line appended to python_repl output, by mode.
+PROFILE_MARKERS = {"profile": "📈 Line profile: ", "memory": "🧠 Memory profile: "}
+
+# Input sizes tried, in order, when measuring memory growth.
+GROWTH_SIZES = tuple(2 ** k for k in range(6, 15))
+
+# During a run, allocation sites are re-snapshotted once traced memory exceeds
+# the last snapshot by this factor plus this many bytes.
+_PEAK_SNAPSHOT_GROWTH = 1.1
+_PEAK_SNAPSHOT_MIN_BYTES = 64 * 1024
+
+
+class LineProfiler:
+    """Per-line hit counts and self time for code compiled under one filename.
+
+    Installs a ``sys.settrace`` hook that declines every frame from other
+    files, so library and builtin calls run untraced and only the user's own
+    lines pay the tracing cost. A line's time runs until the next line event
+    in its frame and includes library calls made from it, but not time spent
+    in nested user functions; those are reported per function, cumulatively.
+    """
+
+    def __init__(self, filename: str = USER_FILENAME, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize the profiler.
+
+        Args:
+            filename: Only frames of code compiled under this filename are traced
+            clock: High-resolution time source (seconds)
+        """
+        self.filename = filename
+        self.clock = clock
+        self.line_hits: Dict[int, int] = defaultdict(int)
+        self.line_time: Dict[int, float] = defaultdict(float)
+        # (name, first line) -> [calls, cumulative seconds, active depth]
+        self.functions: Dict[tuple, list] = {}
+        self.elapsed = 0.0
+        # [line, started] of each active traced frame, innermost last
+        self._stack: List[list] = []
+        self._previous_trace = None
+        self._started = 0.0
+
+    def __enter__(self) -> "LineProfiler":
+        self._previous_trace = sys.gettrace()
+        self._started = self.clock()
+        sys.settrace(self._trace_call)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        sys.settrace(self._previous_trace)
+        self.elapsed += self.clock() - self._started
+
+    def _trace_call(self, frame, event, arg):
+        if event != "call" or frame.f_code.co_filename != self.filename:
+            return None
+        code = frame.f_code
+        key = (code.co_name, code.co_firstlineno)
+        stats = self.functions.setdefault(key, [0, 0.0, 0])
+        stats[0] += 1
+        stats[2] += 1
+        started = self.clock()
+        # The caller's line stops accruing while this frame runs
+        if self._stack and self._stack[-1][0] is not None:
+            caller = self._stack[-1]
+            self.line_time[caller[0]] += started - caller[1]
+        # Last line seen in this frame and when it started
+        current = [None, started]
+        self._stack.append(current)
+
+        def trace_line(frame, event, arg):
+            now = self.clock()
+            if current[0] is not None:
+                self.line_time[current[0]] += now - current[1]
+            if event == "line":
+                self.line_hits[frame.f_lineno] += 1
+                current[0], current[1] = frame.f_lineno, now
+            elif event == "return":
+                current[0] = None
+                if self._stack and self._stack[-1] is current:
+                    self._stack.pop()
+                    if self._stack:
+                        self._stack[-1][1] = now
+                stats[2] -= 1
+                # Recursive calls are counted once, by their outermost frame
+                if stats[2] == 0:
+                    stats[1] += now - started
+            return trace_line
+
+        return trace_line
+
+    def report(self, source: str, top: int = 8) -> Dict[str, Any]:
+        """
+        Return the hottest lines and functions as compact structured data.
+
+        Args:
+            source: The profiled code, to quote the hot lines
+            top: Lines (and functions) to include
+
+        Returns:
+            Dict with total_ms, lines (line, hits, self ms, pct, source) and
+            functions (name, line, calls, cumulative ms)
+        """
+        source_lines = source.splitlines()
+        total = max(self.elapsed, sum(self.line_time.values())) or 1e-9
+        hottest = sorted(self.line_time, key=self.line_time.get, reverse=True)[:top]
+        functions = sorted(
+            ((name, line, stats) for (name, line), stats in self.functions.items() if name != "<module>"),
+            key=lambda item: item[2][1],
+            reverse=True,
+        )[:top]
+        return {
+            "mode": "profile",
+            "total_ms": round(total * 1000, 2),
+            "lines": [
+                {
+                    "line": line,
+                    "hits": self.line_hits[line],
+                    "ms": round(self.line_time[line] * 1000, 2),
+                    "pct": round(100 * self.line_time[line] / total, 1),
+                    "source": source_lines[line - 1].strip()[:80] if 0 < line <= len(source_lines) else "",
+                }
+                for line in hottest
+            ],
+            "functions": [
+                {"name": name, "line": line, "calls": stats[0], "cum_ms": round(stats[1] * 1000, 2)}
+                for name, line, stats in functions
+            ],
+        }
+
+
+def _traced_bytes(snapshot: tracemalloc.Snapshot) -> int:
+    return sum(trace.size for trace in snapshot.traces)
+
+
+class MemoryProfiler:
+    """Peak memory and allocation sites of user code, measured with tracemalloc.
+
+    ``measure`` records the peak of one run above what was allocated before
+    it, and the allocation sites as they were at that peak (a sampler thread
+    snapshots the traces each time memory reaches a new high, so temporary
+    buffers freed before the run ends are still attributed). ``measure_growth``
+    repeats a call at doubling input sizes and stops as soon as the next size
+    would exceed the memory or time budget, so a quadratic memo table is
+    reported as such instead of exhausting the pod.
+
+    tracemalloc traces the whole process: peak figures include allocations
+    made by other threads during the run (sites are filtered to user code).
+    """
+
+    def __init__(self, filename: str = USER_FILENAME):
+        """
+        Initialize the profiler.
+
+        Args:
+            filename: Allocation sites are reported only for code compiled under this filename
+        """
+        self.filename = filename
+        self.peak = 0
+        self.retained = 0
+        self.growth: List[Dict[str, Any]] = []
+        self.stopped = ""
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    @contextmanager
+    def tracing(self) -> Iterator["MemoryProfiler"]:
+        """Trace allocations inside the block and keep the user's allocation sites at its end (the fallback for peak sites)."""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            yield self
+        finally:
+            self.retained = tracemalloc.get_traced_memory()[0] - baseline
+            self._snapshot = self._user_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+    def measure(self, run: Callable[[], Any]) -> int:
+        """Run ``run()`` and record its peak memory in bytes and the allocation sites at that peak (also if it raises)."""
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        done = threading.Event()
+        sampler = threading.Thread(target=self._sample_peak, args=(done,), name="memory-peak-sampler", daemon=True)
+        sampler.start()
+        try:
+            return run()
+        finally:
+            done.set()
+            sampler.join()
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - baseline)
+
+    def _sample_peak(self, done: threading.Event, interval_s: float = 0.005) -> None:
+        """Snapshot user allocations whenever traced memory grows well past the last snapshot."""
+        snapshot_at = 0
+        while not done.wait(interval_s):
+            current = tracemalloc.get_traced_memory()[0]
+            # Snapshots are costly, so take one only on a clearly higher peak
+            if current > snapshot_at * _PEAK_SNAPSHOT_GROWTH + _PEAK_SNAPSHOT_MIN_BYTES:
+                snapshot_at = current
+                self._peak_snapshot = self._user_snapshot()
+
+    def _user_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, self.filename)])
+
+    def measure_growth(
+        self,
+        call: Callable[[int], Any],
+        max_bytes: int,
+        max_seconds: float = 10.0,
+        sizes: Iterable[int] = GROWTH_SIZES,
+    ) -> None:
+        """
+        Record the peak memory of ``call(n)`` for increasing ``n``.
+
+        Args:
+            call: Runs the user's code on an input of size n
+            max_bytes: Stop before a size whose predicted peak exceeds this
+            max_seconds: Total time allowed for all sizes
+            sizes: Input sizes to try, in increasing order
+        """
+        sizes = list(sizes)
+        started = time.perf_counter()
+        for i, n in enumerate(sizes):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            call_started = time.perf_counter()
+            result = call(n)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            del result
+            seconds = time.perf_counter() - call_started
+            self.growth.append({"n": n, "peak_kb": round(peak / 1024, 1)})
+            if i + 1 == len(sizes):
+                break
+            ratio = sizes[i + 1] / n
+            predicted = peak * ratio ** max(1.0, self.growth_exponent() or 1.0)
+            if predicted > max_bytes:
+                self.stopped = (
+                    f"n={sizes[i + 1]} would need ~{predicted / 1024 ** 2:.1f} MB "
+                    f"(limit {max_bytes / 1024 ** 2:.0f} MB)"
+                )
+                break
+            # Assume the next call is at least quadratic in time, so it cannot overrun by much
+            if time.perf_counter() - started + seconds * ratio ** 2 > max_seconds:
+                self.stopped = f"time budget of {max_seconds:g}s reached"
+                break
+
+    def growth_exponent(self) -> Optional[float]:
+        """Estimate k in peak ~ n^k from the measured sizes (None until two are large enough)."""
+        # Tiny peaks are dominated by constant overhead
+        points = [point for point in self.growth if point["peak_kb"] >= 4]
+        if len(points) < 2 or points[-1]["n"] == points[0]["n"]:
+            return None
+        first, last = points[0], points[-1]
+        return round(math.log(last["peak_kb"] / first["peak_kb"]) / math.log(last["n"] / first["n"]), 1)
+
+    def report(self, source: str, top: int = 5) -> Dict[str, Any]:
+        """
+        Return peak memory, the largest allocation sites and growth as compact structured data.
+
+        Args:
+            source: The profiled code, to quote the allocation sites
+            top: Allocation sites to include
+
+        Returns:
+            Dict with peak_kb, retained_kb, sites (line, kb, count, source) of the
+            memory held at the run's peak (or when tracing ended, if more was
+            held then) and, when growth was measured, growth, growth_exponent and stopped
+        """
+        source_lines = source.splitlines()
+        snapshots = [snapshot for snapshot in (self._peak_snapshot, self._snapshot) if snapshot is not None]
+        snapshot = max(snapshots, key=_traced_bytes, default=None)
+        sites = []
+        for stat in (snapshot.statistics("lineno")[:top] if snapshot else []):
+            line = stat.traceback[0].lineno
+            sites.append({
+                "line": line,
+                "kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+                "source": source_lines[line - 1].strip()[:80] if 0 < line <= len(source_lines) else "",
+            })
+        report = {
+            "mode": "memory",
+            "peak_kb": round(self.peak / 1024, 1),
+            "retained_kb": round(max(0, self.retained) / 1024, 1),
+            "sites": sites,
+        }
+        if self.growth:
+            report["growth"] = self.growth
+            report["growth_exponent"] = self.growth_exponent()
+            if self.stopped:
+                report["stopped"] = self.stopped
+        return report
+
+
+def format_profile(report: Dict[str, Any]) -> str:
+    """Serialize a profile for the tool output, on one line after its mode's marker."""
+    return PROFILE_MARKERS[report["mode"]] + json.dumps(report, separators=(",", ":"))
+
+
+def parse_profile(text: Any, mode: str = "profile") -> Optional[Dict[str, Any]]:
+    """Extract the ``mode`` report from python_repl output, or None if it has none."""
+    marker = PROFILE_MARKERS[mode]
+    if not isinstance(text, str) or marker not in text:
+        return None
+    line = text.rsplit(marker, 1)[1].split("\n", 1)[0]
+    try:
+        report = json.loads(line)
+    except ValueError:
+        return None
+    return report if isinstance(report, dict) and report.get("mode") == mode else None
+
+
+def hot_lines(report: Optional[Dict[str, Any]], min_pct: float = 5.0) -> Dict[int, float]:
+    """Return {line: percent of run time} for the lines worth highlighting."""
+    if not report:
+        return {}
+    return {entry["line"]: entry["pct"] for entry in report.get("lines", []) if entry.get("pct", 0) >= min_pct}
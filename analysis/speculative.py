@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from analysis.cache import ResultCache, get_result_cache
+from analysis.code_artifact import CodeArtifact, get_code_artifact
+from config.settings import get_settings
+from models.rate_limiter import llm_priority
+from tools.test_case_tool import generate_test_cases
+
+# A warmer receives the parsed code artifact and returns a result worth caching, or None.
+Warmer = Callable[[CodeArtifact], Any]
+
+
+class _SessionState:
+    """Per-session debounce timer, cancellation flag and run history."""
+
+    def __init__(self):
+        self.timer: Optional[threading.Timer] = None
+        self.cancel_event: Optional[threading.Event] = None
+        self.run_times: deque = deque()
+        self.last_fingerprint: Optional[str] = None
+
+
+class SpeculativeAnalyzer:
+    """Pre-analyze editor code in the background while the user is idle.
+
+    Each edit (re)starts a debounce timer for the session. When the timer
+    fires, the code is syntax-checked and fingerprinted and the registered
+    warmers fill the shared result cache, so a later "Run & Analyze" finds
+    warm results. A newer edit cancels pending and in-flight work for the
+    session, and each session is limited to a number of runs per minute.
+    """
+
+    def __init__(
+        self,
+        debounce_s: float = 1.5,
+        max_runs_per_minute: int = 6,
+        max_workers: int = 2,
+        cache: Optional[ResultCache] = None,
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            debounce_s: Idle time after the last edit before analysis starts
+            max_runs_per_minute: Speculative runs allowed per session per minute
+            max_workers: Background threads shared by all sessions
+            cache: Result cache to warm (defaults to the shared cache)
+        """
+        self.debounce_s = debounce_s
+        self.max_runs_per_minute = max_runs_per_minute
+        self.cache = cache or get_result_cache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative")
+        self._sessions: Dict[str, _SessionState] = {}
+        self._warmers: Dict[str, Warmer] = {}
+        self._lock = threading.Lock()
+
+    def register_warmer(self, name: str, warmer: Warmer) -> None:
+        """Register a warmer whose result is stored under ``name`` in the warm results."""
+        self._warmers[name] = warmer
+
+    def schedule(self, session_id: str, code: str) -> None:
+        """Record an edit and (re)start the debounce timer for the session."""
+        with self._lock:
+            session = self._sessions.setdefault(session_id, _SessionState())
+            self._cancel_locked(session)
+            session.timer = threading.Timer(self.debounce_s, self._fire, args=(session_id, code))
+            session.timer.daemon = True
+            session.timer.start()
+
+    def cancel(self, session_id: str) -> None:
+        """Cancel pending and in-flight speculative work for the session."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._cancel_locked(session)
+
+    def forget(self, session_id: str) -> None:
+        """Cancel work and drop all state for a session."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._cancel_locked(session)
+
+    def _cancel_locked(self, session: _SessionState) -> None:
+        if session.timer is not None:
+            session.timer.cancel()
+            session.timer = None
+        if session.cancel_event is not None:
+            session.cancel_event.set()
+            session.cancel_event = None
+            # The cancelled run may not have finished, so allow the same code to run again.
+            session.last_fingerprint = None
+
+    def _fire(self, session_id: str, code: str) -> None:
+        """Debounce timer callback: apply the rate limit and submit the run."""
+        fingerprint = get_code_artifact(code).fingerprint
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.timer = None
+            if fingerprint == session.last_fingerprint:
+                return
+            while session.run_times and now - session.run_times[0] > 60:
+                session.run_times.popleft()
+            if len(session.run_times) >= self.max_runs_per_minute:
+                print(f"⏸️ Speculative analysis rate-limited for session {session_id}")
+                return
+            session.run_times.append(now)
+            session.last_fingerprint = fingerprint
+            cancel_event = session.cancel_event = threading.Event()
+        self._executor.submit(self._run, code, cancel_event)
+
+    def _run(self, code: str, cancel_event: threading.Event) -> Optional[Dict[str, Any]]:
+        """Run the speculative stages, stopping between stages if cancelled."""
+        try:
+            # Background work yields to interactive LLM calls under the shared rate limit
+            with llm_priority("speculative"):
+                return self.analyze(code, cancel_event)
+        except Exception as e:
+            print(f"⚠️ Speculative analysis failed: {e}")
+            return None
+
+    def analyze(self, code: str, cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Syntax-check, fingerprint and warm the cache for code.
+
+        Results are stored in the result cache under the code fingerprint and
+        returned. Warmers already done for this fingerprint are not repeated.
+        """
+        artifact = get_code_artifact(code)
+        key = ("speculative", artifact.fingerprint)
+        results = dict(self.cache.get(key) or {})
+        results.update({"fingerprint": artifact.fingerprint, "syntax_error": artifact.syntax_error})
+        if artifact.tree is not None:
+            results["problem"] = artifact.problem
+            for name, warmer in list(self._warmers.items()):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                if name in results:
+                    continue
+                value = warmer(artifact)
+                if value is not None:
+                    results[name] = value
+        self.cache.set(key, results)
+        return results
+
+    def warm_results(self, code: str) -> Optional[Dict[str, Any]]:
+        """Return speculative results already computed for code, if any."""
+        return self.cache.get(("speculative", get_code_artifact(code).fingerprint))
+
+
+def _warm_test_cases(artifact: CodeArtifact) -> Optional[str]:
+    """Generate test cases for a recognized problem through the cached tool."""
+    if artifact.problem is None:
+        return None
+    return generate_test_cases.invoke({"problem_description": artifact.problem})
+
+
+def _warm_static_complexity(artifact: CodeArtifact) -> Dict[str, Any]:
+    """Run the local static complexity analysis."""
+    return artifact.static_complexity
+
+
+_speculative_analyzer = None
+
+def get_speculative_analyzer():
+    global _speculative_analyzer
+    if _speculative_analyzer is None:
+        settings = get_settings()
+        _speculative_analyzer = SpeculativeAnalyzer(
+            debounce_s=settings.speculative_debounce_s,
+            max_runs_per_minute=settings.speculative_max_runs_per_minute,
+        )
+        # Cheap local work first so a cancellation still leaves something useful.
+        _speculative_analyzer.register_warmer("static_complexity", _warm_static_complexity)
+        _speculative_analyzer.register_warmer("test_cases", _warm_test_cases)
+    return _speculative_analyzer
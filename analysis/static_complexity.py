@@ -0,0 +1,614 @@
+import ast
+import re
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# A cost is (exponential, polynomial degree, log power): (0, 2, 0) is O(n^2),
+# (0, 1, 1) is O(n log n), (1, 0, 0) is O(2^n), (2, 0, 0) is O(n!). Tuples
+# compare by growth.
+Cost = Tuple[int, int, int]
+
+O_1: Cost = (0, 0, 0)
+O_LOG_N: Cost = (0, 0, 1)
+O_N: Cost = (0, 1, 0)
+O_N_LOG_N: Cost = (0, 1, 1)
+O_2_N: Cost = (1, 0, 0)
+O_N_FACTORIAL: Cost = (2, 0, 0)
+
+# Builtins that walk their whole (non-constant) argument.
+_LINEAR_BUILTINS = {"sum", "min", "max", "any", "all", "list", "set", "dict", "tuple", "frozenset"}
+# List methods that shift or scan the whole list.
+_LINEAR_METHODS = {"index", "count", "remove", "copy", "extend"}
+_MEMO_DECORATORS = {"lru_cache", "cache"}
+_MEMO_NAME = re.compile(r"memo|cache|dp|table|lookup", re.IGNORECASE)
+_VISITED_NAME = re.compile(r"visited|seen", re.IGNORECASE)
+
+
+def mul(a: Cost, b: Cost) -> Cost:
+    """Multiply two costs (nested work)."""
+    return (max(a[0], b[0]), a[1] + b[1], a[2] + b[2])
+
+
+def format_cost(cost: Cost) -> str:
+    """Format a cost as Big-O notation."""
+    if cost[0] >= 2:
+        return "O(n!)"
+    if cost[0]:
+        return "O(2^n)"
+    parts = []
+    if cost[1] == 1:
+        parts.append("n")
+    elif cost[1] > 1:
+        parts.append(f"n^{cost[1]}")
+    if cost[2] == 1:
+        parts.append("log n")
+    elif cost[2] > 1:
+        parts.append(f"log^{cost[2]} n")
+    return f"O({' '.join(parts) or '1'})"
+
+
+def _names(node: ast.AST) -> Set[str]:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _is_constant(node: ast.AST) -> bool:
+    """True if an expression involves no variables (its size cannot depend on input)."""
+    return not _names(node) and not any(isinstance(n, ast.Call) for n in ast.walk(node))
+
+
+def _call_name(call: ast.Call) -> Optional[str]:
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return call.func.attr
+    return None
+
+
+def _is_halving(node: ast.AST) -> bool:
+    """True if node contains a halving step (`// 2`, `>> 1`, `*= 2`, `mid`)."""
+    for n in ast.walk(node):
+        if isinstance(n, ast.BinOp) and isinstance(n.op, (ast.FloorDiv, ast.RShift)):
+            return True
+        if isinstance(n, ast.AugAssign) and isinstance(n.op, (ast.FloorDiv, ast.RShift, ast.Mult)):
+            return True
+        if isinstance(n, ast.Name) and n.id == "mid":
+            return True
+    return False
+
+
+def _is_euclidean(loop: ast.While) -> bool:
+    """True for loops like Euclid's gcd, whose condition variable is reassigned a remainder (`a, b = b, a % b`)."""
+    tested = _names(loop.test)
+    for node in ast.walk(loop):
+        if isinstance(node, ast.Assign) and tested & set().union(*(_names(t) for t in node.targets)):
+            if any(isinstance(n, ast.BinOp) and isinstance(n.op, ast.Mod) for n in ast.walk(node.value)):
+                return True
+        elif isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Mod) and _names(node.target) & tested:
+            return True
+    return False
+
+
+def _subscript_bases(target: ast.AST) -> List[ast.AST]:
+    """The containers written by an assignment target (`a[i]`, `a[i][j]`, `x, a[i] = ...`)."""
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return [base for element in target.elts for base in _subscript_bases(element)]
+    if not isinstance(target, ast.Subscript):
+        return []
+    base = target.value
+    while isinstance(base, ast.Subscript):
+        base = base.value
+    return [base]
+
+
+class _Function:
+    """What the analyzer knows about one function definition."""
+
+    def __init__(self, name: str, node: Optional[ast.FunctionDef] = None):
+        self.node = node
+        self.name = name
+        self.params = [a.arg for a in node.args.args if a.arg not in ("self", "cls")] if node else []
+        self.cost: Optional[Cost] = None
+        self.space: Cost = O_1
+        self.label: Optional[str] = None
+        self.space_label: Optional[str] = None
+        self.in_progress = False
+
+
+class StaticComplexityAnalyzer:
+    """Estimate Big-O of Python code from its AST without running it or calling an LLM.
+
+    The analysis is heuristic: loops over non-constant iterables count as
+    O(n), halving loops as O(log n), recursion is classified by call sites,
+    memoization and argument halving, and known-costly operations (sorting,
+    list membership, slicing, linear builtins) are charged where they occur.
+    Every charge worth mentioning is recorded as a hotspot with its line.
+    """
+
+    def __init__(self, tree: ast.Module):
+        self.tree = tree
+        self.hotspots: List[Dict[str, Any]] = []
+        self.uncertain: List[str] = []
+        self.functions: Dict[str, _Function] = {}
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.functions.setdefault(node.name, _Function(node.name, node))
+        self._current: Optional[_Function] = None
+        self._hash_names: Set[str] = set()
+        self._list_names: Set[str] = set()
+        self._loop_vars: List[Set[str]] = []
+        # Container kinds anywhere in the module, for names a nested function closes over
+        self._collect_types(tree.body)
+        self._module_hash_names, self._module_list_names = self._hash_names, self._list_names
+        self._hash_names, self._list_names = set(), set()
+        self._module_params = {param for function in self.functions.values() for param in function.params}
+
+    # -- entry point -------------------------------------------------------
+
+    def analyze(self) -> Dict[str, Any]:
+        """Return time, space, hotspots and confidence for the whole module."""
+        worst: Optional[_Function] = None
+        for function in self.functions.values():
+            self._function_cost(function)
+            if worst is None or function.cost > worst.cost:
+                worst = function
+
+        if worst is not None:
+            time_cost, time_label = worst.cost, worst.label
+            space_cost, space_label = max(f.space for f in self.functions.values()), worst.space_label
+        else:
+            # Script without functions: analyze the top-level statements.
+            self._current = _Function("<module>")
+            self._collect_types(self.tree.body)
+            time_cost = self._block_cost(self.tree.body, [])
+            time_label, space_cost, space_label = None, self._current.space, None
+
+        self.hotspots.sort(key=lambda h: h["line"])
+        if self.uncertain:
+            confidence = "low"
+        elif any(h["kind"] in ("recursion", "memoized_recursion", "traversal") for h in self.hotspots):
+            confidence = "medium"
+        else:
+            confidence = "high"
+
+        return {
+            "time": time_label or format_cost(time_cost),
+            "space": space_label or format_cost(space_cost),
+            "hotspots": self.hotspots,
+            "confidence": confidence,
+            "uncertain": self.uncertain,
+            "function": worst.name if worst is not None else None,
+        }
+
+    # -- functions and recursion ---------------------------------------------
+
+    def _function_cost(self, function: _Function) -> Cost:
+        if function.cost is not None:
+            return function.cost
+        if function.in_progress:
+            # Mutual recursion: charge the call site as constant and lower confidence.
+            self.uncertain.append(f"mutual recursion involving {function.name}()")
+            return O_1
+        function.in_progress = True
+        outer = (self._current, self._hash_names, self._list_names, self._loop_vars)
+        self._current, self._hash_names, self._list_names, self._loop_vars = function, set(), set(), []
+        self._collect_types(function.node.body, function.node)
+        try:
+            body = self._block_cost(function.node.body, [])
+            function.cost = self._apply_recursion(function, body)
+        finally:
+            function.in_progress = False
+            self._current, self._hash_names, self._list_names, self._loop_vars = outer
+        return function.cost
+
+    def _self_calls(self, function: _Function) -> List[Tuple[ast.Call, bool]]:
+        """Return (call, inside_loop) for every direct recursive call in the function body."""
+        calls = []
+
+        def visit(node: ast.AST, in_loop: bool) -> None:
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                    continue
+                child_in_loop = in_loop or isinstance(
+                    child, (ast.For, ast.While, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp))
+                if isinstance(child, ast.Call) and _call_name(child) == function.name:
+                    calls.append((child, in_loop))
+                visit(child, child_in_loop)
+
+        visit(function.node, False)
+        return calls
+
+    def _is_memoized(self, function: _Function) -> bool:
+        for decorator in function.node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            name = target.attr if isinstance(target, ast.Attribute) else getattr(target, "id", None)
+            if name in _MEMO_DECORATORS:
+                return True
+        for node in ast.walk(function.node):
+            if isinstance(node, ast.Compare) and any(isinstance(op, ast.In) for op in node.ops):
+                if any(isinstance(c, ast.Name) and _MEMO_NAME.search(c.id) for c in node.comparators):
+                    return True
+        return False
+
+    def _is_traversal(self, function: _Function) -> bool:
+        """True for DFS/BFS shaped functions: a visited set plus a loop over neighbours."""
+        has_visited = any(
+            isinstance(n, ast.Name) and _VISITED_NAME.search(n.id) for n in ast.walk(function.node)
+        )
+        loops_over_adjacency = any(
+            isinstance(n, ast.For) and isinstance(n.iter, ast.Subscript) for n in ast.walk(function.node)
+        )
+        return has_visited and loops_over_adjacency
+
+    def _is_permutation_search(self, function: _Function) -> bool:
+        """
+        True for backtracking that recurses inside a loop over the whole input.
+
+        A call that passes the loop index on (``backtrack(i + 1)``) only moves
+        forward, which enumerates subsets (2^n); anything else (``used``
+        flags, ``remaining - {x}``) can pick every element at every depth.
+        """
+        for loop in ast.walk(function.node):
+            if not isinstance(loop, ast.For) or self._iter_is_constant(loop.iter):
+                continue
+            loop_vars = _names(loop.target)
+            for node in ast.walk(loop):
+                if not (isinstance(node, ast.Call) and _call_name(node) == function.name):
+                    continue
+                moves_forward = any(
+                    (isinstance(arg, ast.Name) and arg.id in loop_vars) or (
+                        isinstance(arg, ast.BinOp) and isinstance(arg.op, ast.Add)
+                        and isinstance(arg.left, ast.Name) and arg.left.id in loop_vars
+                        and isinstance(arg.right, ast.Constant)
+                    )
+                    for arg in node.args
+                )
+                if not moves_forward:
+                    return True
+        return False
+
+    def _apply_recursion(self, function: _Function, body: Cost) -> Cost:
+        line = function.node.lineno
+        if self._is_traversal(function):
+            function.label, function.space_label = "O(V + E)", "O(V)"
+            # The neighbour loop inside the node loop is amortized over all edges, not quadratic.
+            end = getattr(function.node, "end_lineno", line)
+            self.hotspots = [h for h in self.hotspots
+                             if not (h["kind"] == "nested_loop" and line <= h["line"] <= end)]
+            self._hotspot(line, "traversal", O_N, f"{function.name}() visits each node and edge once (visited set)")
+            function.space = max(function.space, O_N)
+            return O_N
+
+        calls = self._self_calls(function)
+        if not calls:
+            return body
+
+        if self._is_memoized(function):
+            varying = [p for p in function.params if not _MEMO_NAME.search(p)]
+            states: Cost = (0, max(1, len(varying)), 0)
+            self._hotspot(line, "memoized_recursion", states,
+                          f"{function.name}() is memoized: {format_cost(states)} distinct states")
+            function.space = max(function.space, states)
+            return mul(states, body)
+
+        halving = all(any(_is_halving(arg) for arg in call.args) for call, _ in calls)
+        branches = sum(1 for _, in_loop in calls if not in_loop) or 1
+        if any(in_loop for _, in_loop in calls):
+            branches = max(branches, 2)
+
+        if not halving and self._is_permutation_search(function):
+            self._hotspot(line, "recursion", O_N_FACTORIAL,
+                          f"{function.name}() recurses once per remaining choice (every ordering is explored)")
+            function.space = max(function.space, O_N)
+            return O_N_FACTORIAL
+        if branches >= 2 and not halving:
+            self._hotspot(line, "recursion", O_2_N,
+                          f"{function.name}() branches into {branches} recursive calls without memoization")
+            function.space = max(function.space, O_N)
+            return O_2_N
+        if halving:
+            function.space = max(function.space, O_LOG_N)
+            if branches >= 2:
+                # Divide and conquer: log n levels, each doing the per-call work over n items in total.
+                cost = (0, max(body[1], 1), body[2] + (1 if body[1] >= 1 else 0))
+                self._hotspot(line, "recursion", cost, f"{function.name}() splits the input in halves recursively")
+                return cost
+            cost = mul(O_LOG_N, body)
+            self._hotspot(line, "recursion", cost, f"{function.name}() recurses on half of the input")
+            return cost
+        cost = mul(O_N, body)
+        function.space = max(function.space, O_N)
+        self._hotspot(line, "recursion", cost, f"{function.name}() recurses linearly (depth n)")
+        return cost
+
+    # -- statements --------------------------------------------------------
+
+    def _collect_types(self, body: List[ast.stmt], function: Optional[ast.FunctionDef] = None) -> None:
+        """Remember which local names hold hash-based or list containers."""
+        nodes = [function] if function is not None else body
+        for root in nodes:
+            for node in ast.walk(root):
+                if isinstance(node, ast.Assign):
+                    kind = self._container_kind(node.value)
+                    for target in node.targets:
+                        if isinstance(target, ast.Name) and kind == "hash":
+                            self._hash_names.add(target.id)
+                        elif isinstance(target, ast.Name) and kind == "list":
+                            self._list_names.add(target.id)
+        if function is not None:
+            for arg, default in zip(reversed(function.args.args), reversed(function.args.defaults)):
+                if self._container_kind(default) == "hash":
+                    self._hash_names.add(arg.arg)
+
+    def _container_kind(self, value: ast.AST) -> Optional[str]:
+        if isinstance(value, (ast.Dict, ast.Set, ast.DictComp, ast.SetComp)):
+            return "hash"
+        if isinstance(value, (ast.List, ast.ListComp)):
+            return "list"
+        if isinstance(value, ast.BinOp) and isinstance(value.left, ast.List):
+            return "list"
+        if isinstance(value, ast.Call):
+            name = _call_name(value)
+            if name in ("dict", "set", "Counter", "defaultdict", "OrderedDict", "frozenset"):
+                return "hash"
+            if name in ("list", "sorted"):
+                return "list"
+        return None
+
+    def _block_cost(self, body: List[ast.stmt], loops: List[Set[str]]) -> Cost:
+        cost = O_1
+        for stmt in body:
+            cost = max(cost, self._stmt_cost(stmt, loops))
+        return cost
+
+    def _stmt_cost(self, stmt: ast.stmt, loops: List[Set[str]]) -> Cost:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return O_1
+        if isinstance(stmt, (ast.For, ast.AsyncFor)):
+            return self._for_cost(stmt, loops)
+        if isinstance(stmt, ast.While):
+            return self._while_cost(stmt, loops)
+
+        cost = O_1
+        for field, value in ast.iter_fields(stmt):
+            if isinstance(value, list) and value and isinstance(value[0], ast.stmt):
+                cost = max(cost, self._block_cost(value, loops))
+            elif isinstance(value, list) and value and isinstance(value[0], ast.excepthandler):
+                for handler in value:
+                    cost = max(cost, self._block_cost(handler.body, loops))
+            elif isinstance(value, ast.expr):
+                cost = max(cost, self._expr_cost(value, loops))
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.expr):
+                        cost = max(cost, self._expr_cost(item, loops))
+                    elif isinstance(item, ast.withitem):
+                        cost = max(cost, self._expr_cost(item.context_expr, loops))
+        self._charge_allocation(stmt, loops)
+        return cost
+
+    def _charge_allocation(self, stmt: ast.stmt, loops: List[Set[str]]) -> None:
+        """Charge auxiliary space for containers grown inside loops or built from input."""
+        multiplier = (0, sum(1 for loop in loops if loop), 0)
+        grows = False
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+            grows = _call_name(stmt.value) in ("append", "add", "appendleft", "setdefault", "extend", "update")
+        elif isinstance(stmt, ast.AugAssign):
+            grows = self._store_grows([stmt.target], stmt.lineno, loops)
+        elif isinstance(stmt, ast.Assign):
+            grows = self._store_grows(stmt.targets, stmt.lineno, loops)
+            value = stmt.value
+            if isinstance(value, (ast.ListComp, ast.SetComp, ast.DictComp)):
+                self._current.space = max(self._current.space, self._comprehension_size(value))
+            elif isinstance(value, ast.BinOp) and isinstance(value.op, ast.Mult) and (
+                    isinstance(value.left, (ast.List, ast.Constant))):
+                if not _is_constant(value.right):
+                    self._current.space = max(self._current.space, O_N)
+        if grows and loops:
+            self._current.space = max(self._current.space, multiplier)
+
+    def _store_grows(self, targets: List[ast.AST], line: int, loops: List[Set[str]]) -> bool:
+        """
+        Whether subscript stores add entries to a container.
+
+        Only dict/set-like containers gain keys this way (``seen[x] = i``);
+        a store into a list, or into an argument (also of an enclosing
+        function), overwrites an existing element in place (sorting, DP
+        tables, ``grid[i][j] = ...``). Other
+        containers (attributes, globals) cannot be classified, which lowers
+        confidence when it happens inside a loop.
+        """
+        grows = False
+        for base in (base for target in targets for base in _subscript_bases(target)):
+            name = base.id if isinstance(base, ast.Name) else None
+            if name in self._hash_names:
+                grows = True
+            elif name in self._list_names or name in self._current.params:
+                continue
+            elif name in self._module_hash_names and name not in self._module_list_names:
+                grows = True
+            elif name in self._module_params or (name in self._module_list_names and name not in self._module_hash_names):
+                continue
+            elif any(loops):
+                note = f"line {line}: cannot tell whether stores into `{ast.unparse(base)}` grow it"
+                if note not in self.uncertain:
+                    self.uncertain.append(note)
+        return grows
+
+    def _comprehension_size(self, node: ast.AST) -> Cost:
+        size = O_1
+        for generator in node.generators:
+            if not self._iter_is_constant(generator.iter):
+                size = mul(size, O_N)
+        element = getattr(node, "elt", None)
+        if isinstance(element, (ast.ListComp, ast.SetComp, ast.DictComp)):
+            size = mul(size, self._comprehension_size(element))
+        elif isinstance(element, ast.BinOp) and isinstance(element.op, ast.Mult) and not _is_constant(element.right):
+            size = mul(size, O_N)
+        return size
+
+    def _iter_is_constant(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Call) and _call_name(node) == "range":
+            return all(_is_constant(arg) for arg in node.args)
+        return _is_constant(node)
+
+    def _loop_sources(self, node: ast.AST, loops: List[Set[str]]) -> Set[str]:
+        """Names a loop iterates over, excluding enclosing loop variables."""
+        outer_vars = set().union(*self._loop_vars) if self._loop_vars else set()
+        return {name for name in _names(node) if name not in outer_vars and name not in ("range", "len", "enumerate", "zip")}
+
+    def _for_cost(self, stmt: ast.For, loops: List[Set[str]]) -> Cost:
+        header = self._expr_cost(stmt.iter, loops)
+        if self._iter_is_constant(stmt.iter):
+            iteration, sources = O_1, set()
+        else:
+            iteration, sources = O_N, self._loop_sources(stmt.iter, loops) or {"<input>"}
+            self._note_nesting(stmt, sources, loops)
+        self._loop_vars.append(_names(stmt.target))
+        try:
+            body = self._block_cost(stmt.body + stmt.orelse, loops + [sources])
+        finally:
+            self._loop_vars.pop()
+        return max(header, mul(iteration, body))
+
+    def _while_cost(self, stmt: ast.While, loops: List[Set[str]]) -> Cost:
+        header = self._expr_cost(stmt.test, loops)
+        if _is_constant(stmt.test) and not (isinstance(stmt.test, ast.Constant) and stmt.test.value):
+            iteration, sources = O_1, set()
+        elif _is_halving(stmt):
+            iteration, sources = O_LOG_N, set()
+            self._hotspot(stmt.lineno, "halving_loop", O_LOG_N, "loop halves its search range each iteration")
+        elif _is_euclidean(stmt):
+            # The remainder at least halves every two steps
+            iteration, sources = O_LOG_N, set()
+            self._hotspot(stmt.lineno, "halving_loop", O_LOG_N, "loop replaces its value by a remainder (Euclid's algorithm)")
+        else:
+            iteration, sources = O_N, self._loop_sources(stmt.test, loops) or {"<input>"}
+            if isinstance(stmt.test, ast.Constant):
+                self.uncertain.append(f"line {stmt.lineno}: unbounded while loop assumed O(n)")
+            self._note_nesting(stmt, sources, loops)
+        inner = loops + [sources]
+        body = self._block_cost(stmt.body + stmt.orelse, inner)
+        return max(header, mul(iteration, body))
+
+    def _note_nesting(self, stmt: ast.stmt, sources: Set[str], loops: List[Set[str]]) -> None:
+        outer = [loop for loop in loops if loop]
+        if not outer:
+            return
+        depth = len(outer) + 1
+        cost: Cost = (0, depth, 0)
+        shared = sorted(sources & set().union(*outer) - {"<input>"})
+        if shared:
+            note = f"{depth} nested loops over the same input `{shared[0]}`"
+        else:
+            note = f"{depth} nested loops over input-sized ranges"
+        self._hotspot(stmt.lineno, "nested_loop", cost, note)
+
+    # -- expressions -------------------------------------------------------
+
+    def _expr_cost(self, node: ast.AST, loops: List[Set[str]]) -> Cost:
+        in_loop = any(loops)
+        cost = O_1
+        for n in ast.walk(node):
+            if isinstance(n, (ast.Lambda,)):
+                continue
+            if isinstance(n, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+                cost = max(cost, self._comprehension_size(n))
+            elif isinstance(n, ast.Call):
+                cost = max(cost, self._call_cost(n, in_loop))
+            elif isinstance(n, ast.Compare):
+                cost = max(cost, self._membership_cost(n, in_loop))
+            elif isinstance(n, ast.Subscript) and isinstance(n.slice, ast.Slice):
+                cost = max(cost, O_N)
+                if in_loop:
+                    self._hotspot(n.lineno, "slice_in_loop", O_N, "slicing copies the sequence on every iteration")
+        return cost
+
+    def _call_cost(self, call: ast.Call, in_loop: bool) -> Cost:
+        name = _call_name(call)
+        is_method = isinstance(call.func, ast.Attribute)
+        if name == "sorted" or (name == "sort" and is_method):
+            self._hotspot(call.lineno, "sort", O_N_LOG_N,
+                          "sorting inside a loop" if in_loop else "sorting costs O(n log n)")
+            return O_N_LOG_N
+        if not is_method and name in self.functions and self._current is not None and name != self._current.name:
+            return self._function_cost(self.functions[name])
+        # max(a, b) is O(1); max(items) walks items.
+        if not is_method and name in _LINEAR_BUILTINS and len(call.args) == 1 and not _is_constant(call.args[0]):
+            if in_loop:
+                self._hotspot(call.lineno, "linear_call_in_loop", O_N, f"{name}() walks the whole input on every iteration")
+            return O_N
+        if is_method and name in _LINEAR_METHODS:
+            if in_loop:
+                self._hotspot(call.lineno, "linear_call_in_loop", O_N, f".{name}() scans the list on every iteration")
+            return O_N
+        if is_method and name in ("pop", "insert") and call.args and isinstance(call.args[0], ast.Constant) \
+                and call.args[0].value == 0:
+            if in_loop:
+                self._hotspot(call.lineno, "linear_call_in_loop", O_N,
+                              f".{name}(0) shifts the whole list; use collections.deque")
+            return O_N
+        return O_1
+
+    def _membership_cost(self, compare: ast.Compare, in_loop: bool) -> Cost:
+        cost = O_1
+        for op, right in zip(compare.ops, compare.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            if isinstance(right, (ast.Set, ast.Dict)) or (isinstance(right, ast.Name) and right.id in self._hash_names):
+                if in_loop:
+                    self._hotspot(compare.lineno, "hash_lookup", O_1, "dict/set membership is O(1) on average")
+                continue
+            if isinstance(right, ast.Call) and _call_name(right) in ("range", "keys"):
+                continue
+            if isinstance(right, ast.Name) and (right.id in self._list_names or
+                                                (self._current is not None and right.id in self._current.params)):
+                cost = O_N
+                if in_loop:
+                    self._hotspot(compare.lineno, "list_scan", O_N,
+                                  f"`in {right.id}` scans a list; a set or dict makes it O(1)")
+        return cost
+
+    def _hotspot(self, line: int, kind: str, cost: Cost, note: str) -> None:
+        entry = {"line": line, "kind": kind, "cost": format_cost(cost), "note": note}
+        if entry not in self.hotspots:
+            self.hotspots.append(entry)
+
+
+def analyze_complexity(code: str, tree: Optional[ast.Module] = None) -> Dict[str, Any]:
+    """
+    Estimate time and space complexity of code with local static analysis.
+
+    Args:
+        code: Python source to analyze
+        tree: Already parsed AST of ``code`` (parsed here if omitted)
+
+    Returns:
+        Dictionary with provisional ``time``/``space`` Big-O, ``hotspots``
+        (line, kind, cost, note), ``confidence`` and ``elapsed_ms``; contains
+        ``error`` instead if the code does not parse.
+    """
+    started = time.perf_counter()
+    if tree is None:
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            return {"error": f"SyntaxError: {e.msg} (line {e.lineno})"}
+    result = StaticComplexityAnalyzer(tree).analyze()
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def format_static_report(result: Dict[str, Any]) -> str:
+    """Format a static analysis result as the markdown used in chat and prompts."""
+    if "error" in result:
+        return f"**Static analysis unavailable:** {result['error']}"
+    lines = [
+        f"**Time Complexity (provisional):** {result['time']}",
+        f"**Space Complexity (provisional):** {result['space']}",
+    ]
+    if result["hotspots"]:
+        lines.append("**Hotspots:**")
+        for hotspot in result["hotspots"]:
+            lines.append(f"- Line {hotspot['line']}: {hotspot['note']} ({hotspot['cost']})")
+    lines.append(f"*Local static analysis · confidence: {result['confidence']} · {result.get('elapsed_ms', 0)} ms*")
+    return "\n".join(lines)
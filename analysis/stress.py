@@ -0,0 +1,306 @@
+import copy
+import time
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+# Lengths up to this many elements above the minimum are favoured, since
+# most edge-case bugs show up on empty, single-element or tiny inputs.
+_SMALL_SPAN = 8
+_MAX_SHRINK_ATTEMPTS = 400
+
+
+class ArgSpec(BaseModel):
+    """How to generate one positional argument of the function under test."""
+    kind: Literal["int", "int_list", "string", "graph"] = Field(
+        description="int, int_list (list of ints), string, or graph (adjacency list: list of neighbour lists)"
+    )
+    min_value: int = Field(-100, description="Smallest int value (int and int_list)")
+    max_value: int = Field(100, description="Largest int value (int and int_list)")
+    min_len: int = Field(0, description="Minimum length, or node count for graphs")
+    max_len: int = Field(20, description="Maximum length, or node count for graphs")
+    order: Literal["any", "ascending", "descending"] = Field("any", description="Ordering of int_list values")
+    unique: bool = Field(False, description="int_list values are distinct")
+    alphabet: str = Field("ab", description="Characters strings are built from")
+    density: float = Field(0.3, description="Graphs: probability of each possible edge")
+    directed: bool = Field(False, description="Graphs: directed edges")
+
+
+def _lengths(spec: ArgSpec, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Half the cases get small lengths, the rest span the whole range."""
+    high = max(spec.min_len, spec.max_len)
+    small = rng.integers(spec.min_len, min(high, spec.min_len + _SMALL_SPAN) + 1, size=count)
+    full = rng.integers(spec.min_len, high + 1, size=count)
+    return np.where(rng.random(count) < 0.5, small, full)
+
+
+def _split(values: np.ndarray, lengths: np.ndarray) -> List[list]:
+    return [chunk.tolist() for chunk in np.split(values, np.cumsum(lengths)[:-1])]
+
+
+def generate_args(spec: ArgSpec, count: int, rng: np.random.Generator) -> List[Any]:
+    """
+    Generate ``count`` values for one argument in bulk.
+
+    Values for all cases are drawn in one NumPy call and split per case, so
+    generation costs a few array operations per batch rather than per case.
+    """
+    if spec.kind == "int":
+        return rng.integers(spec.min_value, spec.max_value + 1, size=count).tolist()
+
+    lengths = _lengths(spec, count, rng)
+    if spec.kind == "int_list":
+        if spec.unique:
+            span = spec.max_value - spec.min_value + 1
+            lengths = np.minimum(lengths, span)
+            cases = [rng.choice(span, size=length, replace=False) + spec.min_value for length in lengths]
+            if spec.order != "any":
+                cases = [np.sort(case) for case in cases]
+                if spec.order == "descending":
+                    cases = [case[::-1] for case in cases]
+            return [case.tolist() for case in cases]
+        values = rng.integers(spec.min_value, spec.max_value + 1, size=int(lengths.sum()))
+        if spec.order != "any":
+            # Sort within each case at once: by case index, then by value
+            case_ids = np.repeat(np.arange(count), lengths)
+            values = values[np.lexsort((values if spec.order == "ascending" else -values, case_ids))]
+        return _split(values, lengths)
+
+    if spec.kind == "string":
+        alphabet = np.array(list(spec.alphabet or "a"))
+        chars = alphabet[rng.integers(0, len(alphabet), size=int(lengths.sum()))]
+        return ["".join(chunk) for chunk in _split(chars, lengths)]
+
+    graphs = []
+    for nodes in lengths:
+        edges = rng.random((nodes, nodes)) < spec.density
+        np.fill_diagonal(edges, False)
+        if not spec.directed:
+            edges = np.triu(edges)
+            edges = edges | edges.T
+        graphs.append([np.flatnonzero(row).tolist() for row in edges])
+    return graphs
+
+
+def generate_cases(specs: List[ArgSpec], count: int, rng: np.random.Generator) -> List[tuple]:
+    """Generate ``count`` argument tuples, one column per argument spec."""
+    columns = [generate_args(spec, count, rng) for spec in specs]
+    return list(zip(*columns)) if columns else [() for _ in range(count)]
+
+
+# A checker runs one case and returns a failure description, or None if it passed.
+Checker = Callable[[tuple], Optional[Dict[str, Any]]]
+
+
+def make_checker(
+    function: Callable,
+    reference: Optional[Callable] = None,
+    prop: Optional[Callable[[tuple, Any], bool]] = None,
+    slow_call_s: float = 1.0,
+) -> Checker:
+    """
+    Build a checker comparing ``function`` with a reference and/or a property.
+
+    Each call gets its own copy of the arguments, so in-place mutation by one
+    side cannot hide a bug in the other.
+    """
+    def check(args: tuple) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            result = function(*copy.deepcopy(args))
+        except Exception as e:
+            return {"kind": "exception", "error": f"{type(e).__name__}: {e}"}
+        seconds = time.perf_counter() - started
+        if seconds > slow_call_s:
+            return {"kind": "slow", "error": f"took {seconds:.2f}s (limit {slow_call_s:g}s)"}
+        if reference is not None:
+            expected = reference(*copy.deepcopy(args))
+            if result != expected:
+                return {"kind": "mismatch", "expected": expected, "got": result}
+        if prop is not None and not prop(copy.deepcopy(args), result):
+            return {"kind": "property", "got": result}
+        return None
+
+    return check
+
+
+def _conforms(value: Any, spec: ArgSpec) -> bool:
+    """Whether a shrunk value is still something the spec could have generated."""
+    if spec.kind == "int":
+        return spec.min_value <= value <= spec.max_value
+    if not spec.min_len <= len(value) <= max(spec.min_len, spec.max_len):
+        return False
+    if spec.kind != "int_list":
+        return True
+    if any(not spec.min_value <= item <= spec.max_value for item in value):
+        return False
+    if spec.unique and len(set(value)) != len(value):
+        return False
+    if spec.order == "ascending":
+        return all(a <= b for a, b in zip(value, value[1:]))
+    if spec.order == "descending":
+        return all(a >= b for a, b in zip(value, value[1:]))
+    return True
+
+
+def _smaller_ints(value: int, spec: ArgSpec) -> Iterator[int]:
+    """Values between ``value`` and the in-range value closest to zero, closest to it first."""
+    target = min(max(0, spec.min_value), spec.max_value)
+    if value != target:
+        yield target
+        # Halve the distance, rounding toward the target
+        halfway = target + int((value - target) / 2)
+        if halfway not in (target, value):
+            yield halfway
+        step = value - 1 if value > target else value + 1
+        if step not in (target, halfway):
+            yield step
+
+
+def _smaller(value: Any, spec: ArgSpec) -> Iterator[Any]:
+    """Candidate simplifications of one argument, most aggressive first."""
+    if spec.kind == "graph":
+        # Removing nodes would renumber the adjacency lists; graphs are not shrunk
+        return
+    if spec.kind == "int":
+        yield from _smaller_ints(value, spec)
+        return
+    # Drop everything, then halves, quarters, ... down to single elements
+    length = len(value)
+    if length:
+        yield value[:0]
+    size = length // 2
+    while size >= 1:
+        for start in range(0, length, size):
+            yield value[:start] + value[start + size:]
+        size //= 2
+    if spec.kind == "int_list":
+        for i, item in enumerate(value):
+            for simpler in _smaller_ints(item, spec):
+                yield value[:i] + [simpler] + value[i + 1:]
+
+
+def shrink(
+    args: tuple, specs: List[ArgSpec], check: Checker, failure: Dict[str, Any]
+) -> Tuple[tuple, Dict[str, Any], int]:
+    """
+    Greedily simplify a failing case while it keeps failing the same way.
+
+    Only candidates the specs could have generated are tried, so a shrunk
+    case never breaks a precondition such as sortedness.
+
+    Returns:
+        The smallest failing arguments found, their failure and the number of accepted steps
+    """
+    steps = 0
+    attempts = 0
+    improved = True
+    while improved and attempts < _MAX_SHRINK_ATTEMPTS:
+        improved = False
+        for index, (value, spec) in enumerate(zip(args, specs)):
+            for candidate in _smaller(value, spec):
+                if not _conforms(candidate, spec):
+                    continue
+                attempts += 1
+                if attempts > _MAX_SHRINK_ATTEMPTS:
+                    break
+                trial = args[:index] + (candidate,) + args[index + 1:]
+                try:
+                    result = check(trial)
+                except Exception:
+                    # The reference or property itself rejects this input
+                    continue
+                if result is not None and result["kind"] == failure["kind"]:
+                    args, failure = trial, result
+                    steps += 1
+                    improved = True
+                    break
+            if improved:
+                break
+    return args, failure, steps
+
+
+def _preview(value: Any, limit: int = 200) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def run_stress_test(
+    check: Checker,
+    specs: List[ArgSpec],
+    max_cases: int = 5000,
+    batch_size: int = 500,
+    time_budget_s: float = 10.0,
+    seed: int = 0,
+    run_batch: Callable[[Callable[[], Any]], Any] = lambda run: run(),
+) -> Dict[str, Any]:
+    """
+    Run randomized cases in batches until one fails, or the case or time budget is spent.
+
+    Args:
+        check: Checker for one case
+        specs: One spec per positional argument
+        max_cases: Cases to try at most
+        batch_size: Cases generated and run per batch
+        time_budget_s: Stop starting new batches after this long
+        seed: Random seed, so a failure can be reproduced
+        run_batch: Wraps each batch's execution (e.g. to hold the sandbox lock)
+
+    Returns:
+        Dict with cases, seconds, cases_per_s, passed and, on failure, the shrunk counterexample
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    deadline = started + time_budget_s
+    generate_s = 0.0
+    cases = 0
+    failure: Optional[Dict[str, Any]] = None
+
+    while cases < max_cases and time.perf_counter() < deadline:
+        generate_started = time.perf_counter()
+        batch = generate_cases(specs, min(batch_size, max_cases - cases), rng)
+        generate_s += time.perf_counter() - generate_started
+
+        def run() -> Tuple[Optional[tuple], Optional[Dict[str, Any]], int]:
+            """Return the first failing case and its failure (if any) and how many cases ran."""
+            for i, args in enumerate(batch):
+                if time.perf_counter() > deadline:
+                    return None, None, i
+                result = check(args)
+                if result is not None:
+                    return args, result, i + 1
+            return None, None, len(batch)
+
+        original, result, done = run_batch(run)
+        cases += done
+        if result is None:
+            continue
+        search_s = time.perf_counter() - started
+        if result["kind"] == "slow":
+            # Re-running slow cases to shrink them would take too long
+            shrunk, steps = original, 0
+        else:
+            shrunk, result, steps = run_batch(lambda: shrink(original, specs, check, result))
+        failure = {
+            **{key: _preview(value) if key in ("expected", "got") else value for key, value in result.items()},
+            "args": _preview(shrunk),
+            "original_args": _preview(original),
+            "shrink_steps": steps,
+        }
+        break
+
+    seconds = time.perf_counter() - started
+    # Throughput excludes the time spent shrinking a failure
+    search_s = seconds if failure is None else search_s
+    report = {
+        "cases": cases,
+        "seconds": round(seconds, 3),
+        "cases_per_s": round(cases / search_s) if search_s > 0 else cases,
+        "generate_s": round(generate_s, 3),
+        "seed": seed,
+        "passed": failure is None,
+    }
+    if failure is not None:
+        report["failure"] = failure
+    return report
@@ -0,0 +1,14 @@
+import uvicorn
+
+from api.server import create_app
+from config.settings import get_settings
+
+
+def main():
+    """Command-line entry point: python -m api"""
+    settings = get_settings()
+    uvicorn.run(create_app(), host=settings.api_host, port=settings.api_port)
+
+
+if __name__ == "__main__":
+    main()
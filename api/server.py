@@ -0,0 +1,256 @@
+import asyncio
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from pydantic import BaseModel
+
+from analysis.cache import get_result_cache
+from analysis.code_artifact import get_code_artifact
+from config.settings import get_settings
+from graph.graph_builder import get_compiled_graph
+from graph.turn_budget import get_turn_ledger
+from models.batching import get_llm_batcher
+from models.prompt_cache import get_prefix_registry
+from models.rate_limiter import RateLimitTimeout, get_rate_limiter
+from session.artifact_store import get_artifact_store
+from session.lifecycle import get_session_lifecycle
+from session.snapshots import build_code_submission, merge_snapshots
+from tools.hint_tool import generate_hint
+from tools.persistent_python_repl import get_repl_pool
+
+
+class ChatRequest(BaseModel):
+    message: str = ""
+    session_id: Optional[str] = None
+    thread_id: str = "default"
+    # Code to submit for analysis; stored as a snapshot and sent in full or as a diff
+    code: Optional[str] = None
+    # Structured intent, e.g. {"name": "hint", "args": {"code": "..."}}, served without the planning LLM call
+    intent: Optional[Dict[str, Any]] = None
+
+
+class RunRequest(BaseModel):
+    code: str
+    session_id: Optional[str] = None
+
+
+class HintRequest(BaseModel):
+    question: str
+    session_id: Optional[str] = None
+    thread_id: str = "default"
+
+
+class ConversationStore:
+    """In-memory graph state per (session, thread) with one turn at a time per conversation.
+
+    Holds at most ``max_conversations``; the least recently used
+    conversation without a turn in progress is forgotten first.
+    """
+
+    def __init__(self, max_conversations: int = 1024):
+        self.max_conversations = max_conversations
+        self._states: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def lock(self, key: tuple) -> asyncio.Lock:
+        return self._locks.setdefault(key, asyncio.Lock())
+
+    def get(self, key: tuple) -> Dict[str, Any]:
+        state = self._states.get(key, {})
+        if key in self._states:
+            self._states.move_to_end(key)
+        return {**state, "messages": list(state.get("messages", []))}
+
+    def set(self, key: tuple, state: Dict[str, Any]) -> None:
+        self._states[key] = state
+        self._states.move_to_end(key)
+        self._evict()
+
+    def _evict(self) -> None:
+        excess = len(self._states) - self.max_conversations
+        for key in list(self._states):
+            if excess <= 0:
+                break
+            lock = self._locks.get(key)
+            if lock is not None and lock.locked():
+                continue
+            del self._states[key]
+            self._locks.pop(key, None)
+            excess -= 1
+        # Locks of conversations that never stored a state (e.g. failed first turns)
+        for key in [key for key, lock in self._locks.items() if key not in self._states and not lock.locked()]:
+            del self._locks[key]
+
+
+def _turn_input(state: Dict[str, Any], request: ChatRequest) -> Dict[str, Any]:
+    """Build the graph input for one turn: history, new message, code snapshot and intent."""
+    message, update = request.message, {}
+    if request.code:
+        update, message = build_code_submission(request.code, state, extra=request.message)
+    return {**state, **update, "messages": state["messages"] + [HumanMessage(content=message)],
+            "intent": request.intent}
+
+
+def _apply_update(state: Dict[str, Any], update: Dict[str, Any]) -> None:
+    """Apply one node's streamed update to a locally tracked state."""
+    for field, value in (update or {}).items():
+        if field == "messages":
+            state["messages"].extend(value)
+        elif field == "snapshots":
+            state["snapshots"] = merge_snapshots(state.get("snapshots"), value)
+        else:
+            state[field] = value
+
+
+def _serialize(message: BaseMessage) -> Dict[str, Any]:
+    """Convert a LangChain message into the JSON shape returned by the API."""
+    if isinstance(message, AIMessage):
+        return {
+            "role": "assistant",
+            "content": message.content,
+            "tool_calls": [{"name": c["name"], "args": c["args"]} for c in message.tool_calls],
+        }
+    if isinstance(message, ToolMessage):
+        return {"role": "tool", "name": message.name, "content": message.content}
+    return {"role": "user", "content": message.content}
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def create_app() -> FastAPI:
+    """Build the API application around the shared graph, caches and REPL pool."""
+    settings = get_settings()
+    graph = get_compiled_graph()
+    store = ConversationStore(max_conversations=settings.api_max_conversations)
+    limiter = get_rate_limiter()
+    lifecycle = get_session_lifecycle()
+    turn_slots = asyncio.Semaphore(settings.api_max_concurrent_turns)
+    api = FastAPI(title=f"{settings.app_title} API")
+
+    def conversation(request: ChatRequest) -> tuple:
+        session_id = request.session_id or uuid.uuid4().hex
+        return (session_id, request.thread_id), {
+            "configurable": {"thread_id": request.thread_id, "session_id": session_id}
+        }
+
+    @api.get("/healthz")
+    async def healthz() -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "cache": get_result_cache().stats(),
+            "prompt_cache": get_prefix_registry().stats(),
+            "llm_batching": get_llm_batcher().stats(),
+            "conversations": len(store),
+            "repl_sessions": len(get_repl_pool()),
+            "repl_memory_bytes": sum(get_repl_pool().memory_usage().values()),
+            "artifacts": get_artifact_store().stats(),
+            "rate_limit": limiter.saturation() if limiter is not None else None,
+            "turns": get_turn_ledger().stats(),
+            "sessions": lifecycle.stats() if lifecycle is not None else None,
+        }
+    
+    @api.get("/readyz")
+    async def readyz():
+        """Readiness: 503 once LLM admission is saturated, so the pod sheds load before the provider rejects calls."""
+        saturation = limiter.saturation() if limiter is not None else {"saturated": False}
+        return JSONResponse(saturation, status_code=503 if saturation["saturated"] else 200)
+
+    @api.post("/api/chat")
+    async def chat(request: ChatRequest) -> Dict[str, Any]:
+        """Run one chat turn and return the new messages."""
+        key, config = conversation(request)
+        async with store.lock(key), turn_slots:
+            turn = _turn_input(store.get(key), request)
+            try:
+                result = await graph.ainvoke(turn, config=config)
+            except RateLimitTimeout as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+            store.set(key, result)
+        new_messages = result["messages"][len(turn["messages"]):]
+        replies = [m for m in new_messages if isinstance(m, AIMessage) and m.content]
+        return {
+            "session_id": key[0],
+            "thread_id": key[1],
+            "reply": replies[-1].content if replies else "",
+            "messages": [_serialize(m) for m in new_messages],
+            "spend": result.get("turn"),
+        }
+
+    @api.post("/api/chat/stream")
+    async def chat_stream(request: ChatRequest) -> StreamingResponse:
+        """Run one chat turn, streaming each graph step as a server-sent event."""
+        key, config = conversation(request)
+
+        async def events():
+            async with store.lock(key), turn_slots:
+                state = _turn_input(store.get(key), request)
+                yield _sse("start", {"session_id": key[0], "thread_id": key[1]})
+                try:
+                    async for update in graph.astream(state, config=config, stream_mode="updates"):
+                        for node, node_update in update.items():
+                            for message in (node_update or {}).get("messages", []):
+                                yield _sse("message", {"node": node, **_serialize(message)})
+                            _apply_update(state, node_update)
+                except Exception as e:
+                    # A turn cut off partway can end on tool calls without results; keep the state from before it
+                    state = store.get(key)
+                    yield _sse("error", {"error": str(e)})
+                else:
+                    store.set(key, state)
+                yield _sse("done", {"messages": len(state["messages"])})
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @api.post("/api/run")
+    async def run(request: RunRequest) -> Dict[str, Any]:
+        """Execute code in the session's REPL and add local complexity analysis (no LLM)."""
+        session_id = request.session_id or uuid.uuid4().hex
+        repl = get_repl_pool().get(session_id)
+        output = await asyncio.to_thread(repl.execute, request.code)
+        return {
+            "session_id": session_id,
+            "output": output,
+            "static_complexity": get_code_artifact(request.code).static_complexity,
+        }
+
+    @api.post("/api/hint")
+    async def hint(request: HintRequest) -> Dict[str, Any]:
+        """Return the conversation's next hint for a problem from the cached hint ladder."""
+        session_id = request.session_id or uuid.uuid4().hex
+        config = {"configurable": {"session_id": session_id, "thread_id": request.thread_id}}
+        hint = await generate_hint.ainvoke({"question": request.question}, config=config)
+        return {"session_id": session_id, "hint": hint}
+
+    return api
+
+
+_server_thread = None
+
+def start_background_server() -> None:
+    """Serve the API from a daemon thread of the current process (idempotent).
+
+    Used by the Streamlit app so both frontends share one graph, result
+    cache and REPL pool.
+    """
+    global _server_thread
+    if _server_thread is not None:
+        return
+    import uvicorn
+
+    settings = get_settings()
+    server = uvicorn.Server(uvicorn.Config(create_app(), host=settings.api_host, port=settings.api_port,
+                                           log_level="warning"))
+    _server_thread = threading.Thread(target=server.run, name="api-server", daemon=True)
+    _server_thread.start()
+    print(f"🌐 API server listening on {settings.api_host}:{settings.api_port}")
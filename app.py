@@ -1,16 +1,29 @@
 import streamlit as st
+import uuid
 from datetime import datetime
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+from typing import Any, Dict, Optional
+from langchain_core.messages import AIMessage, ToolMessage
 
 # Import application components
 from config.settings import get_settings
 from models.llm import get_llm
-from graph.graph_builder import build_state_graph
+from models.rate_limiter import RateLimitTimeout, get_rate_limiter
+from analysis.speculative import get_speculative_analyzer
+from analysis.complexity_schema import format_complexity_markdown, from_static, parse_analysis
+from analysis.benchmark import parse_benchmark
+from analysis.profiling import parse_profile
+from analysis.code_artifact import get_code_artifact
+from analysis.static_complexity import format_static_report
+from graph.graph_builder import get_compiled_graph
 from tools.tools_registry import get_all_tools
+from session.lifecycle import get_session_lifecycle
+from session.message_log import MessageLog
+from session.snapshots import build_code_submission, merge_snapshots
 from ui.sidebar import Sidebar
 from ui.chat_display import ChatDisplay
 from ui.chat_input import ChatInput
 from ui.code_editor import CodeEditor
+from ui.fragments import rerun
 
 
 class DSASolverApp:
@@ -21,70 +34,98 @@ class DSASolverApp:
         self.settings = get_settings()
         self.llm_service = get_llm()
         self.tools = get_all_tools()
-        self.app = build_state_graph(self.tools)
+        self.app = get_compiled_graph()
         
         # Initialize UI components
         self.sidebar = Sidebar(self.settings)
         self.chat_display = ChatDisplay()
         self.chat_input = ChatInput(on_submit=self.handle_user_input)
-        self.code_editor = CodeEditor(on_run_code=self.handle_code_execution)
+        self.code_editor = CodeEditor(
+            on_run_code=self.handle_code_execution,
+            on_code_change=self.handle_code_change,
+            use_component=self.settings.editor_component_enabled,
+            sync_debounce_ms=self.settings.editor_sync_debounce_ms,
+        )
         
         # Initialize session state
         self._init_session_state()
     
     def _init_session_state(self):
         """Initialize session state variables."""
-        if "messages" not in st.session_state:
-            st.session_state.messages = []
+        if "session_id" not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex
+        
+        if "message_log" not in st.session_state:
+            st.session_state.message_log = MessageLog()
         
         if "current_thread_id" not in st.session_state:
             st.session_state.current_thread_id = "default"
         
-        if "app_state" not in st.session_state:
-            st.session_state.app_state = {"messages": []}
-        
         if "processing" not in st.session_state:
             st.session_state.processing = False
         
         if "last_execution_time" not in st.session_state:
             st.session_state.last_execution_time = 0
+        
+        self._touch_session()
+    
+    def _touch_session(self):
+        """Record activity so the session is not spilled while in use (and restore it if it was)."""
+        lifecycle = get_session_lifecycle()
+        if lifecycle is not None:
+            lifecycle.touch(st.session_state.session_id, st.session_state.message_log)
     
-    def handle_user_input(self, user_message: str):
-        """Handle user input and process through the LangGraph app."""
+    def handle_user_input(
+        self,
+        user_message: str,
+        intent: Optional[Dict[str, Any]] = None,
+        state_update: Optional[Dict[str, Any]] = None,
+        display_text: Optional[str] = None,
+        rerun_scope: str = "fragment",
+    ):
+        """Handle user input and process through the LangGraph app.
+        
+        Args:
+            user_message: Text sent to the graph (and shown in the chat unless display_text is given)
+            intent: Optional structured intent (e.g. from a button) that lets the
+                graph dispatch straight to a tool instead of asking the LLM to plan
+            state_update: Extra graph state for this turn (e.g. a new code snapshot)
+            display_text: Shorter text to show in the chat instead of user_message
+            rerun_scope: "fragment" to redraw only the chat, "app" when the turn
+                was started from another fragment (e.g. the editor)
+        """
         if st.session_state.processing:
             return
         
         try:
             st.session_state.processing = True
             
+            log = st.session_state.message_log
+            
             # Debug output
             print(f"🔍 Processing message: '{user_message}'")
-            print(f"📊 Current messages count: {len(st.session_state.messages)}")
-            
-            # Add user message to session state first (with timestamp)
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            st.session_state.messages.append({
-                "role": "user",
-                "content": user_message,
-                "timestamp": timestamp
-            })
-            
-            # Create HumanMessage for LangGraph
-            human_message = HumanMessage(content=user_message)
+            print(f"📊 Current messages count: {len(log)}")
             
-            # Update app state with new message
-            st.session_state.app_state["messages"].append(human_message)
+            # Log the user message once; the chat shows display_text instead when given
+            log.add_user(user_message, display=display_text)
             
-            # Store the count of messages before processing to identify new ones
-            messages_before_count = len(st.session_state.app_state["messages"])
+            # Project the log to the graph input; the result's new messages follow these
+            graph_input = log.graph_input(**(state_update or {}), intent=intent)
+            messages_before_count = len(graph_input["messages"])
             print(f"📝 LangGraph messages before: {messages_before_count}")
             
-            # Show thinking indicator
-            with st.spinner("🤔 Thinking..."):
+            # Show thinking indicator, with the expected queue time when the LLM quota is busy
+            limiter = get_rate_limiter()
+            wait_s = limiter.estimate_wait() if limiter is not None else 0
+            spinner_text = f"⏳ High demand, about {wait_s:.0f}s wait..." if wait_s >= 1 else "🤔 Thinking..."
+            with st.spinner(spinner_text):
                 # Process the message through the LangGraph app
                 result = self.app.invoke(
-                    st.session_state.app_state,
-                    config={"configurable": {"thread_id": st.session_state.current_thread_id}}
+                    graph_input,
+                    config={"configurable": {
+                        "thread_id": st.session_state.current_thread_id,
+                        "session_id": st.session_state.session_id,
+                    }}
                 )
                 
                 print(f"🧠 LangGraph result messages: {len(result.get('messages', []))}")
@@ -95,49 +136,33 @@ class DSASolverApp:
                     new_messages = result["messages"][messages_before_count:]
                     print(f"🆕 New messages from LangGraph: {len(new_messages)}")
                     
+                    # Structured results waiting to be shown with the next reply
+                    pending_complexity = None
+                    pending_benchmark = None
+                    
                     for message in new_messages:
                         print(f"🔍 Processing message type: {type(message)}")
                         print(f"🔍 Message content preview: {getattr(message, 'content', 'No content')[:100]}...")
+                        entry = log.add_message(message)
                         
                         if isinstance(message, AIMessage):
                             print(f"📝 AI Message found with content: {bool(message.content)}")
-                            print(f"📝 AI Message has tool calls: {bool(hasattr(message, 'tool_calls') and message.tool_calls)}")
-                            
-                            # Check if this message has tool calls
-                            if hasattr(message, 'tool_calls') and message.tool_calls:
-                                for tool_call in message.tool_calls:
-                                    tool_name = tool_call.get('name', 'Unknown Tool')
-                                    
-                                    # Map internal tool names to user-friendly names
-                                    tool_display_names = {
-                                        'python_repl': 'Code Executor',
-                                        'generate_hint': 'Hint Generator',
-                                        'complexity_analyzer': 'Complexity Analyzer',
-                                        'generate_test_cases': 'Test Case Generator',
-                                        'persistent_python_repl': 'Code Executor'
-                                    }
-                                    
-                                    display_name = tool_display_names.get(tool_name, tool_name)
-                                    
-                                    # Add a tool usage indicator to the chat
-                                    tool_timestamp = datetime.now().strftime("%H:%M:%S")
-                                    st.session_state.messages.append({
-                                        "role": "system",
-                                        "content": f"🔧 Using {display_name}...",
-                                        "timestamp": tool_timestamp
-                                    })
-                                    print(f"🔧 Tool used: {tool_name} (displayed as: {display_name})")
+                            print(f"📝 AI Message has tool calls: {bool(message.tool_calls)}")
+                            for tool_call in message.tool_calls:
+                                print(f"🔧 Tool used: {tool_call.get('name', 'Unknown Tool')}")
                             
-                            # Add the actual AI response if it has content
+                            # Attach structured results to the reply that presents them
                             if message.content:
                                 print(f"✅ Adding AI response: '{message.content[:50]}...'")
-                                # Add assistant response to session state
-                                assistant_timestamp = datetime.now().strftime("%H:%M:%S")
-                                st.session_state.messages.append({
-                                    "role": "assistant",
-                                    "content": message.content,
-                                    "timestamp": assistant_timestamp
-                                })
+                                if pending_complexity:
+                                    entry.attach("complexity", pending_complexity)
+                                    # Fast-path replies are just the rendered structure
+                                    if message.content == format_complexity_markdown(pending_complexity):
+                                        entry.display = ""
+                                    pending_complexity = None
+                                if pending_benchmark:
+                                    entry.attach("benchmark", pending_benchmark)
+                                    pending_benchmark = None
                             else:
                                 print("⚠️ AI Message has no content to display")
                         
@@ -148,29 +173,43 @@ class DSASolverApp:
                             print(f"🔧 ToolMessage content length: {len(message.content) if message.content else 0}")
                             print(f"🔧 ToolMessage content preview: {message.content[:200] if message.content else 'None'}...")
                             
+                            if tool_name == "complexity_analyzer":
+                                pending_complexity = parse_analysis(message.content)
+                            elif tool_name == "benchmark_solutions":
+                                pending_benchmark = parse_benchmark(message.content)
+                            elif tool_name == "python_repl":
+                                # Measured hot lines and memory use are shown in the editor
+                                profile = parse_profile(message.content)
+                                if profile:
+                                    st.session_state.code_profile = profile
+                                memory_profile = parse_profile(message.content, mode="memory")
+                                if memory_profile:
+                                    st.session_state.memory_profile = memory_profile
+                            
                             # Don't display tool results directly - the assistant will synthesize them
                             print("🔧 Tool result received, letting LLM synthesize...")
                             
-                    # Update app state with the complete result
-                    st.session_state.app_state = result
+                    # Carry snapshots and turn state into the next turn (messages are already logged)
+                    log.update_state(result)
                 else:
                     print("⚠️ No new messages received from LangGraph")
         
+        except RateLimitTimeout as e:
+            print(f"⏳ {e}")
+            st.session_state.message_log.add_assistant(
+                "The mentor is handling a lot of requests right now. Please try again in a minute.", ui_only=True
+            )
+        
         except Exception as e:
             error_msg = f"Error processing message: {str(e)}"
             st.error(error_msg)
             # Add error message to chat
-            error_timestamp = datetime.now().strftime("%H:%M:%S")
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": f"Sorry, I encountered an error: {str(e)}",
-                "timestamp": error_timestamp
-            })
+            st.session_state.message_log.add_assistant(f"Sorry, I encountered an error: {str(e)}", ui_only=True)
         
         finally:
             st.session_state.processing = False
-            # Force UI update after processing is complete
-            st.rerun()
+            # Redraw the chat (or the whole page when started from another fragment)
+            rerun(rerun_scope)
     
     def handle_code_execution(self, code: str):
         """Handle code execution and analysis."""
@@ -185,28 +224,90 @@ class DSASolverApp:
         st.session_state.last_execution_time = current_time
         
         try:
-            # Simple, clean message for code analysis
-            analysis_message = f"""
-I'd like you to analyze this code:
-
-```python
-{code}
-```
-
-Please execute it and provide feedback on the implementation. If you notice any issues or if it runs successfully, let me know about the approach and any suggestions for improvement.
-"""
+            # Reuse whatever the speculative pre-analysis already computed for this code
+            precomputed = self._precomputed_context(code)
+            
+            # Store the code once as a snapshot; the message carries it in full or as a diff
+            snapshot_update, analysis_message = build_code_submission(
+                code, st.session_state.message_log.state, extra=precomputed
+            )
             
             # Process through the regular chat flow (don't add duplicate user message)
-            self.handle_user_input(analysis_message)
+            self.handle_user_input(
+                analysis_message,
+                state_update=snapshot_update,
+                display_text=f"▶️ Run & Analyze (snapshot `{snapshot_update['current_snapshot']}`)",
+                rerun_scope="app",
+            )
             
         except Exception as e:
             st.error(f"Error executing code: {str(e)}")
             st.session_state.processing = False
     
+    def handle_complexity_request(self):
+        """Answer a complexity question locally when static analysis is confident enough."""
+        question = "What's the time complexity?"
+        code = st.session_state.get("current_code", "").strip()
+        
+        result = None
+        if code:
+            warm = get_speculative_analyzer().warm_results(code)
+            result = (warm or {}).get("static_complexity") or get_code_artifact(code).static_complexity
+        
+        # Fall back to the LLM for code the heuristics cannot settle
+        if result is None or "error" in result or result["confidence"] == "low":
+            self.handle_user_input(question, intent={"name": "complexity", "args": {"code": code}})
+            return
+        
+        structured = from_static(result)
+        report = format_complexity_markdown(structured)
+        
+        # Log both sides so follow-up questions can refine the answer
+        log = st.session_state.message_log
+        snapshot_update, _ = build_code_submission(code, log.state)
+        log.state["snapshots"] = merge_snapshots(log.state.get("snapshots"), snapshot_update["snapshots"])
+        log.state["current_snapshot"] = snapshot_update["current_snapshot"]
+        log.add_user(f"{question} (snapshot `{log.state['current_snapshot']}`)", display=question)
+        log.add_assistant(report, display="").attach("complexity", structured)
+        print(f"⚡ Answered complexity locally in {result['elapsed_ms']} ms")
+        rerun()
+    
+    def handle_code_change(self, code: str):
+        """Schedule speculative pre-analysis of edited code."""
+        if self.settings.speculative_enabled:
+            get_speculative_analyzer().schedule(st.session_state.session_id, code)
+    
+    def _precomputed_context(self, code: str) -> str:
+        """Build a prompt section from warm speculative results for the code."""
+        warm = get_speculative_analyzer().warm_results(code)
+        if not warm:
+            return ""
+        
+        sections = []
+        if warm.get("syntax_error"):
+            sections.append(f"Pre-check found a syntax error: {warm['syntax_error']}")
+        if warm.get("static_complexity") and "error" not in warm["static_complexity"]:
+            sections.append(format_static_report(warm["static_complexity"]))
+        if warm.get("test_cases"):
+            sections.append(
+                "Test cases were already generated for this problem "
+                f"(no need to call generate_test_cases):\n{warm['test_cases']}"
+            )
+        if not sections:
+            return ""
+        print(f"♨️ Using warm speculative results for {warm['fingerprint']}")
+        return "\n" + "\n\n".join(sections) + "\n"
+    
     def render(self):
-        """Render the main application interface."""
+        """Render the main application interface.
+        
+        The sidebar, editor and chat are separate fragments: interacting with
+        one reruns only that fragment. Actions that change another panel
+        (e.g. Run & Analyze posting to the chat) rerun the whole app.
+        """
         # Render sidebar
-        self.sidebar.render()
+        with st.sidebar:
+            self._render_sidebar()
         
         # Main title (compact)
         st.title("🧮 DSA Solver")
@@ -222,36 +323,48 @@ Please execute it and provide feedback on the implementation. If you notice any
             # Chat mentor interface
             self._render_chat_interface()
     
+    @st.fragment
+    def _render_sidebar(self):
+        """Render the sidebar."""
+        self.sidebar.render()
+    
+    @st.fragment
     def _render_chat_interface(self):
-        """Render the chat interface."""
+        """Render the chat interface (history and input share a fragment so a new message redraws both)."""
+        self._touch_session()
+        
         # Chat area
         st.subheader("🤖 DSA Mentor")
         
         # Display chat messages in a more compact container
         if st.session_state.get("debug_mode", False):
-            st.write(f"Debug: Total messages in session: {len(st.session_state.messages)}")
+            st.write(f"Debug: Total messages in session: {len(st.session_state.message_log)}")
         
         # Chat container that grows with content
-        self.chat_display.render_messages(st.session_state.messages)
+        self.chat_display.render_messages(st.session_state.message_log.display_messages())
         
         # Use the dedicated ChatInput component instead of duplicating logic
         self.chat_input.set_placeholder("Ask about algorithms, get hints...")
         self.chat_input.render()
         
         # Only 2 compact example prompts when no messages
-        if not st.session_state.get("messages", []):
+        if not st.session_state.message_log:
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("💡 Get hints", key="example_hints", use_container_width=True):
-                    self.handle_user_input("Can you give me a hint?")
-                    st.rerun()
+                    self.handle_user_input(
+                        "Can you give me a hint?",
+                        intent={"name": "hint", "args": {"code": st.session_state.get("current_code", "")}},
+                    )
             with col2:
                 if st.button("📊 Analyze complexity", key="example_complexity", use_container_width=True):
-                    self.handle_user_input("What's the time complexity?")
-                    st.rerun()
+                    self.handle_complexity_request()
     
+    @st.fragment
     def _render_code_interface(self):
         """Render the code editor interface."""
+        self._touch_session()
+        
         # Code editor
         st.subheader("📝 Code Editor")
         st.markdown("*Write, test, and analyze your algorithms*")
@@ -274,6 +387,11 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    # Serve the HTTP API from this process so it shares caches and REPLs
+    if get_settings().api_enabled:
+        from api.server import start_background_server
+        start_background_server()
+    
     app = DSASolverApp()
     app.render()
 
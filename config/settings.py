@@ -1,10 +1,142 @@
+from typing import Dict
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
-    google_api_key: str
-    model_name: str = "gemini-1.5-flash"
+    google_api_key: str = ""
+    model_name: str = "gemini-2.5-flash"
     app_title: str = "DSA Solver"
 
+    # LLM backends: "gemini" or "openai" (any OpenAI-compatible HTTP endpoint,
+    # e.g. a self-hosted inference server). Model names use ``llm_backend``
+    # unless prefixed with a backend, as in "openai:qwen2.5-7b-instruct".
+    llm_backend: str = "gemini"
+    openai_base_url: str = "http://localhost:8000/v1"
+    openai_api_key: str = ""
+    openai_timeout_s: float = 60.0
+    # Whether OpenAI-compatible calls count against the shared LLM rate limit
+    # (leave off for self-hosted servers that have no provider quota).
+    openai_rate_limited: bool = False
+
+    # Model routing: each task is served by a tier, each tier maps to a model.
+    # "full" always resolves to ``model_name``; "cheap" to ``cheap_model_name``;
+    # "local" to ``local_model_name`` (falling back to the cheap tier when empty).
+    cheap_model_name: str = "gemini-2.5-flash-lite"
+    local_model_name: str = ""
+    model_task_tiers: Dict[str, str] = {
+        "assistant": "full",
+        "complexity": "full",
+        "test_case": "cheap",
+        "hint": "cheap",
+    }
+    # Per-task latency budgets (ms). When the rolling latency of a task's model
+    # exceeds its budget, the task is downgraded to the cheap tier for a while.
+    model_latency_budgets_ms: Dict[str, int] = {
+        "assistant": 20000,
+        "complexity": 12000,
+        "test_case": 6000,
+        "hint": 4000,
+    }
+    # Per-task cost budgets (USD per call), checked against observed token usage.
+    model_cost_budgets_usd: Dict[str, float] = {
+        "assistant": 0.05,
+        "complexity": 0.02,
+        "test_case": 0.005,
+        "hint": 0.002,
+    }
+    # Blended price per million tokens, used to estimate per-call cost.
+    model_prices_per_million_tokens: Dict[str, float] = {
+        "gemini-2.5-flash": 1.0,
+        "gemini-2.5-flash-lite": 0.2,
+    }
+    model_downgrade_cooldown_s: float = 60.0
+    # Consecutive failed calls (errors, timeouts) after which a task's primary
+    # model is downgraded, however fast the failures were.
+    model_failures_before_downgrade: int = 2
+
+    # Micro-batching of tool LLM calls (hints, test cases, complexity): requests
+    # arriving within the window are dispatched together. 0 disables batching.
+    llm_batch_window_ms: float = 15.0
+    llm_batch_max_size: int = 8
+    llm_max_concurrent_batches: int = 8
+
+    # Admission control shared by every LLM call (0 disables a budget). Calls
+    # queue by priority until their class's deadline instead of failing, and
+    # the process reports itself saturated once interactive waits get long.
+    llm_requests_per_minute: int = 1000
+    llm_tokens_per_minute: int = 1_000_000
+    llm_queue_deadlines_s: Dict[str, float] = {
+        "interactive": 60.0,
+        "speculative": 5.0,
+        "batch": 600.0,
+    }
+    llm_saturation_wait_s: float = 15.0
+
+    # Per-turn budgets for the assistant <-> tools loop. When one is spent, pending
+    # tool calls are skipped and the assistant gives a final answer without tools.
+    # Budgets are checked between steps: turn_max_seconds cannot stop a tool that
+    # is already running, so a turn can overrun it by one tool's duration (code
+    # runs are bounded by repl_max_run_s, benchmarks and stress tests by their budgets).
+    turn_max_tool_rounds: int = 6
+    turn_max_llm_calls: int = 8
+    turn_max_tokens: int = 60000
+    turn_max_seconds: float = 90.0
+
+    # Per-session REPL memory: variables over the per-object limit, unused for
+    # longer than the stale window (0 disables), or beyond the session total
+    # (least recently used first) are deleted after each execution.
+    repl_namespace_max_mb: float = 64.0
+    repl_object_max_mb: float = 32.0
+    repl_stale_after_s: float = 1800.0
+    # Each execution is interrupted after this long (0 disables), so an infinite
+    # loop fails its own run instead of tying up the session. Sessions run
+    # concurrently; long C calls (e.g. time.sleep) stop only when they return.
+    repl_max_run_s: float = 30.0
+
+    # benchmark_solutions stops measuring larger input sizes after this long,
+    # and stress_test stops generating new cases.
+    benchmark_time_budget_s: float = 20.0
+    stress_time_budget_s: float = 10.0
+
+    # Browser-side code editor: edits reach the server only after this idle
+    # pause (or on blur / Ctrl+Enter). Disable to fall back to st.text_area.
+    editor_component_enabled: bool = True
+    editor_sync_debounce_ms: int = 1000
+
+    # Code snapshots kept per conversation (0 keeps all). The least recently
+    # submitted are dropped first; their IDs in older messages stop resolving.
+    snapshot_max_kept: int = 20
+
+    # Smallest prompt prefix (tokens) the provider caches; shorter prefixes are
+    # not counted as cached in the prompt-cache metrics (Gemini 2.5 Flash: 1024).
+    prompt_cache_min_tokens: int = 1024
+
+    # Speculative pre-analysis of editor code while the user is idle.
+    speculative_enabled: bool = True
+    speculative_debounce_s: float = 1.5
+    speculative_max_runs_per_minute: int = 6
+
+    # Headless HTTP/JSON API. When enabled, the Streamlit process also serves
+    # the API so both share the graph, result cache and REPL pool.
+    api_enabled: bool = False
+    api_host: str = "0.0.0.0"
+    api_port: int = 8502
+    api_max_concurrent_turns: int = 16
+    # Conversations kept in memory; the least recently used is forgotten first.
+    api_max_conversations: int = 1024
+
+    # Tool outputs longer than this are moved to the session's artifact store
+    # and replaced in the conversation by a summary plus a retrieval handle.
+    artifact_inline_max_chars: int = 2000
+    artifact_session_memory_bytes: int = 256 * 1024
+    artifact_spill_dir: str = ""
+
+    # Sessions idle for longer than this (0 disables) have their conversation,
+    # artifacts and a REPL namespace summary written compressed to the spill
+    # directory (a temporary directory when empty) and freed until they return.
+    session_idle_spill_s: float = 900.0
+    session_spill_dir: str = ""
+    session_sweep_interval_s: float = 60.0
+
     class Config:
         env_file = ".env"
         extra = "allow"
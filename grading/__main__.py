@@ -0,0 +1,33 @@
+import argparse
+import json
+
+from grading.batch_grader import BatchGrader, load_problem_spec, load_submissions
+
+
+def main():
+    """Command-line entry point: python -m grading <submissions_dir> --spec spec.json"""
+    parser = argparse.ArgumentParser(description="Grade a directory of DSA submissions headlessly.")
+    parser.add_argument("submissions", help="Directory containing one .py file per submission")
+    parser.add_argument("--spec", required=True, help="Problem spec JSON (entry_point, tests, ...)")
+    parser.add_argument("--report", default="grading_report.jsonl", help="Output report (.jsonl or .csv)")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--llm-complexity", action="store_true", help="Also review complexity with the LLM")
+    parser.add_argument("--llm-batch-size", type=int, default=5, help="Submissions per LLM call")
+    args = parser.parse_args()
+
+    spec = load_problem_spec(args.spec)
+    submissions = load_submissions(args.submissions)
+    print(f"📥 Grading {len(submissions)} submissions for {spec['entry_point']}...")
+
+    grader = BatchGrader(
+        spec,
+        max_workers=args.workers,
+        llm_complexity=args.llm_complexity,
+        llm_batch_size=args.llm_batch_size,
+    )
+    stats = grader.run(submissions, args.report)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import csv
+import json
+import os
+import signal
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from analysis.code_artifact import get_code_artifact
+
+# Output kept per submission in the report.
+_MAX_OUTPUT_CHARS = 500
+
+
+class _GradingTimeout(BaseException):
+    """Raised inside a worker when a submission exceeds its time limit.
+
+    Derives from BaseException so the REPL's ``except Exception`` does not swallow it.
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise _GradingTimeout()
+
+
+def load_problem_spec(path: str) -> Dict[str, Any]:
+    """
+    Load a problem spec from JSON.
+
+    The spec holds ``entry_point`` (function to call), ``tests`` (list of
+    ``{"args": [...], "kwargs": {...}, "expected": ...}``) and optionally
+    ``description``, ``timeout_s`` and ``compare`` ("exact" or "unordered").
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if "entry_point" not in spec:
+        raise ValueError(f"Problem spec {path} has no 'entry_point'")
+    spec.setdefault("tests", [])
+    spec.setdefault("timeout_s", 5.0)
+    spec.setdefault("compare", "exact")
+    return spec
+
+
+def load_submissions(directory: str) -> List[Dict[str, str]]:
+    """Load every ``*.py`` file in a directory as a submission, sorted by name."""
+    submissions = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".py"):
+            continue
+        path = os.path.join(directory, name)
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            submissions.append({"id": name[:-3], "path": path, "code": f.read()})
+    return submissions
+
+
+def _matches(actual: Any, expected: Any, compare: str) -> bool:
+    if compare == "unordered" and isinstance(actual, (list, tuple)) and isinstance(expected, (list, tuple)):
+        try:
+            return sorted(actual) == sorted(expected)
+        except TypeError:
+            return False
+    if isinstance(actual, tuple) and isinstance(expected, list):
+        actual = list(actual)
+    return actual == expected
+
+
+def grade_submission(code: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute one submission and run the spec's tests against it.
+
+    Runs in a worker process: the code is executed in a fresh persistent REPL
+    (the same executor the ``python_repl`` tool uses), then every test calls
+    the entry point in that namespace. The whole run is bounded by the spec's
+    ``timeout_s``. Local static complexity analysis is included.
+    """
+    from tools.persistent_python_repl import PersistentPythonREPLTool
+
+    started = time.perf_counter()
+    result: Dict[str, Any] = {
+        "status": "ok",
+        "passed": 0,
+        "failed": 0,
+        "failures": [],
+        "output": "",
+        "static_complexity": None,
+    }
+
+    complexity = get_code_artifact(code).static_complexity
+    if "error" in complexity:
+        result.update(status="syntax_error", error=complexity["error"])
+        result["grading_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+    result["static_complexity"] = {k: complexity[k] for k in ("time", "space", "confidence")}
+
+    repl = PersistentPythonREPLTool()
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, float(spec["timeout_s"]))
+    try:
+        result["output"] = repl.execute(code)[:_MAX_OUTPUT_CHARS]
+        function = repl.global_namespace.get(spec["entry_point"])
+        if not callable(function):
+            result.update(status="missing_entry_point", error=f"{spec['entry_point']} is not defined")
+        else:
+            for index, test in enumerate(spec["tests"]):
+                try:
+                    actual = function(*test.get("args", []), **test.get("kwargs", {}))
+                except Exception as e:
+                    result["failed"] += 1
+                    result["failures"].append({"test": index, "error": f"{type(e).__name__}: {e}"})
+                    continue
+                if _matches(actual, test.get("expected"), spec["compare"]):
+                    result["passed"] += 1
+                else:
+                    result["failed"] += 1
+                    result["failures"].append({"test": index, "expected": test.get("expected"), "actual": repr(actual)[:200]})
+    except _GradingTimeout:
+        result.update(status="timeout", error=f"exceeded {spec['timeout_s']}s")
+    except BaseException as e:
+        # sys.exit() and the like in a submission must not escape the worker
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+    if result["status"] == "ok" and result["failed"]:
+        result["status"] = "failed"
+    result["grading_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+class _ReportWriter:
+    """Append graded results to a JSONL or CSV report as they complete."""
+
+    CSV_FIELDS = ["id", "fingerprint", "duplicate_of", "status", "passed", "failed",
+                  "time", "space", "llm_time", "llm_space", "grading_ms", "error"]
+
+    def __init__(self, path: str):
+        self.path = path
+        self.is_csv = path.endswith(".csv")
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._csv = None
+        if self.is_csv:
+            self._csv = csv.DictWriter(self._file, fieldnames=self.CSV_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self.is_csv:
+            static = row.get("static_complexity") or {}
+            llm = row.get("llm_complexity") or {}
+            self._csv.writerow({**row, "time": static.get("time"), "space": static.get("space"),
+                                "llm_time": llm.get("time"), "llm_space": llm.get("space")})
+        else:
+            self._file.write(json.dumps(row, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BatchGrader:
+    """Grade many submissions for one problem headlessly.
+
+    Identical submissions (same AST fingerprint) are graded once. Unique
+    submissions run across a process pool with a bounded number in flight,
+    optional LLM complexity reviews are packed several submissions per call,
+    and every result is streamed to the report as soon as it is final.
+    """
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        max_workers: int = 4,
+        llm_complexity: bool = False,
+        llm_batch_size: int = 5,
+    ):
+        """
+        Initialize the grader.
+
+        Args:
+            spec: Problem spec (see ``load_problem_spec``)
+            max_workers: Worker processes executing submissions
+            llm_complexity: Also ask the LLM to review complexity
+            llm_batch_size: Submissions packed into each LLM call
+        """
+        self.spec = spec
+        self.max_workers = max_workers
+        self.llm_complexity = llm_complexity
+        self.llm_batch_size = max(1, llm_batch_size)
+
+    def run(self, submissions: List[Dict[str, str]], report_path: str) -> Dict[str, Any]:
+        """
+        Grade submissions and stream results to ``report_path``.
+
+        Returns:
+            Throughput statistics for the run
+        """
+        started = time.perf_counter()
+        groups: Dict[str, List[Dict[str, str]]] = {}
+        for submission in submissions:
+            groups.setdefault(get_code_artifact(submission["code"]).fingerprint, []).append(submission)
+
+        writer = _ReportWriter(report_path)
+        grading_times: List[float] = []
+        statuses: Dict[str, int] = {}
+        pending_llm: List[tuple] = []
+        llm_calls = 0
+
+        def emit(fingerprint: str, graded: Dict[str, Any]) -> None:
+            members = groups[fingerprint]
+            for submission in members:
+                row = {"id": submission["id"], "fingerprint": fingerprint,
+                       "duplicate_of": members[0]["id"] if submission is not members[0] else None, **graded}
+                writer.write(row)
+                statuses[graded["status"]] = statuses.get(graded["status"], 0) + 1
+
+        def flush_llm() -> None:
+            nonlocal llm_calls
+            if not pending_llm:
+                return
+            reviews = self._review_complexity([groups[fp][0]["code"] for fp, _ in pending_llm])
+            llm_calls += 1
+            for (fingerprint, graded), review in zip(pending_llm, reviews):
+                graded["llm_complexity"] = review
+                emit(fingerprint, graded)
+            pending_llm.clear()
+
+        pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            queue = [(fingerprint, members[0]["code"]) for fingerprint, members in groups.items()]
+            in_flight = {}
+            # Jobs in flight when a worker process died; rerun one at a time to find the culprit.
+            retry: List[tuple] = []
+            isolated = False
+            while queue or in_flight or retry:
+                if retry and not in_flight:
+                    job = retry.pop(0)
+                    in_flight[pool.submit(grade_submission, job[1], self.spec)] = job
+                    isolated = True
+                elif not retry:
+                    isolated = False
+                    # Bound the number of submitted-but-unfinished jobs.
+                    while queue and len(in_flight) < self.max_workers * 2:
+                        job = queue.pop(0)
+                        in_flight[pool.submit(grade_submission, job[1], self.spec)] = job
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job = in_flight.pop(future)
+                    fingerprint = job[0]
+                    try:
+                        graded = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        if not isolated:
+                            retry.append(job)
+                            continue
+                        graded = {"status": "error", "error": "worker process exited (e.g. os._exit or a crash)"}
+                    except KeyboardInterrupt:
+                        raise
+                    except BaseException as e:
+                        # One bad submission must never end the run
+                        graded = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+                    grading_times.append(graded.get("grading_ms", 0.0))
+                    if self.llm_complexity and graded["status"] != "syntax_error":
+                        pending_llm.append((fingerprint, graded))
+                        if len(pending_llm) >= self.llm_batch_size:
+                            flush_llm()
+                    else:
+                        emit(fingerprint, graded)
+                if broken:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            flush_llm()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            writer.close()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "submissions": len(submissions),
+            "unique": len(groups),
+            "duplicates": len(submissions) - len(groups),
+            "statuses": statuses,
+            "llm_calls": llm_calls,
+            "elapsed_s": round(elapsed, 3),
+            "submissions_per_s": round(len(submissions) / elapsed, 2) if elapsed else None,
+            "median_grading_ms": round(statistics.median(grading_times), 2) if grading_times else None,
+            "report": report_path,
+        }
+
+    def _review_complexity(self, codes: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Ask the LLM for the complexity of several submissions in one call."""
+        from models.llm import get_llm
+        from models.rate_limiter import llm_priority
+
+        numbered = "\n\n".join(f"### Submission {i}\n```python\n{code}\n```" for i, code in enumerate(codes))
+        prompt = (
+            "For each submission below, give its time and space complexity. Respond with only a JSON "
+            'array with one object per submission, in order: {"index": int, "time": "O(...)", '
+            '"space": "O(...)", "note": "one sentence"}.\n\n'
+            f"Problem: {self.spec.get('description', self.spec['entry_point'])}\n\n{numbered}"
+        )
+        try:
+            # Batch grading only uses rate-limit capacity left over by interactive users
+            with llm_priority("batch"):
+                content = get_llm("complexity").invoke(prompt).content
+            if isinstance(content, list):
+                content = "".join(str(part) for part in content)
+            start, end = content.find("["), content.rfind("]")
+            parsed = json.loads(content[start:end + 1])
+            by_index = {item.get("index"): item for item in parsed if isinstance(item, dict)}
+            return [by_index.get(i) for i in range(len(codes))]
+        except Exception as e:
+            print(f"⚠️ Batched complexity review failed: {e}")
+            return [None] * len(codes)
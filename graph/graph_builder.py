@@ -1,10 +1,20 @@
-from langchain_core.messages import SystemMessage
-from langgraph.graph import StateGraph, START, MessagesState
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import tools_condition, ToolNode
+from analysis.cache import ResultCache
+from analysis.code_artifact import get_code_artifact
+from graph.intent_router import DSAState, intent_router, latest_code, make_fast_path_node, route_after_intent
+from graph.turn_budget import (
+    FINAL_ANSWER_NOTE, SKIPPED_TOOL_RESULT, charge, exhausted_reason, get_turn_ledger, start_turn,
+)
 from models.llm import get_llm
+from models.prompt_cache import build_assistant_prefix, get_prefix_registry
+from session.artifact_store import offload_tool_messages
+from tools.tools_registry import get_all_tools
 
 def build_state_graph(tools: list):
-    sys_msg = SystemMessage(content=(
+    system_prompt = (
         "You are a Socratic DSA mentor. Your primary goal is to guide users to a solution through questions and hints, not to provide the answer directly. "
         "Engage in a conversation. Ask clarifying questions to understand the user's thought process. "
         "You have access to tools for code execution, hints, test cases, and analysis. "
@@ -28,21 +38,107 @@ def build_state_graph(tools: list):
         "- Check if code has test cases (print, assert, function calls, if __name__)\n"
         "- If no test cases exist, generate them first before execution\n"
         "- Execute code with test cases, then analyze complexity\n"
-        "- Provide educational feedback that synthesizes all tool results"
-    ))
+        "- Provide educational feedback that synthesizes all tool results\n\n"
+        
+        "CODE SNAPSHOTS:\n"
+        "- Submitted code is stored as a snapshot with an ID; later submissions may arrive as a diff\n"
+        "- Pass snapshot_id to python_repl and complexity_analyzer instead of copying the code; "
+        "python_repl runs the snapshot first, then any extra code you pass (e.g. test cases)\n\n"
+        
+        "PERFORMANCE QUESTIONS:\n"
+        "- When the user asks why code is slow, run python_repl with mode=\"profile\" on a large enough input "
+        "and cite the measured hot lines (line number, hits, % of time) rather than guessing\n"
+        "- For memory or space questions, use mode=\"memory\" with growth_call (an expression using n) "
+        "and cite peak memory, allocation sites and the measured growth exponent\n"
+        "- To compare approaches (e.g. brute force vs hash map), define both functions and call "
+        "benchmark_solutions with a shared args_expr; report the measured speedups and whether outputs agree\n"
+        "- To find edge-case bugs, call stress_test with input specs and a reference (e.g. a brute-force "
+        "version) or property; show the minimal counterexample and let the student work out the fix\n\n"
+        
+        "LARGE OUTPUTS:\n"
+        "- Long tool outputs are truncated to a summary with an artifact handle\n"
+        "- Call retrieve_artifact only when the summary is not enough to answer"
+    )
+    
+    # The router may swap the assistant model between calls, so bind tools per model once.
+    bound_llms = {}
+    
+    # System messages keyed by problem context, so the request prefix (system
+    # prompt + tool schemas + problem) stays byte-identical across turns.
+    # Problems come from user docstrings, so only recently used ones are kept.
+    prefixes = ResultCache(max_entries=128)
+    
+    def system_prefix(state):
+        code = latest_code(state)
+        problem = get_code_artifact(code).problem if code else None
     
-    llm = get_llm()
-    llm_with_tools = llm.bind_tools(tools)
+        def build():
+            prefix = build_assistant_prefix(system_prompt, tools, problem)
+            return prefix, SystemMessage(content=prefix.text)
     
-    def assistant(state: MessagesState):
-        return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
+        return prefixes.get_or_compute(problem, build)
     
-    graph = StateGraph(MessagesState)
+    def assistant(state: DSAState):
+        llm = get_llm("assistant")
+        turn = state.get("turn") or start_turn()
+        forced_reason = exhausted_reason(turn)
+        # Over budget: one last call with tools disabled forces the final answer
+        key = (id(llm), forced_reason is not None)
+        llm_with_tools = bound_llms.get(key)
+        if llm_with_tools is None:
+            choice = {"tool_choice": "none"} if forced_reason else {}
+            llm_with_tools = bound_llms[key] = llm.bind_tools(tools, **choice)
+        prefix, sys_msg = system_prefix(state)
+        if forced_reason:
+            print(f"🧾 Turn budget exhausted ({forced_reason}); forcing a final answer")
+            sys_msg = SystemMessage(content=sys_msg.content + FINAL_ANSWER_NOTE)
+        response = llm_with_tools.invoke([sys_msg] + state["messages"])
+        usage = getattr(response, "usage_metadata", None)
+        if not forced_reason:
+            get_prefix_registry().record(prefix, usage)
+        elif response.tool_calls:
+            response = AIMessage(content=response.content or (
+                "I reached this turn's limit on further checks. Ask me to continue if you'd like me to dig deeper."
+            ))
+        
+        turn = charge(turn, llm_calls=1, tokens=(usage or {}).get("total_tokens", 0))
+        if not response.tool_calls:
+            get_turn_ledger().record(turn, forced_reason)
+        return {"messages": [response], "turn": turn}
+    
+    tool_node = ToolNode(tools)
+    
+    def run_tools(state: DSAState, config: RunnableConfig):
+        turn = charge(state.get("turn"), tool_rounds=1)
+        calls = state["messages"][-1].tool_calls
+        if exhausted_reason(state.get("turn")):
+            # Answer every pending call so the assistant can still close the turn
+            skipped = [ToolMessage(content=SKIPPED_TOOL_RESULT, name=c["name"], tool_call_id=c["id"]) for c in calls]
+            return {"messages": skipped, "turn": turn}
+        # Large outputs go to the artifact store so they are not re-sent every turn
+        result = tool_node.invoke(state, config)
+        return {"messages": offload_tool_messages(result["messages"], config), "turn": turn}
+    
+    graph = StateGraph(DSAState)
+    graph.add_node("intent_router", intent_router)
+    graph.add_node("fast_path", make_fast_path_node(tools))
     graph.add_node("assistant", assistant)
-    graph.add_node("tools", ToolNode(tools))
-    graph.add_edge(START, "assistant")
+    graph.add_node("tools", run_tools)
+    # Button actions and unambiguous requests skip the planning LLM call
+    graph.add_edge(START, "intent_router")
+    graph.add_conditional_edges("intent_router", route_after_intent, ["fast_path", "assistant"])
+    graph.add_edge("fast_path", END)
     graph.add_conditional_edges("assistant", tools_condition)
     graph.add_edge("tools", "assistant")
     
     return graph.compile()
 
+
+_compiled_graph = None
+
+def get_compiled_graph():
+    """Return the process-wide compiled graph shared by the Streamlit UI and the API."""
+    global _compiled_graph
+    if _compiled_graph is None:
+        _compiled_graph = build_state_graph(get_all_tools())
+    return _compiled_graph
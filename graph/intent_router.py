@@ -0,0 +1,199 @@
+import re
+import uuid
+from typing import Annotated, Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import MessagesState
+from langgraph.prebuilt import ToolNode
+
+from analysis.code_artifact import get_code_artifact
+from analysis.complexity_schema import format_complexity_markdown, from_static, parse_analysis
+from graph.turn_budget import charge, get_turn_ledger, start_turn
+from session.artifact_store import offload_tool_messages
+from session.snapshots import current_code, merge_snapshots
+
+# Intent name -> tool that serves it directly.
+INTENT_TOOLS = {
+    "hint": "generate_hint",
+    "complexity": "complexity_analyzer",
+    "test_cases": "generate_test_cases",
+}
+
+# Free-text patterns for the local classifier. Each must match a request from the
+# start of the message ("give me a hint", "what's the complexity of my code"), so
+# questions that merely mention a topic go to the assistant.
+_REQUEST_PREFIX = (
+    r"^\W*(?:(?:ok(?:ay)?|hi|hey|so|i'?m\s+stuck(?:\s+on\s+[^,.!?]*)?|i\s+am\s+stuck)\W+)*"
+    r"(?:please\s+)?(?:(?:can|could|would|will)\s+(?:you|i)\s+(?:please\s+)?)?(?:i\s+)?"
+)
+_INTENT_PATTERNS = {
+    "hint": re.compile(
+        _REQUEST_PREFIX + r"(?:(?:give|get|have|need|want|send)\s+(?:me\s+)?)?"
+        r"(?:(?:a|an|another|one\s+more|some)\s+)?(?:(?:small|quick|little)\s+)?(?:hint|clue|nudge)s?\b",
+        re.IGNORECASE,
+    ),
+    # Complexity of the user's own code only, so the whole message must be the request
+    "complexity": re.compile(
+        _REQUEST_PREFIX + r"(?:(?:analy[sz]e|check|compute|calculate|tell\s+me|give\s+me|what(?:'s|\s+is))\s+)?"
+        r"(?:the\s+)?(?:(?:(?:time|space|time\s+and\s+space)\s+)?complexity|big[- ]?o)"
+        r"(?:\s+(?:of|for)\s+(?:my|this|the)\s+(?:code|solution|function|implementation|approach|submission)"
+        r"|\s+of\s+(?:it|this))?\W*(?:please\W*)?$",
+        re.IGNORECASE,
+    ),
+    "test_cases": re.compile(
+        _REQUEST_PREFIX + r"(?:generate|give|create|write|make|need|want|suggest)\s+(?:me\s+)?(?:\w+\s+){0,2}test[- ]?cases?\b",
+        re.IGNORECASE,
+    ),
+}
+# Mentions of each intent anywhere in the message; a request that also mentions
+# another intent ("a hint and the time complexity") is left to the assistant.
+_INTENT_MENTIONS = {
+    "hint": re.compile(r"\b(hint|clue|nudge)s?\b", re.IGNORECASE),
+    "complexity": re.compile(r"\bcomplexity\b|\bbig[- ]?o\b", re.IGNORECASE),
+    "test_cases": re.compile(r"\btest[- ]?cases?\b", re.IGNORECASE),
+}
+# Questions about earlier turns ("why does your last hint...") need the conversation, not a fresh tool call.
+_FOLLOW_UP = re.compile(r"\b(?:your|you\s+(?:said|gave|suggested|mentioned|wrote)|last|previous|earlier|above)\b",
+                        re.IGNORECASE)
+# Messages this long or carrying code are real questions, not button-style actions.
+_MAX_CLASSIFIED_CHARS = 160
+_CODE_BLOCK = re.compile(r"```(?:python)?\n(.*?)```", re.DOTALL)
+
+
+class DSAState(MessagesState):
+    """Graph state: the conversation, code snapshots and an optional structured intent for this turn."""
+    intent: Optional[Dict[str, Any]]
+    # Content-addressed code submissions (ID -> code) and the latest one.
+    snapshots: Annotated[Dict[str, str], merge_snapshots]
+    current_snapshot: Optional[str]
+    # Spend of the current turn (tool rounds, LLM calls, tokens, start time), checked against budgets.
+    turn: Optional[Dict[str, Any]]
+
+
+def classify_intent(text: str) -> Optional[str]:
+    """Classify a free-text message into a single unambiguous intent, if any."""
+    if len(text) > _MAX_CLASSIFIED_CHARS or "```" in text or _FOLLOW_UP.search(text):
+        return None
+    matches = [name for name, pattern in _INTENT_PATTERNS.items() if pattern.search(text)]
+    mentions = [name for name, pattern in _INTENT_MENTIONS.items() if pattern.search(text)]
+    return matches[0] if len(matches) == 1 and mentions == matches else None
+
+
+def latest_code(state: Dict[str, Any]) -> Optional[str]:
+    """Return the latest submitted snapshot, else the most recent code block the user sent."""
+    code = current_code(state)
+    if code is not None:
+        return code
+    for message in reversed(state["messages"]):
+        if isinstance(message, HumanMessage) and isinstance(message.content, str):
+            blocks = _CODE_BLOCK.findall(message.content)
+            if blocks:
+                return blocks[-1].strip()
+    return None
+
+
+def _latest_user_text(messages: List[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return message.content if isinstance(message.content, str) else str(message.content)
+    return ""
+
+
+def _problem_for(code: Optional[str]) -> Optional[str]:
+    if not code:
+        return None
+    return get_code_artifact(code).problem
+
+
+def resolve_intent(state: DSAState) -> Optional[Dict[str, Any]]:
+    """
+    Turn an explicit or classified intent into a complete tool request.
+
+    Returns:
+        ``{"name": intent, "args": tool_args}``, or None when the turn needs
+        the assistant (unknown intent or missing inputs)
+    """
+    messages = state["messages"]
+    intent = state.get("intent") or {}
+    name = intent.get("name") or classify_intent(_latest_user_text(messages))
+    if name not in INTENT_TOOLS:
+        return None
+
+    args = dict(intent.get("args") or {})
+    code = args.pop("code", None) or latest_code(state)
+
+    if name == "complexity":
+        if not code:
+            return None
+        # Reference the submitted snapshot rather than copying it into the tool call
+        if code == current_code(state):
+            return {"name": name, "args": {"snapshot_id": state["current_snapshot"]}, "code": code}
+        return {"name": name, "args": {"code": code}, "code": code}
+    problem = args.pop("problem", None) or _problem_for(code)
+    if name == "hint":
+        question = problem or (f"The student's current code:\n{code}" if code else None)
+        if question is None:
+            return None
+        # The problem alone keys the cached hint ladder, so repeat requests reveal the next level
+        return {"name": name, "args": {"question": question}}
+    if problem is None:
+        return None
+    return {"name": name, "args": {"problem_description": problem}}
+
+
+def intent_router(state: DSAState) -> Dict[str, Any]:
+    """Graph node: resolve the turn's intent (or clear it so the assistant handles the turn) and start its budget."""
+    return {"intent": resolve_intent(state), "turn": start_turn()}
+
+
+def route_after_intent(state: DSAState) -> str:
+    """Conditional edge: go straight to the fast path for resolved intents."""
+    return "fast_path" if state.get("intent") else "assistant"
+
+
+def make_fast_path_node(tools: list):
+    """
+    Build the node that serves a resolved intent without the planning LLM call.
+
+    The tool is called directly and its output becomes the assistant's reply,
+    so a button action costs at most the tool's own LLM call. Confident local
+    complexity results skip the LLM entirely.
+    """
+    # Run tools through a ToolNode so injected arguments (graph state, config) work as usual.
+    tool_node = ToolNode(tools)
+
+    def fast_path(state: DSAState, config: RunnableConfig) -> Dict[str, Any]:
+        intent = state["intent"]
+        tool_name = INTENT_TOOLS[intent["name"]]
+
+        if intent["name"] == "complexity":
+            result = get_code_artifact(intent["code"]).static_complexity
+            if "error" not in result and result["confidence"] != "low":
+                print(f"⚡ Fast path: local complexity in {result['elapsed_ms']} ms")
+                report = format_complexity_markdown(from_static(result))
+                get_turn_ledger().record(state.get("turn") or start_turn())
+                return {"messages": [AIMessage(content=report)], "intent": None}
+
+        call = {"name": tool_name, "args": intent["args"], "id": f"fast_{uuid.uuid4().hex[:12]}", "type": "tool_call"}
+        print(f"⚡ Fast path: {intent['name']} -> {tool_name}")
+        tool_request = AIMessage(content="", tool_calls=[call])
+        tool_message = tool_node.invoke({**state, "messages": state["messages"] + [tool_request]}, config)["messages"][-1]
+        # Structured results are rendered for the reply; the tool message keeps the compact form
+        structured = parse_analysis(tool_message.content)
+        # A large output is offloaded once; the reply repeats its summary and handle, not the output
+        stored = offload_tool_messages([tool_message], config)[0]
+        reply = format_complexity_markdown(structured) if structured else stored.content
+        turn = charge(state.get("turn"), tool_rounds=1)
+        get_turn_ledger().record(turn)
+        return {
+            "messages": [
+                tool_request,
+                stored,
+                AIMessage(content=reply),
+            ],
+            "intent": None,
+            "turn": turn,
+        }
+
+    return fast_path
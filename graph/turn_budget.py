@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config.settings import get_settings
+
+# Appended to the system prompt for the tools-free call that closes an over-budget turn.
+FINAL_ANSWER_NOTE = (
+    "\n\nTURN BUDGET EXHAUSTED: do not call any more tools. Answer now using the tool results "
+    "you already have, and say briefly if something could not be checked."
+)
+# Returned instead of running tools once the budget is spent.
+SKIPPED_TOOL_RESULT = "Skipped: this turn's tool budget is exhausted. Answer with the results you already have."
+
+
+def start_turn() -> Dict[str, Any]:
+    """Return the spend record for a new turn (``started`` is on the monotonic clock)."""
+    return {"started": time.monotonic(), "tool_rounds": 0, "llm_calls": 0, "tokens": 0}
+
+
+def charge(turn: Optional[Dict[str, Any]], tool_rounds: int = 0, llm_calls: int = 0, tokens: int = 0) -> Dict[str, Any]:
+    """Return ``turn`` with additional spend (graph state is updated by value)."""
+    turn = turn or start_turn()
+    return {
+        **turn,
+        "tool_rounds": turn["tool_rounds"] + tool_rounds,
+        "llm_calls": turn["llm_calls"] + llm_calls,
+        "tokens": turn["tokens"] + tokens,
+    }
+
+
+def exhausted_reason(turn: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Return which per-turn budget is spent ("tool_rounds", "llm_calls", "tokens", "seconds"), if any."""
+    if not turn:
+        return None
+    settings = get_settings()
+    if turn["tool_rounds"] >= settings.turn_max_tool_rounds:
+        return "tool_rounds"
+    # Keep one call in reserve for the final answer
+    if turn["llm_calls"] >= settings.turn_max_llm_calls - 1:
+        return "llm_calls"
+    if turn["tokens"] >= settings.turn_max_tokens:
+        return "tokens"
+    if time.monotonic() - turn["started"] >= settings.turn_max_seconds:
+        return "seconds"
+    return None
+
+
+class TurnLedger:
+    """Aggregate spend of finished turns, and how often a budget cut one short."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.forced: Dict[str, int] = {}
+        self.totals = {"tool_rounds": 0, "llm_calls": 0, "tokens": 0, "seconds": 0.0}
+        self.max_seconds = 0.0
+
+    def record(self, turn: Dict[str, Any], forced_reason: Optional[str] = None) -> None:
+        """Record one finished turn."""
+        seconds = time.monotonic() - turn["started"]
+        with self._lock:
+            self.turns += 1
+            for key in ("tool_rounds", "llm_calls", "tokens"):
+                self.totals[key] += turn[key]
+            self.totals["seconds"] += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            if forced_reason:
+                self.forced[forced_reason] = self.forced.get(forced_reason, 0) + 1
+        print(
+            f"🧾 Turn spend: {turn['tool_rounds']} tool rounds, {turn['llm_calls']} LLM calls, "
+            f"{turn['tokens']} tokens, {seconds:.1f}s" + (f" (budget hit: {forced_reason})" if forced_reason else "")
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-turn averages, the slowest turn and budget hits."""
+        with self._lock:
+            averages = {key: round(value / self.turns, 2) for key, value in self.totals.items()} if self.turns else {}
+            return {
+                "turns": self.turns,
+                "avg": averages,
+                "max_seconds": round(self.max_seconds, 2),
+                "forced_final_answers": dict(self.forced),
+            }
+
+
+_turn_ledger = None
+
+def get_turn_ledger() -> TurnLedger:
+    global _turn_ledger
+    if _turn_ledger is None:
+        _turn_ledger = TurnLedger()
+    return _turn_ledger
@@ -0,0 +1,104 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+
+from config.settings import Settings
+
+
+class LLMBackend(ABC):
+    """Builds chat models for one provider.
+
+    Every backend returns a LangChain chat model, so tool binding
+    (``bind_tools``, including ``tool_choice="none"``), streaming and
+    ``usage_metadata`` token accounting work the same way for the graph,
+    the router and the tools whichever provider serves a task.
+    """
+
+    name = ""
+    label = ""
+    # Extra arguments for ``with_structured_output`` on this provider.
+    structured_output_kwargs: Dict[str, Any] = {}
+
+    @abstractmethod
+    def create(self, model: str, settings: Settings, callbacks: List[BaseCallbackHandler]) -> BaseChatModel:
+        """Build a chat model for ``model`` reporting to ``callbacks``."""
+
+    def uses_shared_quota(self, settings: Settings) -> bool:
+        """Whether calls count against the shared LLM rate limit."""
+        return True
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through the Generative AI API."""
+
+    name = "gemini"
+    label = "Google Gemini"
+
+    def create(self, model: str, settings: Settings, callbacks: List[BaseCallbackHandler]) -> BaseChatModel:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        if not settings.google_api_key:
+            raise ValueError("GOOGLE_API_KEY is not set; it is required for Gemini models")
+        return ChatGoogleGenerativeAI(
+            model=model,
+            google_api_key=settings.google_api_key,
+            callbacks=callbacks,
+            metadata={"backend": self.name},
+        )
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Any server speaking the OpenAI chat completions API (e.g. a self-hosted inference server)."""
+
+    name = "openai"
+    label = "OpenAI-compatible"
+    # Self-hosted servers support tool calling far more often than JSON-schema
+    # response formats, and tool calls are what the graph already relies on.
+    structured_output_kwargs = {"method": "function_calling"}
+
+    def create(self, model: str, settings: Settings, callbacks: List[BaseCallbackHandler]) -> BaseChatModel:
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            model=model,
+            base_url=settings.openai_base_url,
+            # Local servers usually ignore the key, but the client requires one
+            api_key=settings.openai_api_key or "not-needed",
+            timeout=settings.openai_timeout_s,
+            # Report token usage on streamed responses too, as Gemini does
+            stream_usage=True,
+            callbacks=callbacks,
+            metadata={"backend": self.name},
+        )
+
+    def uses_shared_quota(self, settings: Settings) -> bool:
+        return settings.openai_rate_limited
+
+
+BACKENDS: Dict[str, LLMBackend] = {backend.name: backend for backend in (GeminiBackend(), OpenAICompatibleBackend())}
+
+
+def resolve_model(model: str, default_backend: str) -> Tuple[LLMBackend, str]:
+    """
+    Split a model setting into its backend and the provider's model name.
+
+    A known backend name followed by a colon selects that backend
+    (``openai:qwen2.5:3b``); anything else uses ``default_backend``.
+
+    Raises:
+        ValueError: If the default backend is unknown
+    """
+    prefix, sep, rest = model.partition(":")
+    if sep and prefix in BACKENDS:
+        return BACKENDS[prefix], rest
+    if default_backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{default_backend}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[default_backend], model
+
+
+def structured_output_kwargs(llm: BaseChatModel) -> Dict[str, Any]:
+    """Return the ``with_structured_output`` arguments for the backend that built ``llm``."""
+    backend = BACKENDS.get((getattr(llm, "metadata", None) or {}).get("backend", ""))
+    return dict(backend.structured_output_kwargs) if backend is not None else {}
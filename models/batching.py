@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from models.rate_limiter import PRIORITIES, current_priority, llm_priority
+
+
+class MicroBatcher:
+    """Collect concurrent LLM requests briefly and dispatch them together.
+
+    Requests for the same runnable that arrive within ``window_ms`` of each
+    other are grouped (up to ``max_batch``) and sent with a single
+    ``runnable.batch()`` call, so providers with native batching get one
+    request and the rest share a bounded dispatch pool. Identical prompts in
+    a group are sent once. Callers block until their own result is ready.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = 15.0,
+        max_batch: int = 8,
+        max_concurrent_batches: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            window_ms: How long the first request of a group waits for others (0 disables batching)
+            max_batch: Requests per group; a full group is dispatched immediately
+            max_concurrent_batches: Groups in flight at once
+            clock: Monotonic time source (seconds)
+        """
+        self.window_s = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent_batches), thread_name_prefix="llm-batch")
+        self._cond = threading.Condition()
+        # id(runnable) -> (runnable, [(prompt, future, enqueued_at, priority)])
+        self._queues: Dict[int, Tuple[Any, List[Tuple[Any, Future, float, str]]]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._waits_ms: Deque[float] = deque(maxlen=512)
+        self.requests = 0
+        self.batches = 0
+        self.coalesced = 0
+
+    def invoke(self, runnable, prompt: Any) -> Any:
+        """Invoke ``runnable`` on ``prompt`` through the batcher and return its result."""
+        if self.window_s <= 0:
+            return runnable.invoke(prompt)
+        future: Future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_loop, name="llm-batcher", daemon=True)
+                self._thread.start()
+            _, queue = self._queues.setdefault(id(runnable), (runnable, []))
+            queue.append((prompt, future, self.clock(), current_priority()))
+            self.requests += 1
+            self._cond.notify()
+        return future.result()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                due = self._due_locked()
+                while not due:
+                    self._cond.wait(timeout=self._next_deadline_locked())
+                    due = self._due_locked()
+            for runnable, group in due:
+                self._executor.submit(self._dispatch, runnable, group)
+
+    def _due_locked(self) -> List[Tuple[Any, list]]:
+        """Pop every group that is full or whose oldest request has waited a full window."""
+        now = self.clock()
+        due = []
+        for key in list(self._queues):
+            runnable, queue = self._queues[key]
+            if len(queue) >= self.max_batch or now - queue[0][2] >= self.window_s:
+                del self._queues[key]
+                for start in range(0, len(queue), self.max_batch):
+                    due.append((runnable, queue[start:start + self.max_batch]))
+        return due
+
+    def _next_deadline_locked(self) -> Optional[float]:
+        if not self._queues:
+            return None
+        oldest = min(queue[0][2] for _, queue in self._queues.values())
+        return max(0.0, oldest + self.window_s - self.clock())
+
+    def _dispatch(self, runnable, group: List[Tuple[Any, Future, float, str]]) -> None:
+        now = self.clock()
+        # A group is admitted at the most urgent priority among its callers
+        priority = min((entry[3] for entry in group), key=lambda p: PRIORITIES.get(p, len(PRIORITIES)))
+        # Identical prompts (e.g. the same problem from several students) are sent once
+        unique: Dict[str, Any] = {}
+        waiting: Dict[str, List[Future]] = {}
+        for prompt, future, enqueued, _ in group:
+            self._waits_ms.append((now - enqueued) * 1000)
+            key = repr(prompt)
+            unique.setdefault(key, prompt)
+            waiting.setdefault(key, []).append(future)
+        with self._cond:
+            self.batches += 1
+            self.coalesced += len(group) - len(unique)
+
+        try:
+            with llm_priority(priority):
+                results = runnable.batch(list(unique.values()), return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(unique)
+        for key, result in zip(unique, results):
+            for future in waiting[key]:
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request/batch counts and queue-time percentiles (ms)."""
+        with self._cond:
+            waits = sorted(self._waits_ms)
+            queued = sum(len(queue) for _, queue in self._queues.values())
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_batch_size": round((self.requests - queued) / self.batches, 2) if self.batches else 0.0,
+                "coalesced": self.coalesced,
+                "queued": queued,
+                "queue_ms_avg": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                "queue_ms_p95": round(waits[int(0.95 * (len(waits) - 1))], 2) if waits else 0.0,
+            }
+
+
+_llm_batcher = None
+_llm_batcher_lock = threading.Lock()
+
+def get_llm_batcher() -> MicroBatcher:
+    global _llm_batcher
+    # First use is typically concurrent, and every caller must share one batcher
+    with _llm_batcher_lock:
+        if _llm_batcher is None:
+            from config.settings import get_settings
+
+            settings = get_settings()
+            _llm_batcher = MicroBatcher(
+                window_ms=settings.llm_batch_window_ms,
+                max_batch=settings.llm_batch_max_size,
+                max_concurrent_batches=settings.llm_max_concurrent_batches,
+            )
+    return _llm_batcher
@@ -1,10 +1,17 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from config.settings import get_settings
+from models.backends import structured_output_kwargs
+from models.router import get_model_router
 
-def get_llm():
-    settings = get_settings()
-    return ChatGoogleGenerativeAI(
-        model=settings.model_name or "gemini-2.5-flash",
-        google_api_key=settings.google_api_key
-    )
+# Structured-output wrappers, reused so concurrent requests share a runnable (and a batch).
+_structured_llms = {}
 
+def get_llm(task: str = "assistant"):
+    """Return the chat model routed for ``task`` ("assistant", "complexity", "test_case" or "hint")."""
+    return get_model_router().get_llm(task)
+
+def get_structured_llm(task: str, schema):
+    """Return the routed model for ``task`` wrapped for ``schema`` output (with the raw message included)."""
+    llm = get_llm(task)
+    key = (id(llm), schema)
+    if key not in _structured_llms:
+        _structured_llms[key] = llm.with_structured_output(schema, include_raw=True, **structured_output_kwargs(llm))
+    return _structured_llms[key]
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Rough characters-per-token ratio used when the provider reports no usage.
+_CHARS_PER_TOKEN = 4
+# Prefix hashes remembered before expired ones are pruned.
+_MAX_TRACKED_PREFIXES = 4096
+
+
+class PromptPrefix:
+    """A byte-stable, cacheable prompt prefix.
+
+    Prompts are assembled as ``prefix + variable tail``: the prefix holds
+    only content that repeats across calls (instructions, system prompt,
+    tool schemas, problem context), so providers with prefix caching can
+    reuse it and the local registry can recognize it by hash.
+    """
+
+    def __init__(self, name: str, text: str, schemas: str = ""):
+        """
+        Args:
+            name: Label for metrics
+            text: Prefix text placed at the start of the prompt
+            schemas: Serialized tool schemas sent alongside the prefix (part of
+                its identity and size, but not of the prompt text)
+        """
+        self.name = name
+        self.text = text
+        self.hash = hashlib.sha256((text + schemas).encode("utf-8")).hexdigest()[:16]
+        self.estimated_tokens = max(1, len(text + schemas) // _CHARS_PER_TOKEN)
+
+    def assemble(self, tail: str) -> str:
+        """Return the full prompt: the stable prefix followed by the variable tail."""
+        return f"{self.text}\n\n{tail}"
+
+
+def tool_schemas_text(tools: list) -> str:
+    """Serialize tool schemas deterministically (sorted keys, bind order)."""
+    return json.dumps([convert_to_openai_tool(t) for t in tools], sort_keys=True, separators=(",", ":"))
+
+
+def build_assistant_prefix(system_prompt: str, tools: list, problem_context: Optional[str] = None) -> PromptPrefix:
+    """Build the assistant's prefix from the system prompt, tool schemas and problem context."""
+    text = system_prompt
+    if problem_context:
+        text += f"\n\nCURRENT PROBLEM:\n{problem_context}"
+    return PromptPrefix("assistant", text, tool_schemas_text(tools))
+
+
+class PrefixRegistry:
+    """Track prompt prefixes and cached vs uncached input tokens.
+
+    Providers that report cache hits (Gemini ``input_token_details.cache_read``)
+    are trusted. Otherwise a prefix seen within ``ttl_s`` is counted as
+    cached, as a local estimate of what prefix caching would save, but only
+    if it reaches ``min_cacheable_tokens``: providers do not cache shorter prefixes.
+    """
+
+    def __init__(self, ttl_s: float = 3600.0, min_cacheable_tokens: int = 1024):
+        self.ttl_s = ttl_s
+        self.min_cacheable_tokens = min_cacheable_tokens
+        self._last_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.provider_reported_calls = 0
+
+    def record(self, prefix: PromptPrefix, usage: Optional[Dict[str, Any]], prompt_chars: int = 0) -> None:
+        """
+        Record one call that used ``prefix``.
+
+        Args:
+            prefix: The prefix the prompt started with
+            usage: ``usage_metadata`` of the response, if any
+            prompt_chars: Prompt size, used to estimate tokens when usage is missing
+        """
+        now = time.monotonic()
+        with self._lock:
+            warm = now - self._last_seen.get(prefix.hash, float("-inf")) <= self.ttl_s
+            self._last_seen[prefix.hash] = now
+            if len(self._last_seen) > _MAX_TRACKED_PREFIXES:
+                # Expired prefixes would count as cold anyway
+                self._last_seen = {h: seen for h, seen in self._last_seen.items() if now - seen <= self.ttl_s}
+            self.calls += 1
+
+            input_tokens = (usage or {}).get("input_tokens") or max(prefix.estimated_tokens, prompt_chars // _CHARS_PER_TOKEN)
+            cache_read = ((usage or {}).get("input_token_details") or {}).get("cache_read")
+            self.input_tokens += input_tokens
+            if cache_read is not None:
+                self.provider_reported_calls += 1
+                self.cached_tokens += cache_read
+            elif warm and prefix.estimated_tokens >= self.min_cacheable_tokens:
+                self.cached_tokens += min(prefix.estimated_tokens, input_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return token totals and the cached share of input tokens."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prefixes": len(self._last_seen),
+                "input_tokens": self.input_tokens,
+                "cached_input_tokens": self.cached_tokens,
+                "uncached_input_tokens": self.input_tokens - self.cached_tokens,
+                "cached_ratio": round(self.cached_tokens / self.input_tokens, 3) if self.input_tokens else 0.0,
+                "provider_reported_calls": self.provider_reported_calls,
+            }
+
+
+def invoke_with_prefix(llm, prefix: PromptPrefix, tail: str):
+    """Invoke an LLM with ``prefix + tail`` and record prefix-cache metrics.
+
+    Calls go through the micro-batcher, so concurrent requests from other
+    sessions share dispatches. Structured-output runnables built with
+    ``include_raw=True`` return a dict; usage is then read from its ``raw``
+    message.
+    """
+    from models.batching import get_llm_batcher
+
+    prompt = prefix.assemble(tail)
+    response = get_llm_batcher().invoke(llm, prompt)
+    raw = response.get("raw") if isinstance(response, dict) else response
+    get_prefix_registry().record(prefix, getattr(raw, "usage_metadata", None), len(prompt))
+    return response
+
+
+_prefix_registry = None
+
+def get_prefix_registry() -> PrefixRegistry:
+    global _prefix_registry
+    if _prefix_registry is None:
+        from config.settings import get_settings
+
+        _prefix_registry = PrefixRegistry(min_cacheable_tokens=get_settings().prompt_cache_min_tokens)
+    return _prefix_registry
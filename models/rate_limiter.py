@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+# Lower value = served first. Interactive chat always goes ahead of background work.
+PRIORITIES = {"interactive": 0, "speculative": 1, "batch": 2}
+
+# Weight of the newest sample in the rolling tokens-per-call estimate.
+_EWMA_ALPHA = 0.3
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """Run LLM calls made inside the block with the given priority class."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Return the priority class of LLM calls made from the current context."""
+    return _priority.get()
+
+
+class RateLimitTimeout(Exception):
+    """Raised when an LLM call could not be admitted before its queue deadline."""
+
+
+class PriorityRateLimiter(BaseRateLimiter):
+    """Token-bucket admission control (requests/min and tokens/min) with priority queueing.
+
+    Attached to every routed chat model, so the assistant node and all
+    LLM-backed tools share one budget. Callers wait in priority order
+    (interactive, speculative, batch) until both buckets have room, and fail
+    with RateLimitTimeout only after their class's deadline. Token usage is
+    charged up front from a rolling estimate and corrected once the real
+    usage is known.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        deadlines_s: Dict[str, float],
+        saturation_wait_s: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget (0 disables the request bucket)
+            tokens_per_minute: Token budget (0 disables the token bucket)
+            deadlines_s: Longest queue wait per priority class
+            saturation_wait_s: Interactive wait beyond which the process reports itself saturated
+            clock: Monotonic time source (seconds)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.deadlines_s = deadlines_s
+        self.saturation_wait_s = saturation_wait_s
+        self.clock = clock
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = clock()
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self.avg_tokens = 1000.0
+        self.admitted = 0
+        self.timeouts = 0
+        self.total_wait_s = 0.0
+
+    def _refill_locked(self) -> None:
+        now = self.clock()
+        elapsed, self._updated = now - self._updated, now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _shortfall_s_locked(self, requests: float, tokens: float) -> float:
+        """Seconds until both buckets hold ``requests`` and ``tokens``."""
+        wait = 0.0
+        if self.requests_per_minute:
+            wait = max(wait, (requests - self._requests) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            needed = min(tokens, self.tokens_per_minute)
+            wait = max(wait, (needed - self._tokens) * 60 / self.tokens_per_minute)
+        return max(0.0, wait)
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """
+        Wait for a slot for one call at the current context's priority.
+
+        Raises:
+            RateLimitTimeout: If no slot frees up before the priority's deadline
+        """
+        priority = current_priority()
+        started = self.clock()
+        deadline = started + self.deadlines_s.get(priority, 60.0)
+        entry = (PRIORITIES.get(priority, len(PRIORITIES)), next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    self._refill_locked()
+                    is_head = self._waiters[0] == entry
+                    shortfall = self._shortfall_s_locked(1, self.avg_tokens)
+                    if is_head and shortfall <= 0:
+                        self._requests -= 1 if self.requests_per_minute else 0
+                        self._tokens -= self.avg_tokens if self.tokens_per_minute else 0
+                        self.admitted += 1
+                        self.total_wait_s += self.clock() - started
+                        return True
+                    remaining = deadline - self.clock()
+                    if not blocking:
+                        return False
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise RateLimitTimeout(
+                            f"LLM rate limit: no capacity within {self.deadlines_s.get(priority, 60.0):g}s "
+                            f"({priority} priority)"
+                        )
+                    self._cond.wait(timeout=min(remaining, shortfall) if is_head else remaining)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        # Waiting happens on a worker thread; the priority context is copied along.
+        return await asyncio.to_thread(self.acquire, blocking=blocking)
+
+    def record_tokens(self, tokens: int) -> None:
+        """Correct the token bucket with a finished call's real usage."""
+        if not tokens:
+            return
+        with self._cond:
+            self._refill_locked()
+            if self.tokens_per_minute:
+                self._tokens -= tokens - self.avg_tokens
+            self.avg_tokens = _EWMA_ALPHA * tokens + (1 - _EWMA_ALPHA) * self.avg_tokens
+
+    def estimate_wait(self, priority: str = "interactive") -> float:
+        """Estimate how long a new call of ``priority`` would queue, in seconds."""
+        rank = PRIORITIES.get(priority, len(PRIORITIES))
+        with self._cond:
+            self._refill_locked()
+            ahead = sum(1 for waiter in self._waiters if waiter[0] <= rank)
+            return round(self._shortfall_s_locked(ahead + 1, (ahead + 1) * self.avg_tokens), 1)
+
+    def saturation(self) -> Dict[str, Any]:
+        """Return the readiness signal: saturated once interactive calls would wait too long."""
+        wait = self.estimate_wait("interactive")
+        with self._cond:
+            return {
+                "saturated": wait > self.saturation_wait_s,
+                "estimated_wait_s": wait,
+                "queued": len(self._waiters),
+                "requests_available": round(self._requests, 1) if self.requests_per_minute else None,
+                "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+                "admitted": self.admitted,
+                "timeouts": self.timeouts,
+                "avg_wait_s": round(self.total_wait_s / self.admitted, 3) if self.admitted else 0.0,
+            }
+
+
+_rate_limiter = None
+
+def get_rate_limiter() -> Optional[PriorityRateLimiter]:
+    """Return the shared limiter, or None when both budgets are disabled."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        from config.settings import get_settings
+
+        settings = get_settings()
+        if not (settings.llm_requests_per_minute or settings.llm_tokens_per_minute):
+            return None
+        _rate_limiter = PriorityRateLimiter(
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            deadlines_s=settings.llm_queue_deadlines_s,
+            saturation_wait_s=settings.llm_saturation_wait_s,
+        )
+    return _rate_limiter
@@ -0,0 +1,215 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+
+from config.settings import Settings, get_settings
+from models.backends import LLMBackend, resolve_model
+from models.rate_limiter import PriorityRateLimiter, get_rate_limiter
+
+TASKS = ("assistant", "complexity", "test_case", "hint")
+
+# Weight of the newest sample in the rolling latency/token averages.
+_EWMA_ALPHA = 0.3
+
+LLMFactory = Callable[[str, List[BaseCallbackHandler]], BaseChatModel]
+
+
+class _UsageRecorder(BaseCallbackHandler):
+    """Callback handler that reports latency and token usage of each call to the router."""
+
+    def __init__(self, router: "ModelRouter", task: str, model_name: str):
+        self.router = router
+        self.task = task
+        self.model_name = model_name
+        self._started: Dict[Any, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        self._started[run_id] = self.router.clock()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+        self._started[run_id] = self.router.clock()
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    tokens += usage.get("total_tokens", 0)
+        self.router.record(self.task, self.model_name, self.router.clock() - started, tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        if self._started.pop(run_id, None) is not None:
+            self.router.record_failure(self.task, self.model_name)
+
+
+class ModelRouter:
+    """Pick a model per task and downgrade to the cheap tier when the primary is over budget."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        llm_factory: Optional[LLMFactory] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rate_limiter: Optional[PriorityRateLimiter] = None,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            settings: Application settings holding tiers and budgets
+            llm_factory: Builds a chat model for a model name and callback list;
+                tests pass a factory returning local fake models
+            clock: Monotonic clock in seconds (injectable for tests)
+            rate_limiter: Admission control attached to every model the router builds
+        """
+        self.settings = settings
+        self.llm_factory = llm_factory or self._default_factory
+        self.clock = clock
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._llms: Dict[tuple, BaseChatModel] = {}
+        self._latency: Dict[tuple, float] = {}
+        self._tokens: Dict[tuple, float] = {}
+        self._calls: Dict[tuple, int] = {}
+        self._failures: Dict[tuple, int] = {}
+        self._downgraded_until: Dict[str, float] = {}
+
+    def _default_factory(self, model_name: str, callbacks: List[BaseCallbackHandler]) -> BaseChatModel:
+        backend, name = resolve_model(model_name, self.settings.llm_backend)
+        return backend.create(name, self.settings, callbacks)
+
+    def backend_for(self, model_name: str) -> LLMBackend:
+        """Return the backend serving a model setting."""
+        return resolve_model(model_name, self.settings.llm_backend)[0]
+
+    def _tier_model(self, tier: str) -> str:
+        if tier == "local" and self.settings.local_model_name:
+            return self.settings.local_model_name
+        if tier in ("cheap", "local"):
+            return self.settings.cheap_model_name or self.settings.model_name
+        return self.settings.model_name
+
+    def primary_model(self, task: str) -> str:
+        """Return the configured model for a task, ignoring any downgrade."""
+        return self._tier_model(self.settings.model_task_tiers.get(task, "full"))
+
+    def model_for(self, task: str) -> str:
+        """Return the model that should serve the next call for a task."""
+        primary = self.primary_model(task)
+        fallback = self._tier_model("cheap")
+        if primary == fallback:
+            return primary
+        with self._lock:
+            if self.clock() < self._downgraded_until.get(task, 0.0):
+                return fallback
+        return primary
+
+    def get_llm(self, task: str = "assistant") -> BaseChatModel:
+        """Return a (cached) chat model instance for a task."""
+        model_name = self.model_for(task)
+        key = (task, model_name)
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                llm = self.llm_factory(model_name, [_UsageRecorder(self, task, model_name)])
+                if self.rate_limiter is not None and self._uses_shared_quota(model_name):
+                    llm.rate_limiter = self.rate_limiter
+                self._llms[key] = llm
+        return llm
+
+    def record(self, task: str, model_name: str, latency_s: float, tokens: int = 0) -> None:
+        """Record one finished call and downgrade the task if it is over budget."""
+        key = (task, model_name)
+        if self.rate_limiter is not None and self._uses_shared_quota(model_name):
+            self.rate_limiter.record_tokens(tokens)
+        with self._lock:
+            self._calls[key] = self._calls.get(key, 0) + 1
+            self._failures.pop(key, None)
+            previous = self._latency.get(key)
+            self._latency[key] = latency_s if previous is None else (
+                _EWMA_ALPHA * latency_s + (1 - _EWMA_ALPHA) * previous
+            )
+            if tokens:
+                previous_tokens = self._tokens.get(key)
+                self._tokens[key] = tokens if previous_tokens is None else (
+                    _EWMA_ALPHA * tokens + (1 - _EWMA_ALPHA) * previous_tokens
+                )
+
+            if model_name != self.primary_model(task):
+                return
+            if self._over_latency_budget(task, key) or self._over_cost_budget(task, key):
+                self._downgrade(task, key)
+
+    def record_failure(self, task: str, model_name: str) -> None:
+        """
+        Record one failed call; repeated failures downgrade the task.
+
+        Failures are counted rather than timed: a primary that errors out
+        immediately is as unusable as a slow one but would look fast.
+        """
+        key = (task, model_name)
+        with self._lock:
+            self._calls[key] = self._calls.get(key, 0) + 1
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if model_name != self.primary_model(task):
+                return
+            if self._failures[key] >= max(1, self.settings.model_failures_before_downgrade):
+                self._downgrade(task, key)
+
+    def _downgrade(self, task: str, key: tuple) -> None:
+        self._downgraded_until[task] = self.clock() + self.settings.model_downgrade_cooldown_s
+        # Forget the slow average and failures so the first call after the cooldown is a fresh probe.
+        self._latency.pop(key, None)
+        self._failures.pop(key, None)
+        print(f"⬇️ Downgrading '{task}' from {key[1]} for {self.settings.model_downgrade_cooldown_s:.0f}s")
+
+    def _uses_shared_quota(self, model_name: str) -> bool:
+        try:
+            return self.backend_for(model_name).uses_shared_quota(self.settings)
+        except ValueError:
+            return True
+
+    def _over_latency_budget(self, task: str, key: tuple) -> bool:
+        budget_ms = self.settings.model_latency_budgets_ms.get(task)
+        return budget_ms is not None and self._latency[key] * 1000 > budget_ms
+
+    def _over_cost_budget(self, task: str, key: tuple) -> bool:
+        budget = self.settings.model_cost_budgets_usd.get(task)
+        price = self.settings.model_prices_per_million_tokens.get(key[1])
+        if budget is None or price is None or key not in self._tokens:
+            return False
+        return self._tokens[key] * price / 1_000_000 > budget
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return routing state per task for display and metrics."""
+        with self._lock:
+            now = self.clock()
+            result = {}
+            for task in TASKS:
+                primary = self.primary_model(task)
+                key = (task, primary)
+                result[task] = {
+                    "primary": primary,
+                    "downgraded": now < self._downgraded_until.get(task, 0.0),
+                    "avg_latency_ms": round(self._latency.get(key, 0.0) * 1000),
+                    "avg_tokens": round(self._tokens.get(key, 0.0)),
+                    "calls": sum(count for (t, _), count in self._calls.items() if t == task),
+                    "consecutive_failures": self._failures.get(key, 0),
+                }
+            return result
+
+
+_router = None
+
+def get_model_router():
+    global _router
+    if _router is None:
+        _router = ModelRouter(get_settings(), rate_limiter=get_rate_limiter())
+    return _router
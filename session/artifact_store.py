@@ -0,0 +1,199 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+from analysis.benchmark import BENCHMARK_MARKER
+from analysis.profiling import PROFILE_MARKERS
+
+# Tools whose output is never offloaded (reading an artifact back must not create another).
+_INLINE_TOOLS = {"retrieve_artifact"}
+# Prefixes of one-line structured reports that the UI parses from tool output;
+# summaries keep these lines whole.
+_DATA_MARKERS = (BENCHMARK_MARKER, *PROFILE_MARKERS.values())
+
+
+def session_key(config: Optional[RunnableConfig]) -> str:
+    """Pick the caller's session from the graph config (session_id, else thread_id)."""
+    configurable = (config or {}).get("configurable", {})
+    return str(configurable.get("session_id") or configurable.get("thread_id") or "default")
+
+
+class ArtifactStore:
+    """Session-scoped store for large tool outputs, kept out of the message history.
+
+    Artifacts are content-addressed per session. Each session keeps up to
+    ``memory_budget_bytes`` in memory; older artifacts beyond that are spilled
+    to files under ``spill_dir`` and read back on demand.
+    """
+
+    def __init__(self, memory_budget_bytes: int = 256 * 1024, spill_dir: str = "", max_sessions: int = 64):
+        """
+        Initialize the store.
+
+        Args:
+            memory_budget_bytes: In-memory artifact bytes kept per session before spilling
+            spill_dir: Directory for spilled artifacts (a temporary directory when empty)
+            max_sessions: Sessions kept; the least recently used is dropped beyond this
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self.max_sessions = max_sessions
+        self._spill_root = spill_dir
+        # session -> {"memory": OrderedDict[handle, text], "bytes": int, "spilled": {handle: path}}
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.spills = 0
+
+    def _spill_dir(self, session_id: str) -> str:
+        if not self._spill_root:
+            self._spill_root = tempfile.mkdtemp(prefix="dsa_artifacts_")
+        name = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16]
+        path = os.path.join(self._spill_root, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _session(self, session_id: str) -> Dict[str, Any]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = {"memory": OrderedDict(), "bytes": 0, "spilled": {}}
+            while len(self._sessions) > self.max_sessions:
+                self._discard(*self._sessions.popitem(last=False))
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _discard(self, session_id: str, session: Dict[str, Any]) -> None:
+        if session["spilled"]:
+            shutil.rmtree(os.path.dirname(next(iter(session["spilled"].values()))), ignore_errors=True)
+
+    def put(self, session_id: str, content: str) -> str:
+        """Store ``content`` for a session and return its handle."""
+        handle = "art_" + hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+        with self._lock:
+            session = self._session(session_id)
+            if handle in session["memory"] or handle in session["spilled"]:
+                return handle
+            session["memory"][handle] = content
+            session["bytes"] += len(content.encode("utf-8"))
+            # Spill the oldest artifacts, but always keep the newest in memory
+            while session["bytes"] > self.memory_budget_bytes and len(session["memory"]) > 1:
+                old_handle, old_content = session["memory"].popitem(last=False)
+                path = os.path.join(self._spill_dir(session_id), f"{old_handle}.txt")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(old_content)
+                session["spilled"][old_handle] = path
+                session["bytes"] -= len(old_content.encode("utf-8"))
+                self.spills += 1
+        return handle
+
+    def get(self, session_id: str, handle: str) -> Optional[str]:
+        """Return an artifact's full content, or None if the session does not have it."""
+        handle = handle.strip().strip("`")
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if handle in session["memory"]:
+                return session["memory"][handle]
+            path = session["spilled"].get(handle)
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def export(self, session_id: str) -> Dict[str, str]:
+        """Return all of a session's artifacts (handle -> content), reading spilled ones back."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            handles = list(session["spilled"]) + list(session["memory"]) if session is not None else []
+        artifacts = {handle: self.get(session_id, handle) for handle in handles}
+        return {handle: content for handle, content in artifacts.items() if content is not None}
+
+    def drop(self, session_id: str) -> None:
+        """Discard a session's artifacts, including spilled files."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._discard(session_id, session)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return artifact counts and memory usage across sessions."""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "in_memory": sum(len(s["memory"]) for s in self._sessions.values()),
+                "in_memory_bytes": sum(s["bytes"] for s in self._sessions.values()),
+                "spilled": sum(len(s["spilled"]) for s in self._sessions.values()),
+                "spills": self.spills,
+            }
+
+
+def summarize_output(content: str, handle: str, head_lines: int = 12, tail_lines: int = 6) -> str:
+    """Build the compact stand-in for a large output: head, tail, size and handle.
+
+    Structured report lines (``_DATA_MARKERS``) are kept verbatim after the
+    preview, so the profile and benchmark data survive offloading.
+    """
+    all_lines = content.splitlines()
+    data = [line for line in all_lines if line.startswith(_DATA_MARKERS)]
+    lines = [line for line in all_lines if not line.startswith(_DATA_MARKERS)]
+    if len(lines) > head_lines + tail_lines:
+        omitted = len(lines) - head_lines - tail_lines
+        preview = lines[:head_lines] + [f"... ({omitted} lines omitted) ..."] + lines[-tail_lines:]
+    else:
+        preview = lines
+    # Keep the summary bounded even for a few very long lines
+    text = "\n".join([line if len(line) <= 200 else line[:200] + "…" for line in preview] + data)
+    return (
+        f"{text}\n\n[Output truncated: {len(all_lines)} lines, {len(content):,} chars. "
+        f'Full output stored as artifact `{handle}`; call retrieve_artifact(handle="{handle}") if you need it.]'
+    )
+
+
+def offload_tool_messages(messages: List[BaseMessage], config: Optional[RunnableConfig]) -> List[BaseMessage]:
+    """
+    Replace large ToolMessage contents with a summary and an artifact handle.
+
+    Args:
+        messages: Messages produced by a tool node
+        config: Graph config identifying the session
+
+    Returns:
+        The messages, with oversized tool outputs moved to the artifact store
+    """
+    from config.settings import get_settings
+
+    limit = get_settings().artifact_inline_max_chars
+    store = get_artifact_store()
+    result = []
+    for message in messages:
+        content = message.content if isinstance(message, ToolMessage) else None
+        if isinstance(content, str) and len(content) > limit and message.name not in _INLINE_TOOLS:
+            handle = store.put(session_key(config), content)
+            print(f"📦 Stored {len(content):,}-char {message.name} output as {handle}")
+            message = message.model_copy(update={
+                "content": summarize_output(content, handle),
+                "artifact": {"handle": handle, "chars": len(content)},
+            })
+        result.append(message)
+    return result
+
+
+_artifact_store = None
+
+def get_artifact_store() -> ArtifactStore:
+    global _artifact_store
+    if _artifact_store is None:
+        from config.settings import get_settings
+
+        settings = get_settings()
+        _artifact_store = ArtifactStore(settings.artifact_session_memory_bytes, settings.artifact_spill_dir)
+    return _artifact_store
@@ -0,0 +1,226 @@
+import gzip
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from analysis.speculative import get_speculative_analyzer
+from session.artifact_store import get_artifact_store
+from session.message_log import MessageLog
+from tools.hint_tool import get_hint_progress
+from tools.persistent_python_repl import get_repl_pool
+
+
+class _Session:
+    """Activity record of one session; ``log`` is weak so closed browser sessions can be collected."""
+
+    def __init__(self, log: MessageLog):
+        self.log = weakref.ref(log)
+        self.last_active = time.monotonic()
+        self.spill_path: Optional[str] = None
+        # Set while a sweep writes this session to disk, so no other sweep picks it up
+        self.spilling = False
+
+
+class SessionLifecycle:
+    """Spill idle sessions to disk and restore them when the user comes back.
+
+    Every script run touches its session. A background sweep writes
+    sessions idle for longer than ``idle_after_s`` to a gzip-compressed file:
+    the message log, the session's tool artifacts, hint progress and a
+    summary of the REPL namespace. The log is then emptied in place and the
+    REPL, artifacts, hints and speculative state are dropped. The next touch
+    reads the file back; the REPL starts fresh, so the restored chat notes
+    which variables were cleared. Sessions whose browser tab has closed
+    (their log was garbage-collected) are dropped the same way, without a file.
+    """
+
+    def __init__(self, idle_after_s: float = 900.0, spill_dir: str = "", sweep_interval_s: float = 60.0):
+        """
+        Initialize the manager.
+
+        Args:
+            idle_after_s: Inactivity after which a session is spilled
+            spill_dir: Directory for spilled sessions (a temporary directory when empty)
+            sweep_interval_s: How often idle sessions are looked for
+        """
+        self.idle_after_s = idle_after_s
+        self.sweep_interval_s = sweep_interval_s
+        self._spill_root = spill_dir
+        self._sessions: Dict[str, _Session] = {}
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        self.spills = 0
+        self.restores = 0
+
+    def _spill_path(self, session_id: str) -> str:
+        if not self._spill_root:
+            self._spill_root = tempfile.mkdtemp(prefix="dsa_sessions_")
+        os.makedirs(self._spill_root, exist_ok=True)
+        name = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self._spill_root, f"{name}.pkl.gz")
+
+    def touch(self, session_id: str, log: MessageLog) -> bool:
+        """
+        Record activity for a session, restoring it first if it was spilled.
+
+        Args:
+            session_id: The session's ID
+            log: The session's message log (restored in place)
+
+        Returns:
+            True if the session was restored from disk
+        """
+        self._start_sweeper()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.log() is not log:
+                session = self._sessions[session_id] = _Session(log)
+            session.last_active = time.monotonic()
+            spill_path, session.spill_path = session.spill_path, None
+            if spill_path is None:
+                return False
+            try:
+                self._restore(session_id, log, spill_path)
+            except (OSError, pickle.UnpicklingError, EOFError) as e:
+                print(f"⚠️ Could not restore session {session_id}: {e}")
+                return False
+            self.restores += 1
+            return True
+
+    def sweep(self) -> int:
+        """Spill every session idle for too long and forget closed ones; returns the number spilled."""
+        now = time.monotonic()
+        idle, orphaned = [], []
+        with self._lock:
+            for session_id, session in list(self._sessions.items()):
+                log = session.log()
+                if log is None:
+                    # The browser session ended; its spill file (if any) is no longer reachable
+                    del self._sessions[session_id]
+                    self._release(session_id)
+                    if session.spill_path is not None:
+                        orphaned.append(session.spill_path)
+                elif (session.spill_path is None and not session.spilling
+                      and now - session.last_active > self.idle_after_s):
+                    session.spilling = True
+                    idle.append((session_id, session, log, session.last_active))
+        # Disk I/O runs outside the lock, so touches are never blocked behind a sweep
+        for path in orphaned:
+            self._remove(path)
+        return sum(self._spill(*candidate) for candidate in idle)
+
+    def _spill(self, session_id: str, session: _Session, log: MessageLog, last_active: float) -> bool:
+        repl = get_repl_pool().peek(session_id)
+        payload = {
+            "log": log.export(),
+            "artifacts": get_artifact_store().export(session_id),
+            "hints": get_hint_progress().export(session_id),
+            "namespace": repl.get_namespace_info() if repl is not None and repl._user_vars() else "",
+        }
+        path = self._spill_path(session_id)
+        try:
+            with gzip.open(path, "wb", compresslevel=6) as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"⚠️ Could not spill session {session_id}: {e}")
+            with self._lock:
+                session.spilling = False
+            return False
+        with self._lock:
+            session.spilling = False
+            # A touch while the file was written may have added to the session; keep it resident
+            spilled = self._sessions.get(session_id) is session and session.last_active == last_active
+            if spilled:
+                log.clear()
+                self._release(session_id)
+                session.spill_path = path
+                self.spills += 1
+        if not spilled:
+            self._remove(path)
+            return False
+        print(f"💤 Spilled idle session {session_id} ({os.path.getsize(path):,} bytes on disk)")
+        return True
+
+    def _restore(self, session_id: str, log: MessageLog, path: str) -> None:
+        with gzip.open(path, "rb") as f:
+            payload = pickle.load(f)
+        self._remove(path)
+        log.restore(payload["log"])
+        store = get_artifact_store()
+        for content in payload["artifacts"].values():
+            store.put(session_id, content)
+        get_hint_progress().restore(payload["hints"])
+        if payload["namespace"]:
+            log.add_assistant(
+                "💤 This session was idle, so its Python sandbox was reset. It held:\n\n"
+                f"```\n{payload['namespace']}```\n\nRun your code again to redefine them.",
+                ui_only=True,
+            )
+        print(f"☀️ Restored session {session_id}")
+
+    def _release(self, session_id: str) -> None:
+        """Free everything the process holds for a session outside its Streamlit state."""
+        get_repl_pool().drop(session_id)
+        get_artifact_store().drop(session_id)
+        get_hint_progress().drop(session_id)
+        get_speculative_analyzer().forget(session_id)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _start_sweeper(self) -> None:
+        if self._sweeper is not None:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_forever, name="session-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_forever(self) -> None:
+        while True:
+            time.sleep(self.sweep_interval_s)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"⚠️ Session sweep failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return resident and spilled session counts for metrics."""
+        with self._lock:
+            spilled = sum(1 for s in self._sessions.values() if s.spill_path is not None)
+            return {
+                "resident": len(self._sessions) - spilled,
+                "spilled": spilled,
+                "spills": self.spills,
+                "restores": self.restores,
+            }
+
+
+_session_lifecycle = None
+
+
+def get_session_lifecycle() -> Optional[SessionLifecycle]:
+    """Return the shared lifecycle manager, or None when idle spilling is disabled."""
+    global _session_lifecycle
+    if _session_lifecycle is None:
+        from config.settings import get_settings
+
+        settings = get_settings()
+        if not settings.session_idle_spill_s:
+            return None
+        _session_lifecycle = SessionLifecycle(
+            idle_after_s=settings.session_idle_spill_s,
+            spill_dir=settings.session_spill_dir,
+            sweep_interval_s=settings.session_sweep_interval_s,
+        )
+    return _session_lifecycle
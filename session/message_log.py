@@ -0,0 +1,152 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+# Graph state fields that are per turn and not carried into the next one.
+_TURN_FIELDS = {"messages", "intent"}
+
+
+class LogEntry:
+    """One conversation message, stored once for both the chat and the graph."""
+
+    __slots__ = ("role", "content", "display", "tool", "kwargs", "attachments", "ts", "ui_only")
+
+    def __init__(
+        self,
+        role: str,
+        content: Any,
+        display: Optional[str] = None,
+        tool: Any = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        ui_only: bool = False,
+    ):
+        """
+        Create an entry.
+
+        Args:
+            role: "user", "assistant" or "tool"
+            content: Message content sent to the graph (shared, not copied)
+            display: Chat text when it differs from ``content`` (e.g. a short button label)
+            tool: Tool calls of an assistant message, or (name, tool_call_id) of a tool result
+            kwargs: Provider-specific message fields that must be sent back (e.g. function call signatures)
+            ui_only: Shown in the chat but never sent to the graph (e.g. error notices)
+        """
+        self.role = role
+        self.content = content
+        self.display = display
+        self.tool = tool
+        self.kwargs = kwargs or None
+        self.attachments: Optional[Dict[str, Any]] = None
+        self.ts = time.time()
+        self.ui_only = ui_only
+
+    def attach(self, key: str, value: Any) -> None:
+        """Attach structured UI data (e.g. a complexity card) to the entry."""
+        if self.attachments is None:
+            self.attachments = {}
+        self.attachments[key] = value
+
+    def to_message(self) -> BaseMessage:
+        """Project the entry to the LangChain message the graph expects."""
+        if self.role == "user":
+            return HumanMessage(content=self.content)
+        if self.role == "tool":
+            name, tool_call_id = self.tool
+            return ToolMessage(content=self.content, name=name, tool_call_id=tool_call_id)
+        return AIMessage(content=self.content, tool_calls=self.tool or [], additional_kwargs=self.kwargs or {})
+
+
+class MessageLog:
+    """Single per-session conversation log read by the chat and the graph through projections.
+
+    Each message is one slotted ``LogEntry`` holding references to the
+    content, tool metadata and an epoch timestamp. ``display_messages``
+    yields the chat view and ``graph_input`` builds the graph input; neither
+    is stored. Graph state other than messages (snapshots, current snapshot,
+    turn spend) is kept in ``state`` and updated in place after each turn.
+    """
+
+    def __init__(self):
+        """Initialize an empty log."""
+        self.entries: List[LogEntry] = []
+        self.state: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add_user(self, content: str, display: Optional[str] = None) -> LogEntry:
+        """Append a user message; ``display`` is shown in the chat instead of ``content`` if given."""
+        entry = LogEntry("user", content, display=display if display != content else None)
+        self.entries.append(entry)
+        return entry
+
+    def add_assistant(self, content: Any, display: Optional[str] = None, ui_only: bool = False) -> LogEntry:
+        """Append an assistant reply that did not come from the graph."""
+        entry = LogEntry("assistant", content, display=display, ui_only=ui_only)
+        self.entries.append(entry)
+        return entry
+
+    def add_message(self, message: BaseMessage) -> Optional[LogEntry]:
+        """Append a message returned by the graph (AI replies and tool results; others are ignored)."""
+        if isinstance(message, AIMessage):
+            entry = LogEntry("assistant", message.content, tool=message.tool_calls or None, kwargs=message.additional_kwargs)
+        elif isinstance(message, ToolMessage):
+            entry = LogEntry("tool", message.content, tool=(message.name, message.tool_call_id))
+        elif isinstance(message, HumanMessage):
+            entry = LogEntry("user", message.content)
+        else:
+            return None
+        self.entries.append(entry)
+        return entry
+
+    def graph_messages(self) -> List[BaseMessage]:
+        """Project the conversation to LangChain messages for the graph."""
+        return [entry.to_message() for entry in self.entries if not entry.ui_only]
+
+    def graph_input(self, **update: Any) -> Dict[str, Any]:
+        """Build the graph input for a turn: carried state, ``update`` and the projected messages."""
+        return {**self.state, **update, "messages": self.graph_messages()}
+
+    def update_state(self, result: Dict[str, Any]) -> None:
+        """Carry non-message fields of a graph result (snapshots, turn spend) into the next turn."""
+        for field, value in result.items():
+            if field not in _TURN_FIELDS:
+                self.state[field] = value
+
+    def display_messages(self) -> Iterator[Dict[str, Any]]:
+        """
+        Project the conversation to chat messages.
+
+        Tool results are not shown (the assistant summarizes them); each tool
+        call is shown as a short system notice before the reply it belongs to.
+        """
+        for entry in self.entries:
+            if entry.role == "tool":
+                continue
+            timestamp = datetime.fromtimestamp(entry.ts).strftime("%H:%M:%S")
+            if entry.role == "assistant" and entry.tool:
+                for tool_call in entry.tool:
+                    yield {"role": "system", "tool_name": tool_call.get("name", "Unknown Tool"), "timestamp": timestamp}
+            content = entry.content if entry.display is None else entry.display
+            if entry.role == "assistant" and not content and not entry.attachments:
+                continue
+            message = {"role": entry.role, "content": content, "timestamp": timestamp}
+            if entry.attachments:
+                message.update(entry.attachments)
+            yield message
+
+    def export(self) -> Dict[str, Any]:
+        """Return the log's contents, e.g. to spill them to disk."""
+        return {"entries": self.entries, "state": self.state}
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Reinstate contents returned by ``export``, in place."""
+        self.entries = data["entries"]
+        self.state = data["state"]
+
+    def clear(self) -> None:
+        """Forget the conversation and its graph state."""
+        self.entries = []
+        self.state = {}
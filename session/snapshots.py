@@ -0,0 +1,100 @@
+import difflib
+from typing import Any, Dict, Optional, Tuple
+
+from analysis.code_artifact import get_code_artifact
+from config.settings import get_settings
+
+
+def merge_snapshots(left: Optional[Dict[str, str]], right: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Graph state reducer: snapshots are content-addressed, so merging never conflicts.
+
+    Snapshots in ``right`` become the most recent. Only the ``snapshot_max_kept``
+    most recent are kept, so a long session does not hold every version of its code.
+    """
+    if not right:
+        return left or {}
+    merged = {k: v for k, v in (left or {}).items() if k not in right}
+    merged.update(right)
+    max_kept = get_settings().snapshot_max_kept
+    if max_kept and len(merged) > max_kept:
+        merged = dict(list(merged.items())[-max_kept:])
+    return merged
+
+
+def snapshot_id(code: str) -> str:
+    """Return the content address of a code snapshot."""
+    return get_code_artifact(code).snapshot_id
+
+
+def resolve_snapshot(state: Dict[str, Any], snapshot: str) -> Optional[str]:
+    """Return the code stored under a snapshot ID in graph state, if present."""
+    return (state.get("snapshots") or {}).get(snapshot.strip().strip("`"))
+
+
+def current_code(state: Dict[str, Any]) -> Optional[str]:
+    """Return the code of the latest snapshot in graph state, if any."""
+    current = state.get("current_snapshot")
+    return resolve_snapshot(state, current) if current else None
+
+
+def code_from_args(code: str, snapshot: str, state: Optional[Dict[str, Any]]) -> str:
+    """
+    Resolve a tool's code input: the referenced snapshot (if any) followed by ``code``.
+
+    Raises:
+        ValueError: If the snapshot ID is unknown
+    """
+    if not snapshot:
+        return code
+    stored = resolve_snapshot(state or {}, snapshot)
+    if stored is None:
+        raise ValueError(f"Unknown snapshot_id '{snapshot}' (only recent snapshots are kept; pass the code instead)")
+    return f"{stored}\n{code}" if code.strip() else stored
+
+
+def _diff(previous: str, code: str) -> str:
+    return "\n".join(difflib.unified_diff(
+        previous.splitlines(), code.splitlines(), fromfile="previous", tofile="current", lineterm="", n=1,
+    ))
+
+
+def build_code_submission(code: str, state: Dict[str, Any], extra: str = "") -> Tuple[Dict[str, Any], str]:
+    """
+    Store code as a snapshot and build the message that references it.
+
+    The code is sent in full the first time; afterwards, as a diff against the
+    previous snapshot when that is smaller. Tools receive the snapshot ID and
+    resolve the code from graph state instead of getting it copied into their
+    arguments.
+
+    Args:
+        code: Submitted code
+        state: Current graph state (for the previous snapshot)
+        extra: Additional context appended to the message
+
+    Returns:
+        (state update with ``snapshots``/``current_snapshot``, message text)
+    """
+    new_id = snapshot_id(code)
+    previous_id = state.get("current_snapshot")
+    previous = resolve_snapshot(state, previous_id) if previous_id else None
+    update = {"snapshots": {new_id: code}, "current_snapshot": new_id}
+
+    if previous_id == new_id:
+        body = f"I'd like you to analyze my code again (snapshot `{new_id}`, unchanged since the last run)."
+    else:
+        diff = _diff(previous, code) if previous is not None else None
+        if diff is not None and len(diff) < len(code):
+            body = (
+                f"I'd like you to analyze my code (snapshot `{new_id}`). "
+                f"Changes since snapshot `{previous_id}`:\n\n```diff\n{diff}\n```"
+            )
+        else:
+            body = f"I'd like you to analyze this code (snapshot `{new_id}`):\n\n```python\n{code}\n```"
+
+    message = f"""{body}
+{extra}
+Please execute it and provide feedback on the implementation. If you notice any issues or if it runs successfully, let me know about the approach and any suggestions for improvement.
+Pass snapshot_id="{new_id}" to the tools instead of copying the code."""
+    return update, message
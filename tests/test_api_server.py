@@ -0,0 +1,44 @@
+import json
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+
+import api.server as server
+
+
+class _FakeGraph:
+    """Streams a reply turn, or a tool call and then an error when the message says "fail"."""
+
+    async def astream(self, state, config=None, stream_mode=None):
+        if state["messages"][-1].content == "fail":
+            call = {"name": "python_repl", "args": {"code": "1"}, "id": "call_1"}
+            yield {"assistant": {"messages": [AIMessage(content="", tool_calls=[call])]}}
+            raise RuntimeError("provider unavailable")
+        yield {"assistant": {"messages": [AIMessage(content="hello")]}}
+
+
+def _client(monkeypatch):
+    monkeypatch.setattr(server, "get_compiled_graph", lambda: _FakeGraph())
+    monkeypatch.setattr(server, "get_session_lifecycle", lambda: None)
+    return TestClient(server.create_app())
+
+
+def _stream(client, message):
+    response = client.post("/api/chat/stream", json={"message": message, "session_id": "s"})
+    events = {}
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.setdefault(event.removeprefix("event: "), []).append(json.loads(data.removeprefix("data: ")))
+    return events
+
+
+def test_failed_stream_keeps_the_pre_turn_state(monkeypatch):
+    client = _client(monkeypatch)
+    assert _stream(client, "hi")["done"] == [{"messages": 2}]
+
+    events = _stream(client, "fail")
+    assert events["error"] == [{"error": "provider unavailable"}]
+    assert events["done"] == [{"messages": 2}]
+
+    # The next turn continues from the last complete turn, with no dangling tool call
+    assert _stream(client, "hi again")["done"] == [{"messages": 4}]
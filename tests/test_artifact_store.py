@@ -0,0 +1,24 @@
+from analysis.benchmark import format_benchmark, parse_benchmark
+from analysis.profiling import format_profile, parse_profile
+from session.artifact_store import summarize_output
+
+PROFILE = {
+    "mode": "profile",
+    "total_ms": 12.5,
+    "lines": [{"line": i, "hits": i * 10, "ms": 0.5, "percent": 4.0, "source": "x = " + "y" * 80} for i in range(1, 40)],
+}
+
+
+def test_profile_report_survives_summary():
+    content = "\n".join(f"row {i}: " + "z" * 300 for i in range(60)) + "\n" + format_profile(PROFILE) + "\n"
+    assert len(format_profile(PROFILE)) > 2000
+    summary = summarize_output(content, "art-1")
+    assert len(summary) < len(content)
+    assert parse_profile(summary) == parse_profile(content)
+    assert "art-1" in summary
+
+
+def test_benchmark_report_survives_summary():
+    report = {"variants": ["a", "b"], "sizes": [10], "results": [], "agree": True, "mismatches": [], "errors": {}, "skipped": []}
+    content = format_benchmark(report) + "\n" + "\n".join("line" for _ in range(100))
+    assert parse_benchmark(summarize_output(content, "art-2")) == report
@@ -0,0 +1,85 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from langchain_core.tools import tool
+
+from config.settings import Settings
+from models.backends import LLMBackend, OpenAICompatibleBackend, resolve_model
+from models.router import ModelRouter
+
+USAGE = {"prompt_tokens": 11, "completion_tokens": 5, "total_tokens": 16}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI chat completions endpoint: calls the first tool if any, else says hello."""
+
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(body)
+        tools = body.get("tools") or []
+        if tools and body.get("tool_choice") != "none":
+            call = {"id": "call_1", "type": "function",
+                    "function": {"name": tools[0]["function"]["name"], "arguments": json.dumps({"code": "print(1)"})}}
+            message = {"role": "assistant", "content": None, "tool_calls": [call]}
+        else:
+            message = {"role": "assistant", "content": "hello from the stub"}
+        data = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}], "usage": USAGE,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub_server():
+    server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _StubHandler.requests = []
+    yield f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+
+
+@tool
+def python_repl(code: str) -> str:
+    """Run code."""
+    return ""
+
+
+def test_backend_must_implement_create():
+    class Incomplete(LLMBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_model_prefix_selects_the_backend():
+    backend, model = resolve_model("openai:qwen2.5:3b", "gemini")
+    assert isinstance(backend, OpenAICompatibleBackend) and model == "qwen2.5:3b"
+
+
+def test_router_serves_tasks_from_an_openai_compatible_endpoint(stub_server):
+    settings = Settings(
+        google_api_key="", llm_backend="openai", openai_base_url=stub_server,
+        model_name="full-model", cheap_model_name="cheap-model",
+    )
+    router = ModelRouter(settings)
+    llm = router.get_llm("assistant")
+
+    assert llm.invoke("hi").content == "hello from the stub"
+    assert llm.bind_tools([python_repl]).invoke("run it").tool_calls[0]["name"] == "python_repl"
+    assert llm.bind_tools([python_repl], tool_choice="none").invoke("answer").content == "hello from the stub"
+    assert [request["model"] for request in _StubHandler.requests] == ["full-model"] * 3
+    assert router.stats()["assistant"]["calls"] == 3
+    assert router.stats()["assistant"]["avg_tokens"] == USAGE["total_tokens"]
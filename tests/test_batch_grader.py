@@ -0,0 +1,43 @@
+import json
+
+from grading.batch_grader import BatchGrader, grade_submission
+
+SPEC = {"entry_point": "add", "tests": [{"args": [1, 2], "expected": 3}], "timeout_s": 5.0, "compare": "exact"}
+
+
+def test_sys_exit_in_submission_is_an_error():
+    result = grade_submission("import sys\nsys.exit(0)\n", SPEC)
+    assert result["status"] == "error"
+    assert "SystemExit" in result["error"]
+
+
+def test_sys_exit_in_entry_point_is_an_error():
+    result = grade_submission("def add(a, b):\n    raise SystemExit(3)\n", SPEC)
+    assert result["status"] == "error"
+
+
+def test_bad_submissions_do_not_end_the_run(tmp_path):
+    submissions = [
+        {"id": "ok", "code": "def add(a, b): return a + b\n"},
+        {"id": "exit", "code": "import sys\nsys.exit(0)\n"},
+        {"id": "crash", "code": "import os\nos._exit(1)\n"},
+        {"id": "wrong", "code": "def add(a, b): return a - b\n"},
+    ]
+    stats = BatchGrader(SPEC, max_workers=2).run(submissions, str(tmp_path / "report.jsonl"))
+    assert stats["statuses"] == {"ok": 1, "error": 2, "failed": 1}
+
+
+def test_pool_run_grades_duplicates_once_and_times_out_slow_submissions(tmp_path):
+    spec = {**SPEC, "timeout_s": 0.5}
+    report = tmp_path / "report.jsonl"
+    submissions = [
+        {"id": "a", "code": "def add(a, b): return a + b\n"},
+        {"id": "a-copy", "code": "def add(a, b):\n    # same program\n    return a + b\n"},
+        {"id": "slow", "code": "def add(a, b):\n    while True:\n        pass\n"},
+    ]
+    stats = BatchGrader(spec, max_workers=2).run(submissions, str(report))
+    assert (stats["unique"], stats["duplicates"]) == (2, 1)
+    assert stats["statuses"] == {"ok": 2, "timeout": 1}
+    rows = {row["id"]: row for row in map(json.loads, report.read_text().splitlines())}
+    assert rows["a-copy"]["duplicate_of"] == "a"
+    assert rows["slow"]["error"] == "exceeded 0.5s"
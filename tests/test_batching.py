@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from models.batching import MicroBatcher
+from models.rate_limiter import current_priority, llm_priority
+
+
+class _FakeRunnable:
+    """Upper-cases prompts; a prompt containing "boom" fails on its own."""
+
+    def __init__(self):
+        self.batches = []
+        self.priorities = []
+
+    def invoke(self, prompt):
+        result = self.batch([prompt])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def batch(self, prompts, return_exceptions=False):
+        self.batches.append(list(prompts))
+        self.priorities.append(current_priority())
+        return [ValueError(p) if "boom" in p else p.upper() for p in prompts]
+
+
+def _invoke_concurrently(batcher, runnable, prompts, priorities=None):
+    results = [None] * len(prompts)
+    start = threading.Barrier(len(prompts))
+
+    def call(i):
+        with llm_priority((priorities or {}).get(i, "batch")):
+            start.wait()
+            try:
+                results[i] = batcher.invoke(runnable, prompts[i])
+            except ValueError as e:
+                results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(prompts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_requests_share_one_batch_and_identical_prompts_are_sent_once():
+    batcher, runnable = MicroBatcher(window_ms=100), _FakeRunnable()
+    results = _invoke_concurrently(batcher, runnable, ["a", "b", "a"])
+    assert results == ["A", "B", "A"]
+    assert len(runnable.batches) == 1 and sorted(runnable.batches[0]) == ["a", "b"]
+    stats = batcher.stats()
+    assert (stats["requests"], stats["batches"], stats["coalesced"]) == (3, 1, 1)
+
+
+def test_a_failed_prompt_only_fails_its_own_caller():
+    batcher, runnable = MicroBatcher(window_ms=100), _FakeRunnable()
+    ok, failed = _invoke_concurrently(batcher, runnable, ["ok", "boom"])
+    assert ok == "OK"
+    assert isinstance(failed, ValueError)
+
+
+def test_full_groups_are_split_at_max_batch():
+    batcher, runnable = MicroBatcher(window_ms=100, max_batch=2), _FakeRunnable()
+    results = _invoke_concurrently(batcher, runnable, ["a", "b", "c", "d", "e"])
+    assert results == ["A", "B", "C", "D", "E"]
+    assert all(len(batch) <= 2 for batch in runnable.batches)
+    assert sum(len(batch) for batch in runnable.batches) == 5
+
+
+def test_group_runs_at_the_most_urgent_callers_priority():
+    batcher, runnable = MicroBatcher(window_ms=100), _FakeRunnable()
+    _invoke_concurrently(batcher, runnable, ["a", "b"], priorities={1: "interactive"})
+    assert runnable.priorities == ["interactive"]
+
+
+def test_zero_window_invokes_directly():
+    batcher, runnable = MicroBatcher(window_ms=0), _FakeRunnable()
+    assert batcher.invoke(runnable, "a") == "A"
+    assert batcher.stats()["requests"] == 0
+    with pytest.raises(ValueError):
+        batcher.invoke(runnable, "boom")
@@ -0,0 +1,73 @@
+from tools.benchmark_tool import benchmark_solutions
+
+CONFIG = {"configurable": {"session_id": "test-benchmark"}}
+
+
+def test_args_expr_sees_n_inside_comprehensions():
+    output = benchmark_solutions.func(
+        variants=["by_sort", "sorted"],
+        args_expr="([(i * 7) % n for i in range(n)],)",
+        config=CONFIG,
+        code="def by_sort(items):\n    return sorted(items)\n",
+        sizes=[10, 100],
+        repeats=2,
+    )
+    assert "Outputs agree" in output
+    assert "NameError" not in output
+
+
+def _fake_clock():
+    now = [0.0]
+
+    def clock():
+        return now[0]
+
+    def work(seconds):
+        now[0] += seconds
+
+    return clock, work
+
+
+def test_quadratic_variant_is_skipped_before_it_overruns():
+    from analysis.benchmark import run_benchmark
+
+    clock, work = _fake_clock()
+    functions = {
+        "linear": lambda items: work(len(items) * 1e-6),
+        "quadratic": lambda items: work(len(items) ** 2 * 1e-7),
+    }
+    report = run_benchmark(
+        functions, lambda n: list(range(n)), [100, 1000, 10000], repeats=3,
+        max_call_s=2.0, time_budget_s=20.0, clock=clock,
+    )
+    assert {r["n"] for r in report["results"] if r["variant"] == "quadratic"} == {100, 1000}
+    assert any("quadratic: predicted" in reason for reason in report["skipped"])
+    assert clock() <= 20.0
+
+
+def test_budget_is_checked_between_calls():
+    from analysis.benchmark import run_benchmark
+
+    clock, work = _fake_clock()
+    functions = {"a": lambda items: work(1.0), "b": lambda items: work(1.0)}
+    report = run_benchmark(
+        functions, lambda n: list(range(n)), [10], repeats=15,
+        max_call_s=5.0, time_budget_s=6.0, clock=clock,
+    )
+    assert clock() <= 8.0
+    assert report["sizes"] == [10]
+    assert any("time budget" in reason for reason in report["skipped"])
+
+
+def test_single_call_over_max_call_s_is_not_repeated():
+    from analysis.benchmark import run_benchmark
+
+    clock, work = _fake_clock()
+    calls = []
+    functions = {"slow": lambda items: (calls.append(1), work(3.0))}
+    report = run_benchmark(
+        functions, lambda n: list(range(n)), [10, 100], repeats=5, warmup=3,
+        max_call_s=2.0, time_budget_s=60.0, clock=clock,
+    )
+    assert len(calls) == 1
+    assert report["results"][0]["median_ms"] == 3000.0
@@ -0,0 +1,52 @@
+from analysis.code_artifact import get_code_artifact
+from analysis.profiling import USER_FILENAME
+from tools.benchmark_tool import benchmark_solutions
+from tools.persistent_python_repl import PersistentPythonREPLTool
+
+TWO_SUM = '''def two_sum(nums, target):
+    seen = {}
+    for i, x in enumerate(nums):
+        if target - x in seen:
+            return [seen[target - x], i]
+        seen[x] = i
+'''
+REFORMATTED = TWO_SUM.replace("seen = {}", "seen = {}  # value -> index")
+
+
+def test_identical_source_shares_one_artifact_and_its_derived_values():
+    artifact = get_code_artifact(TWO_SUM)
+    assert get_code_artifact("".join(TWO_SUM)) is artifact
+    assert artifact.compiled is artifact.compiled
+    assert artifact.static_complexity is get_code_artifact(TWO_SUM).static_complexity
+    assert artifact.signatures == ["two_sum(nums, target)"]
+    assert {"seen", "nums", "target"} <= artifact.names
+
+
+def test_formatting_changes_keep_the_fingerprint_but_not_the_hash():
+    original, reformatted = get_code_artifact(TWO_SUM), get_code_artifact(REFORMATTED)
+    assert reformatted is not original
+    assert reformatted.fingerprint == original.fingerprint
+    assert reformatted.hash != original.hash
+    assert reformatted.snapshot_id != original.snapshot_id
+
+
+def test_syntax_errors_leave_an_artifact_without_derived_code():
+    artifact = get_code_artifact("def broken(:\n")
+    assert artifact.tree is None and artifact.compiled is None
+    assert artifact.syntax_error.startswith("SyntaxError")
+    assert artifact.fingerprint == artifact.hash
+    assert artifact.signatures == [] and artifact.problem is None
+
+
+def test_repl_runs_the_artifacts_code_object():
+    repl = PersistentPythonREPLTool()
+    output = repl.execute(TWO_SUM + "print(two_sum([2, 7, 11], 9))\nraise ValueError('boom')\n")
+    assert output.startswith("[0, 1]\n")
+    assert f'File "{USER_FILENAME}", line 8' in output
+
+
+def test_benchmark_names_the_defined_functions_when_a_variant_is_missing():
+    config = {"configurable": {"session_id": "code-artifact-test", "thread_id": "t"}}
+    result = benchmark_solutions.func(variants=["two_sum", "fast"], args_expr="([1, 2], 3)", config=config,
+                                      code=TWO_SUM)
+    assert result.startswith("Not defined as functions: fast (the code defines two_sum(nums, target))")
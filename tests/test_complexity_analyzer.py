@@ -0,0 +1,56 @@
+import json
+
+from langchain_core.messages import AIMessage
+
+import tools.complexity_analyzer as complexity_analyzer_module
+from analysis.cache import ResultCache
+from analysis.complexity_schema import ComplexityAnalysis
+from tools.complexity_analyzer import complexity_analyzer
+
+TWO_SUM = """def two_sum(nums, target):
+    seen = {}
+    for i, x in enumerate(nums):
+        if target - x in seen:
+            return [seen[target - x], i]
+        seen[x] = i
+"""
+
+
+def _patch(monkeypatch, responses):
+    calls = []
+
+    def fake_invoke(llm, prefix, text):
+        calls.append(text)
+        return responses.pop(0)
+
+    cache = ResultCache()
+    monkeypatch.setattr(complexity_analyzer_module, "get_structured_llm", lambda task, schema: None)
+    monkeypatch.setattr(complexity_analyzer_module, "invoke_with_prefix", fake_invoke)
+    monkeypatch.setattr(complexity_analyzer_module, "get_result_cache", lambda: cache)
+    return calls
+
+
+def _analysis():
+    parsed = ComplexityAnalysis(time="O(n)", space="O(n)", approach="Hash map of complements")
+    return {"parsed": parsed, "parsing_error": None, "raw": AIMessage(content="")}
+
+
+def _analyze(code=TWO_SUM):
+    return json.loads(complexity_analyzer.func(code=code))
+
+
+def test_identical_code_is_analyzed_once(monkeypatch):
+    calls = _patch(monkeypatch, [_analysis()])
+    assert _analyze()["source"] == "llm"
+    assert _analyze()["source"] == "llm"
+    assert len(calls) == 1
+
+
+def test_failed_structured_output_falls_back_and_is_not_cached(monkeypatch):
+    failed = {"parsed": None, "parsing_error": "bad json", "raw": AIMessage(content="")}
+    calls = _patch(monkeypatch, [failed, _analysis()])
+    fallback = _analyze()
+    assert fallback["source"] == "static"
+    assert fallback["time"] == "O(n)"
+    assert _analyze()["source"] == "llm"
+    assert len(calls) == 2
@@ -0,0 +1,56 @@
+from streamlit.testing.v1 import AppTest
+
+import ui.editor_component as editor_component
+
+
+def _component_app():
+    import streamlit as st
+
+    from ui.code_editor import CodeEditor
+
+    st.session_state.setdefault("runs", [])
+    CodeEditor(on_run_code=st.session_state.runs.append, use_component=True).render()
+
+
+def _fake_editor(code, version, key, **kwargs):
+    import streamlit as st
+
+    st.session_state.component_args = {"code": code, "version": version}
+    return st.session_state.get("synced")
+
+
+def test_synced_code_is_adopted_and_keyboard_runs_fire_once(monkeypatch):
+    monkeypatch.setattr(editor_component, "code_editor", _fake_editor)
+    at = AppTest.from_function(_component_app).run()
+    assert at.session_state.component_args["version"] == 0
+    assert at.session_state.current_code.startswith("def two_sum")
+
+    at.session_state.synced = {"code": "x = 1", "version": 0, "run": 0}
+    at.run()
+    assert at.session_state.current_code == "x = 1"
+    assert at.session_state.runs == []
+
+    at.session_state.synced = {"code": "x = 1", "version": 0, "run": 1}
+    at.run()
+    at.run()
+    assert at.session_state.runs == ["x = 1"]
+
+
+def test_syncs_of_replaced_contents_are_ignored(monkeypatch):
+    monkeypatch.setattr(editor_component, "code_editor", _fake_editor)
+    at = AppTest.from_function(_component_app).run()
+    at.session_state.synced = {"code": "x = 1", "version": 0, "run": 0}
+    at.run()
+
+    at.button[1].click().run()  # Clear bumps the version; the component's last sync is now stale
+    assert at.session_state.component_args == {"code": "", "version": 1}
+    at.run()
+    assert at.session_state.current_code == ""
+
+
+def test_highlight_lines_are_sent_as_string_keys(monkeypatch):
+    sent = {}
+    monkeypatch.setattr(editor_component, "_component", lambda **kwargs: sent.update(kwargs))
+    editor_component.code_editor("pass", version=3, key="k", highlights={2: 75.0})
+    assert sent["highlights"] == {"2": 75.0}
+    assert sent["version"] == 3 and sent["default"] is None
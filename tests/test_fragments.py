@@ -0,0 +1,42 @@
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.testing.v1 import AppTest
+
+import ui.fragments as fragments
+
+
+def _editor_app():
+    import streamlit as st
+
+    from ui.code_editor import CodeEditor
+
+    @st.fragment
+    def editor():
+        CodeEditor(use_component=False).render()
+
+    editor()
+
+
+def test_template_and_clear_actions_update_the_editor_without_an_explicit_rerun():
+    at = AppTest.from_function(_editor_app).run()
+    at.selectbox(key="code_template_select").set_value("Binary Search").run()
+    assert not at.exception
+    assert at.text_area(key="code_editor").value.startswith("def binary_search(arr, target):")
+    assert at.selectbox(key="code_template_select").value == "Select Template"
+    assert at.session_state.current_code.startswith("def binary_search")
+
+    at.button[1].click().run()  # Clear
+    assert at.text_area(key="code_editor").value == ""
+
+
+def test_rerun_falls_back_to_the_whole_app_outside_a_fragment_rerun(monkeypatch):
+    scopes = []
+
+    def fake_rerun(scope="app"):
+        scopes.append(scope)
+        if scope == "fragment":
+            raise StreamlitAPIException("not in a fragment rerun")
+
+    monkeypatch.setattr(st, "rerun", fake_rerun)
+    fragments.rerun()
+    assert scopes == ["fragment", "app"]
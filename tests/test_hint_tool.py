@@ -0,0 +1,55 @@
+from langchain_core.messages import AIMessage
+
+import tools.hint_tool as hint_tool
+from analysis.cache import ResultCache
+from tools.hint_tool import HintLadder, HintProgress, generate_hint
+
+TWO_SUM = "def two_sum(nums, target):\n    return []\n"
+STATE = {"snapshots": {"abc": TWO_SUM}, "current_snapshot": "abc"}
+
+
+def _patch(monkeypatch, responses):
+    calls = []
+
+    def fake_invoke(llm, prefix, text):
+        calls.append(text)
+        return responses.pop(0)
+
+    cache = ResultCache()
+    monkeypatch.setattr(hint_tool, "get_structured_llm", lambda task, schema: None)
+    monkeypatch.setattr(hint_tool, "invoke_with_prefix", fake_invoke)
+    monkeypatch.setattr(hint_tool, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(hint_tool, "_hint_progress", HintProgress())
+    return calls
+
+
+def _ladder():
+    parsed = HintLadder(nudge="n", approach="a", near_solution="s")
+    return {"parsed": parsed, "parsing_error": None, "raw": AIMessage(content="")}
+
+
+def _hint(question, state=STATE):
+    config = {"configurable": {"session_id": "s", "thread_id": "t"}}
+    return generate_hint.func(question=question, config=config, state=state)
+
+
+def test_rephrased_requests_about_the_current_code_share_progress(monkeypatch):
+    calls = _patch(monkeypatch, [_ladder()])
+    assert _hint("Give me a hint for two_sum").startswith("💡 Hint 1/3")
+    assert _hint("I'm stuck on Two Sum, another hint?").startswith("💡 Hint 2/3")
+    assert len(calls) == 1
+
+
+def test_unrelated_question_gets_its_own_ladder(monkeypatch):
+    calls = _patch(monkeypatch, [_ladder(), _ladder()])
+    _hint("hint for two sum")
+    assert _hint("How do I find the longest palindromic substring?").startswith("💡 Hint 1/3")
+    assert len(calls) == 2
+
+
+def test_failed_ladder_is_not_cached(monkeypatch):
+    failed = {"parsed": None, "parsing_error": "bad json", "raw": AIMessage(content="Think about complements.")}
+    calls = _patch(monkeypatch, [failed, _ladder()])
+    assert _hint("hint for two sum") == "💡 Hint: Think about complements."
+    assert _hint("hint for two sum").startswith("💡 Hint 1/3")
+    assert len(calls) == 2
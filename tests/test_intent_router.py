@@ -0,0 +1,63 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+
+from graph.intent_router import DSAState, classify_intent, make_fast_path_node
+from session.artifact_store import get_artifact_store
+
+LONG_OUTPUT = "\n".join(f"assert solve({i}) == {i * i}" for i in range(400))
+
+
+@tool("generate_test_cases")
+def fake_test_cases(problem_description: str) -> str:
+    """Stand-in returning a long output."""
+    return LONG_OUTPUT
+
+
+def test_fast_path_reply_carries_the_summary_not_the_full_output():
+    graph = StateGraph(DSAState)
+    graph.add_node("fast_path", make_fast_path_node([fake_test_cases]))
+    graph.add_edge(START, "fast_path")
+    graph.add_edge("fast_path", END)
+    state = {
+        "messages": [HumanMessage(content="generate test cases")],
+        "intent": {"name": "test_cases", "args": {"problem_description": "squares"}},
+    }
+    config = {"configurable": {"session_id": "fast-path-test", "thread_id": "t"}}
+    messages = graph.compile().invoke(state, config)["messages"]
+
+    tool_message, reply = messages[-2], messages[-1]
+    assert isinstance(tool_message, ToolMessage) and isinstance(reply, AIMessage)
+    handle = tool_message.artifact["handle"]
+    assert len(reply.content) < len(LONG_OUTPUT) // 4
+    assert handle in reply.content
+    assert get_artifact_store().get("fast-path-test", handle) == LONG_OUTPUT
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("give me a hint", "hint"),
+    ("I'm stuck on Two Sum, another hint?", "hint"),
+    ("Can I get a small hint?", "hint"),
+    ("what's the complexity of my code", "complexity"),
+    ("What is the time complexity?", "complexity"),
+    ("Big O?", "complexity"),
+    ("can you generate test cases", "test_cases"),
+    ("write 5 edge test cases for two sum", "test_cases"),
+])
+def test_requests_take_the_fast_path(text, intent):
+    assert classify_intent(text) == intent
+
+
+@pytest.mark.parametrize("text", [
+    "why does your last hint suggest a hash map?",
+    "what did you mean by that clue?",
+    "what's the time complexity of binary search in general?",
+    "is the time complexity of my code O(n)?",
+    "explain the big o of heapsort",
+    "how does a hint ladder work?",
+    "why did the test cases fail?",
+    "give me a hint and the time complexity",
+])
+def test_questions_and_follow_ups_go_to_the_assistant(text):
+    assert classify_intent(text) is None
@@ -0,0 +1,90 @@
+import gc
+import os
+import threading
+
+from session.artifact_store import get_artifact_store
+from session.lifecycle import SessionLifecycle
+from session.message_log import MessageLog
+from tools.persistent_python_repl import get_repl_pool
+
+
+class _TouchingLog(MessageLog):
+    """Message log whose export touches sessions from another thread, as a concurrent script run would."""
+
+    def __init__(self, lifecycle, touches):
+        super().__init__()
+        self.lifecycle = lifecycle
+        self.touches = touches
+        self.blocked = False
+
+    def export(self):
+        for session_id, log in self.touches:
+            toucher = threading.Thread(target=self.lifecycle.touch, args=(session_id, log))
+            toucher.start()
+            toucher.join(timeout=2)
+            self.blocked |= toucher.is_alive()
+        return super().export()
+
+
+def _lifecycle(tmp_path):
+    lifecycle = SessionLifecycle(idle_after_s=0, spill_dir=str(tmp_path))
+    lifecycle._sweeper = threading.current_thread()  # sweep explicitly, no background thread
+    return lifecycle
+
+
+def test_touch_during_spill_is_not_blocked_and_keeps_the_session(tmp_path):
+    lifecycle = _lifecycle(tmp_path)
+    other = MessageLog()
+    log = _TouchingLog(lifecycle, [])
+    log.touches = [("other", other), ("s", log)]
+    log.add_user("hello")
+    lifecycle.touch("s", log)
+
+    assert lifecycle.sweep() == 0
+    assert not log.blocked
+    assert len(log) == 1
+    assert os.listdir(tmp_path) == []
+    assert lifecycle.stats()["spilled"] == 0
+
+
+def test_idle_session_spills_and_restores_with_its_artifacts_and_a_sandbox_notice(tmp_path):
+    lifecycle = _lifecycle(tmp_path)
+    log = MessageLog()
+    log.add_user("hello")
+    log.add_assistant("hi there")
+    log.state["current_snapshot"] = "abc"
+    handle = get_artifact_store().put("spill-test", "long output " * 500)
+    get_repl_pool().get("spill-test").execute("nums = [1, 2, 3]")
+    lifecycle.touch("spill-test", log)
+
+    assert lifecycle.sweep() == 1
+    assert len(log) == 0 and log.state == {}
+    assert get_repl_pool().peek("spill-test") is None
+    assert get_artifact_store().get("spill-test", handle) is None
+    assert len(os.listdir(tmp_path)) == 1
+    assert lifecycle.stats()["spilled"] == 1
+
+    assert lifecycle.touch("spill-test", log)
+    assert [entry.content for entry in log.entries[:2]] == ["hello", "hi there"]
+    assert log.state == {"current_snapshot": "abc"}
+    assert "nums" in log.entries[-1].content and log.entries[-1].ui_only
+    assert get_artifact_store().get("spill-test", handle) == "long output " * 500
+    assert os.listdir(tmp_path) == []
+    assert lifecycle.stats() == {"resident": 1, "spilled": 0, "spills": 1, "restores": 1}
+
+
+def test_closed_sessions_are_forgotten_with_their_spill_files(tmp_path):
+    lifecycle = _lifecycle(tmp_path)
+    log = MessageLog()
+    log.add_user("hello")
+    lifecycle.touch("closed-test", log)
+    lifecycle.sweep()
+    assert len(os.listdir(tmp_path)) == 1
+
+    get_repl_pool().get("closed-test")
+    del log
+    gc.collect()
+    assert lifecycle.sweep() == 0
+    assert os.listdir(tmp_path) == []
+    assert get_repl_pool().peek("closed-test") is None
+    assert lifecycle.stats()["resident"] == lifecycle.stats()["spilled"] == 0
@@ -0,0 +1,74 @@
+import pickle
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from session.artifact_store import ArtifactStore, summarize_output
+from session.message_log import MessageLog
+
+CALL = {"name": "python_repl", "args": {"code": "print(1)"}, "id": "call_1", "type": "tool_call"}
+
+
+def _conversation():
+    log = MessageLog()
+    log.add_user("I'd like you to analyze this code ...", display="▶️ Run & Analyze")
+    log.add_message(AIMessage(content="", tool_calls=[CALL], additional_kwargs={"signature": "abc"}))
+    log.add_message(ToolMessage(content="1\n", name="python_repl", tool_call_id="call_1"))
+    log.add_message(AIMessage(content="It prints 1.")).attach("complexity", {"time": "O(1)"})
+    log.add_assistant("The mentor is busy, try again.", ui_only=True)
+    return log
+
+
+def test_graph_projection_rebuilds_the_langchain_messages():
+    messages = _conversation().graph_messages()
+    assert [type(m) for m in messages] == [HumanMessage, AIMessage, ToolMessage, AIMessage]
+    assert messages[0].content == "I'd like you to analyze this code ..."
+    assert messages[1].tool_calls[0]["id"] == "call_1"
+    assert messages[1].additional_kwargs == {"signature": "abc"}
+    assert (messages[2].name, messages[2].tool_call_id) == ("python_repl", "call_1")
+
+
+def test_chat_projection_hides_tool_results_and_shows_tool_notices():
+    shown = list(_conversation().display_messages())
+    assert [m["role"] for m in shown] == ["user", "system", "assistant", "assistant"]
+    assert shown[0]["content"] == "▶️ Run & Analyze"
+    assert shown[1]["tool_name"] == "python_repl"
+    assert shown[2]["complexity"] == {"time": "O(1)"}
+    assert shown[3]["content"] == "The mentor is busy, try again."
+
+
+def test_turn_state_is_carried_but_messages_and_intent_are_not():
+    log = _conversation()
+    log.update_state({"messages": ["x"], "intent": {"name": "hint"}, "current_snapshot": "abc"})
+    assert log.state == {"current_snapshot": "abc"}
+    turn = log.graph_input(intent=None)
+    assert turn["current_snapshot"] == "abc" and turn["intent"] is None
+    assert len(turn["messages"]) == 4
+
+
+def test_export_and_restore_round_trip_through_pickle():
+    log = _conversation()
+    log.state["current_snapshot"] = "abc"
+    restored = MessageLog()
+    restored.restore(pickle.loads(pickle.dumps(log.export())))
+    assert list(restored.display_messages()) == list(log.display_messages())
+    assert restored.graph_messages() == log.graph_messages()
+    assert restored.state == {"current_snapshot": "abc"}
+    log.clear()
+    assert len(log) == 0 and log.state == {}
+
+
+def test_offloaded_output_is_retrievable_from_a_restored_log(tmp_path):
+    store = ArtifactStore(memory_budget_bytes=1000, spill_dir=str(tmp_path))
+    outputs = ["\n".join(f"case {i}: ok {n}" for i in range(200)) for n in range(3)]
+    handles = [store.put("s", output) for output in outputs]
+    assert store.stats()["spilled"] == 2
+
+    log = MessageLog()
+    log.add_message(ToolMessage(content=summarize_output(outputs[0], handles[0]), name="python_repl",
+                                tool_call_id="call_1"))
+    restored = MessageLog()
+    restored.restore(pickle.loads(pickle.dumps(log.export())))
+    summary = restored.graph_messages()[0].content
+    assert handles[0] in summary and len(summary) < len(outputs[0])
+    assert store.get("s", f"`{handles[0]}`") == outputs[0]
+    assert store.export("s") == dict(zip(handles, outputs))
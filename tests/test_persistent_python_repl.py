@@ -0,0 +1,105 @@
+import threading
+
+from analysis.profiling import parse_profile
+from tools.persistent_python_repl import PersistentPythonREPLTool, estimate_size, preview
+
+
+def test_infinite_loop_is_stopped_even_if_it_catches_exceptions():
+    repl = PersistentPythonREPLTool(max_run_s=0.5)
+    output = repl.execute("while True:\n    try:\n        pass\n    except Exception:\n        pass\n")
+    assert "ExecutionTimeout" in output
+    assert repl.execute("print('still usable')") == "still usable\n"
+
+
+def test_other_sessions_run_while_one_is_busy():
+    busy, other = PersistentPythonREPLTool(max_run_s=2.0), PersistentPythonREPLTool(max_run_s=2.0)
+    results = {}
+    worker = threading.Thread(target=lambda: results.setdefault("busy", busy.execute("while True: pass")))
+    worker.start()
+    results["other"] = other.execute("print('hello')")
+    assert worker.is_alive()
+    worker.join()
+    assert results["other"] == "hello\n"
+    assert "ExecutionTimeout" in results["busy"]
+
+
+def test_api_conversation_store_evicts_least_recently_used():
+    from api.server import ConversationStore
+
+    store = ConversationStore(max_conversations=2)
+    store.set(("a",), {})
+    store.set(("b",), {})
+    store.get(("a",))
+    store.set(("c",), {})
+    assert len(store) == 2
+    assert store.get(("b",))["messages"] == []
+    assert ("a",) in store._states and ("b",) not in store._states
+
+
+def test_memory_growth_call_sees_n_inside_comprehensions():
+    repl = PersistentPythonREPLTool()
+    output = repl.execute(
+        "def build(items):\n    return list(items)\n",
+        mode="memory",
+        growth_call="build([i * n for i in range(n)])",
+    )
+    assert "NameError" not in output
+    assert '"growth_exponent":1.0' in output
+
+
+def test_memory_sites_are_reported_at_the_peak():
+    repl = PersistentPythonREPLTool()
+    output = repl.execute(
+        "import time\n"
+        "def work():\n"
+        "    buffer = [list(range(100)) for _ in range(2000)]\n"
+        "    time.sleep(0.05)\n"
+        "    return len(buffer)\n"
+        "total = work()\n",
+        mode="memory",
+    )
+    report = parse_profile(output, mode="memory")
+    assert report["sites"] and report["sites"][0]["line"] == 3
+    assert report["sites"][0]["kb"] > 500
+
+
+def test_oversized_variables_are_evicted_but_functions_kept():
+    repl = PersistentPythonREPLTool(max_object_bytes=1024 ** 2)
+    output = repl.execute("big = list(range(200000))\nsmall = [1, 2]\ndef f():\n    return 1\n")
+    assert "Freed REPL memory" in output and "`big`" in output
+    assert "big" not in repl.global_namespace
+    assert repl.global_namespace["small"] == [1, 2] and callable(repl.global_namespace["f"])
+
+
+def test_least_recently_used_data_goes_first_when_the_session_is_over_its_limit():
+    repl = PersistentPythonREPLTool(max_namespace_bytes=5 * 1024 ** 2)
+    repl.execute("old = list(range(50000))")
+    repl.execute("new = list(range(50000))")
+    repl.execute("total = len(old)")  # old is used again, so new is now the least recent
+    output = repl.execute("more = list(range(50000))")
+    assert "`new`" in output
+    assert {"old", "more"} <= set(repl.global_namespace) and "new" not in repl.global_namespace
+
+
+def test_stale_variables_are_evicted():
+    repl = PersistentPythonREPLTool(stale_after_s=60)
+    repl.execute("data = [1, 2, 3]")
+    repl._last_used["data"] -= 120
+    assert "unused for over 1 min" in repl.execute("x = 1")
+    assert "data" not in repl.global_namespace
+
+
+def test_size_estimates_and_previews_stay_cheap_for_large_values():
+    values = list(range(10 ** 6))
+    assert 30 * 1024 ** 2 < estimate_size(values) < 45 * 1024 ** 2
+    text = preview(values)
+    assert text.startswith("list len=1000000 = [0, 1, 2, 3, 4, ...]")
+    assert len(preview("x" * 10 ** 6)) < 80
+
+
+def test_namespace_info_shows_previews_and_sizes():
+    repl = PersistentPythonREPLTool()
+    repl.execute("nums = list(range(100))\ndef solve():\n    pass\n")
+    info = repl.get_namespace_info()
+    assert "nums: list len=100 = [0, 1, 2, 3, 4, ...]" in info
+    assert "solve: function" in info
@@ -0,0 +1,21 @@
+from models.prompt_cache import PrefixRegistry, PromptPrefix
+
+USAGE = {"input_tokens": 5000}
+
+
+def test_only_cacheable_prefixes_count_as_cached():
+    registry = PrefixRegistry(min_cacheable_tokens=1024)
+    short = PromptPrefix("hint", "x" * 400)
+    long = PromptPrefix("assistant", "y" * 8000)
+    for prefix in (short, short, long, long):
+        registry.record(prefix, USAGE)
+    stats = registry.stats()
+    assert stats["input_tokens"] == 20000
+    assert stats["cached_input_tokens"] == long.estimated_tokens
+
+
+def test_provider_reported_cache_hits_are_trusted():
+    registry = PrefixRegistry(min_cacheable_tokens=1024)
+    short = PromptPrefix("hint", "x" * 400)
+    registry.record(short, {"input_tokens": 300, "input_token_details": {"cache_read": 120}})
+    assert registry.stats()["cached_input_tokens"] == 120
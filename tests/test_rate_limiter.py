@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from models.rate_limiter import PriorityRateLimiter, RateLimitTimeout, llm_priority
+
+DEADLINES = {"interactive": 5.0, "speculative": 5.0, "batch": 5.0}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _drain(limiter):
+    while limiter.acquire(blocking=False):
+        pass
+
+
+def test_requests_are_admitted_up_to_the_budget_and_refill_over_time():
+    clock = _Clock()
+    limiter = PriorityRateLimiter(requests_per_minute=3, tokens_per_minute=0, deadlines_s=DEADLINES, clock=clock)
+    assert [limiter.acquire(blocking=False) for _ in range(4)] == [True, True, True, False]
+    clock.now += 20  # one request's worth at 3/min
+    assert limiter.acquire(blocking=False)
+    assert not limiter.acquire(blocking=False)
+
+
+def test_real_token_usage_corrects_the_estimate():
+    clock = _Clock()
+    limiter = PriorityRateLimiter(requests_per_minute=0, tokens_per_minute=10000, deadlines_s=DEADLINES, clock=clock)
+    limiter.acquire()
+    limiter.record_tokens(3000)
+    assert limiter.saturation()["tokens_available"] == 7000
+    assert limiter.avg_tokens == pytest.approx(1600)
+
+
+def test_waiting_past_the_priority_deadline_raises():
+    limiter = PriorityRateLimiter(requests_per_minute=1, tokens_per_minute=0, deadlines_s={"batch": 0.05})
+    _drain(limiter)
+    with llm_priority("batch"), pytest.raises(RateLimitTimeout):
+        limiter.acquire()
+    assert limiter.saturation()["timeouts"] == 1
+
+
+def test_interactive_calls_are_admitted_before_earlier_batch_calls():
+    limiter = PriorityRateLimiter(requests_per_minute=600, tokens_per_minute=0, deadlines_s=DEADLINES)
+    _drain(limiter)
+    admitted = []
+
+    def call(priority):
+        with llm_priority(priority):
+            limiter.acquire()
+        admitted.append(priority)
+
+    batch = threading.Thread(target=call, args=("batch",))
+    batch.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=call, args=("interactive",))
+    interactive.start()
+    batch.join(timeout=5)
+    interactive.join(timeout=5)
+    assert admitted == ["interactive", "batch"]
+
+
+def test_long_interactive_waits_report_saturation():
+    clock = _Clock()
+    limiter = PriorityRateLimiter(requests_per_minute=60, tokens_per_minute=0, deadlines_s=DEADLINES,
+                                  saturation_wait_s=0.5, clock=clock)
+    assert not limiter.saturation()["saturated"]
+    _drain(limiter)
+    assert limiter.saturation()["saturated"]
+    clock.now += 60
+    assert not limiter.saturation()["saturated"]
@@ -0,0 +1,64 @@
+from typing import Any, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from config.settings import Settings
+from models.router import ModelRouter
+
+
+class _FakeChatModel(BaseChatModel):
+    """Local stand-in that answers instantly, or fails instantly."""
+
+    fail: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs: Any) -> ChatResult:
+        if self.fail:
+            raise ConnectionError("primary unavailable")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+
+def _router(failing_models):
+    settings = Settings(
+        model_name="primary",
+        cheap_model_name="fallback",
+        model_failures_before_downgrade=2,
+        model_downgrade_cooldown_s=60.0,
+    )
+    now = [0.0]
+
+    def factory(model_name, callbacks):
+        return _FakeChatModel(fail=model_name in failing_models, callbacks=callbacks)
+
+    return ModelRouter(settings, llm_factory=factory, clock=lambda: now[0]), now
+
+
+def _call(router, task="assistant"):
+    try:
+        router.get_llm(task).invoke("hi")
+    except ConnectionError:
+        pass
+
+
+def test_fast_failing_primary_is_downgraded():
+    router, now = _router({"primary"})
+    _call(router)
+    assert router.model_for("assistant") == "primary"
+    _call(router)
+    assert router.model_for("assistant") == "fallback"
+    now[0] = 61.0
+    assert router.model_for("assistant") == "primary"
+
+
+def test_success_resets_the_failure_count():
+    router, _ = _router(set())
+    router.record_failure("assistant", "primary")
+    _call(router)
+    router.record_failure("assistant", "primary")
+    assert router.model_for("assistant") == "primary"
+    assert router.stats()["assistant"]["consecutive_failures"] == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from config.settings import get_settings
+from session.snapshots import build_code_submission, code_from_args, current_code, merge_snapshots
+
+LINES = [f"    total += {i}" for i in range(20)]
+V1 = "\n".join(["def solve():", "    total = 0", *LINES, "    return total"]) + "\n"
+V2 = V1.replace("total += 7", "total += 70")
+
+
+def _submit(code, state):
+    update, message = build_code_submission(code, state)
+    return {**state, "snapshots": merge_snapshots(state.get("snapshots"), update["snapshots"]),
+            "current_snapshot": update["current_snapshot"]}, message
+
+
+def test_first_submission_sends_the_code_in_full():
+    state, message = _submit(V1, {})
+    assert V1.strip() in message
+    assert current_code(state) == V1
+
+
+def test_resubmitting_unchanged_code_reuses_its_snapshot():
+    state, _ = _submit(V1, {})
+    again, message = _submit(V1, state)
+    assert again["snapshots"] == state["snapshots"]
+    assert "unchanged since the last run" in message
+    assert "total += 3" not in message
+
+
+def test_edits_are_sent_as_a_diff_against_the_previous_snapshot():
+    state, _ = _submit(V1, {})
+    state, message = _submit(V2, state)
+    assert "```diff" in message
+    assert "-    total += 7\n+    total += 70" in message
+    assert "total += 15" not in message
+    assert len(state["snapshots"]) == 2
+
+
+def test_tools_resolve_snapshot_ids_from_state():
+    state, _ = _submit(V1, {})
+    snapshot = state["current_snapshot"]
+    assert code_from_args("", f"`{snapshot}`", state) == V1
+    assert code_from_args("print(solve())", snapshot, state) == f"{V1}\nprint(solve())"
+    with pytest.raises(ValueError):
+        code_from_args("", "missing", state)
+
+
+def test_only_the_most_recent_snapshots_are_kept(monkeypatch):
+    monkeypatch.setattr(get_settings(), "snapshot_max_kept", 3)
+    versions = [V1.replace("total += 7", f"total += {n}") for n in range(100, 105)]
+    state, _ = _submit(versions[0], {})
+    for code in versions[1:4]:
+        state, _ = _submit(code, state)
+    state, _ = _submit(versions[1], state)  # resubmitting an old version makes it recent again
+    state, _ = _submit(versions[4], state)
+
+    assert sorted(state["snapshots"].values()) == sorted([versions[1], versions[3], versions[4]])
+    assert current_code(state) == versions[4]
@@ -0,0 +1,66 @@
+import threading
+import time
+
+from analysis.cache import ResultCache
+from analysis.speculative import SpeculativeAnalyzer
+
+CODE = "def solve(nums):\n    return sorted(nums)\n"
+REFORMATTED = "def solve(nums):\n\n    # sort a copy\n    return sorted( nums )\n"
+
+
+def _analyzer(**kwargs):
+    analyzer = SpeculativeAnalyzer(cache=ResultCache(), **kwargs)
+    calls = []
+    done = threading.Event()
+
+    def warmer(artifact):
+        calls.append(artifact.source)
+        done.set()
+        return len(artifact.source)
+
+    analyzer.register_warmer("length", warmer)
+    return analyzer, calls, done
+
+
+def test_only_the_last_edit_after_the_debounce_is_analyzed():
+    analyzer, calls, done = _analyzer(debounce_s=0.05)
+    analyzer.schedule("s", "def solve(nums):\n    return nu\n")
+    analyzer.schedule("s", CODE)
+    assert done.wait(2)
+    time.sleep(0.1)
+    assert calls == [CODE]
+    assert analyzer.warm_results(CODE)["length"] == len(CODE)
+
+
+def test_cancelled_edit_is_never_analyzed():
+    analyzer, calls, done = _analyzer(debounce_s=0.05)
+    analyzer.schedule("s", CODE)
+    analyzer.cancel("s")
+    assert not done.wait(0.2)
+    assert calls == []
+
+
+def test_reformatted_code_reuses_warm_results():
+    analyzer, calls, _ = _analyzer()
+    analyzer.analyze(CODE)
+    results = analyzer.analyze(REFORMATTED)
+    assert calls == [CODE]
+    assert results["length"] == len(CODE)
+    assert analyzer.warm_results(REFORMATTED) is not None
+
+
+def test_syntax_errors_skip_the_warmers():
+    analyzer, calls, _ = _analyzer()
+    results = analyzer.analyze("def solve(:\n")
+    assert results["syntax_error"].startswith("SyntaxError")
+    assert calls == []
+
+
+def test_runs_per_minute_are_limited_per_session():
+    analyzer, calls, _ = _analyzer(debounce_s=60, max_runs_per_minute=2)
+    analyzer.schedule("s", CODE)
+    for i in range(3):
+        analyzer._fire("s", f"x = {i}\n")  # as if each edit's debounce had elapsed
+    analyzer._executor.shutdown(wait=True)
+    analyzer.forget("s")
+    assert calls == ["x = 0\n", "x = 1\n"]
@@ -0,0 +1,191 @@
+import pytest
+
+from analysis.static_complexity import analyze_complexity
+
+BUBBLE_SORT = """
+def bubble_sort(arr):
+    n = len(arr)
+    for i in range(n):
+        for j in range(n - i - 1):
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+    return arr
+"""
+
+INSERTION_SORT = """
+def insertion_sort(arr):
+    for i in range(1, len(arr)):
+        key = arr[i]
+        j = i - 1
+        while j >= 0 and arr[j] > key:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+    return arr
+"""
+
+FLOYD_WARSHALL = """
+def floyd_warshall(grid):
+    n = len(grid)
+    for k in range(n):
+        for i in range(n):
+            for j in range(n):
+                grid[i][j] = min(grid[i][j], grid[i][k] + grid[k][j])
+    return grid
+"""
+
+LCS_TABLE = """
+def lcs(a, b):
+    dp = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+    return dp[-1][-1]
+"""
+
+GCD = """
+def gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+"""
+
+PERMUTATIONS = """
+def permute(nums):
+    result = []
+    def backtrack(path, used):
+        if len(path) == len(nums):
+            result.append(path[:])
+            return
+        for i in range(len(nums)):
+            if used[i]:
+                continue
+            used[i] = True
+            path.append(nums[i])
+            backtrack(path, used)
+            path.pop()
+            used[i] = False
+    backtrack([], [False] * len(nums))
+    return result
+"""
+
+PERMUTATIONS_BY_SWAPPING = """
+def permute(nums):
+    out = []
+    def go(start):
+        if start == len(nums):
+            out.append(nums[:])
+        for i in range(start, len(nums)):
+            nums[start], nums[i] = nums[i], nums[start]
+            go(start + 1)
+            nums[start], nums[i] = nums[i], nums[start]
+    go(0)
+    return out
+"""
+
+SUBSETS = """
+def subsets(nums):
+    result = []
+    def backtrack(start, path):
+        result.append(path[:])
+        for i in range(start, len(nums)):
+            path.append(nums[i])
+            backtrack(i + 1, path)
+            path.pop()
+    backtrack(0, [])
+    return result
+"""
+
+TWO_SUM = """
+def two_sum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+    return []
+"""
+
+BINARY_SEARCH = """
+def binary_search(arr, target):
+    lo, hi = 0, len(arr) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if arr[mid] == target:
+            return mid
+        if arr[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+"""
+
+MERGE_SORT = """
+def merge_sort(arr):
+    if len(arr) <= 1:
+        return arr
+    mid = len(arr) // 2
+    left = merge_sort(arr[:mid])
+    right = merge_sort(arr[mid:])
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i]); i += 1
+        else:
+            merged.append(right[j]); j += 1
+    return merged + left[i:] + right[j:]
+"""
+
+MEMO_FIB = """
+def fib(n, memo={}):
+    if n in memo:
+        return memo[n]
+    if n <= 1:
+        return n
+    memo[n] = fib(n - 1, memo) + fib(n - 2, memo)
+    return memo[n]
+"""
+
+WORD_COUNT = """
+from collections import defaultdict
+def count(words):
+    counts = defaultdict(int)
+    for w in words:
+        counts[w] += 1
+    return counts
+"""
+
+
+@pytest.mark.parametrize("code, time, space, confidence", [
+    (BUBBLE_SORT, "O(n^2)", "O(1)", "high"),
+    (INSERTION_SORT, "O(n^2)", "O(1)", "high"),
+    (FLOYD_WARSHALL, "O(n^3)", "O(1)", "high"),
+    (LCS_TABLE, "O(n^2)", "O(n^2)", "high"),
+    (GCD, "O(log n)", "O(1)", "high"),
+    (PERMUTATIONS, "O(n!)", "O(n)", "medium"),
+    (PERMUTATIONS_BY_SWAPPING, "O(n!)", "O(n)", "medium"),
+    (SUBSETS, "O(2^n)", "O(n)", "medium"),
+    (TWO_SUM, "O(n)", "O(n)", "high"),
+    (BINARY_SEARCH, "O(log n)", "O(1)", "high"),
+    (MERGE_SORT, "O(n log n)", "O(n)", "medium"),
+    (MEMO_FIB, "O(n)", "O(n)", "medium"),
+    (WORD_COUNT, "O(n)", "O(n)", "high"),
+])
+def test_complexity(code, time, space, confidence):
+    result = analyze_complexity(code)
+    assert (result["time"], result["space"], result["confidence"]) == (time, space, confidence)
+
+
+def test_stores_into_unknown_containers_lower_confidence():
+    code = "class Solver:\n    def fill(self, n):\n        for i in range(n):\n            self.table[i] = i\n"
+    result = analyze_complexity(code)
+    assert result["confidence"] == "low"
+    assert "self.table" in result["uncertain"][0]
+
+
+def test_syntax_error_is_reported():
+    assert "error" in analyze_complexity("def broken(:\n")
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from analysis.stress import ArgSpec, _conforms, generate_args
+
+
+@pytest.mark.parametrize("unique", [False, True])
+@pytest.mark.parametrize("order", ["ascending", "descending"])
+def test_int_lists_follow_the_requested_order(order, unique):
+    spec = ArgSpec(kind="int_list", order=order, unique=unique, min_len=0, max_len=30)
+    cases = generate_args(spec, 200, np.random.default_rng(0))
+    assert len(cases) == 200
+    assert all(_conforms(case, spec) for case in cases)
+    assert any(len(case) > 1 for case in cases)
+
+
+def test_unique_int_lists_are_distinct_and_in_range():
+    spec = ArgSpec(kind="int_list", unique=True, min_value=-3, max_value=3, min_len=5, max_len=10)
+    for case in generate_args(spec, 100, np.random.default_rng(1)):
+        assert len(set(case)) == len(case) <= 7
+        assert all(-3 <= value <= 3 for value in case)
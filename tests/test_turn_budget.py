@@ -0,0 +1,16 @@
+import time
+
+from graph.turn_budget import charge, exhausted_reason, start_turn
+
+
+def test_seconds_budget_uses_the_monotonic_clock(monkeypatch):
+    turn = start_turn()
+    # A wall-clock jump (e.g. an NTP correction) must not end or extend the turn
+    monkeypatch.setattr(time, "time", lambda: 10 ** 10)
+    assert exhausted_reason(turn) is None
+    assert exhausted_reason({**turn, "started": time.monotonic() - 10 ** 4}) == "seconds"
+
+
+def test_charge_accumulates_spend():
+    turn = charge(charge(start_turn(), tool_rounds=1, llm_calls=1, tokens=100), llm_calls=1, tokens=50)
+    assert (turn["tool_rounds"], turn["llm_calls"], turn["tokens"]) == (1, 2, 150)
@@ -0,0 +1,35 @@
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+
+from session.artifact_store import get_artifact_store, session_key
+
+
+@tool(
+    "retrieve_artifact",
+    description=(
+        "Read the full output of an earlier tool call that was stored as an artifact "
+        "(the truncated result names its handle). Use offset and limit (in lines) to page through it."
+    ),
+)
+def retrieve_artifact(handle: str, config: RunnableConfig, offset: int = 0, limit: int = 200) -> str:
+    """Read a stored tool output.
+
+    Args:
+        handle (str): Artifact handle, e.g. ``art_1a2b3c4d5e6f``.
+        offset (int): First line to return.
+        limit (int): Maximum number of lines to return.
+
+    Returns:
+        str: The requested lines, or an error if the handle is unknown.
+    """
+    content = get_artifact_store().get(session_key(config), handle)
+    if content is None:
+        return f"Unknown artifact '{handle}'"
+    lines = content.splitlines()
+    offset = max(0, offset)
+    chunk = lines[offset:offset + max(1, limit)]
+    end = offset + len(chunk)
+    header = f"[{handle}: lines {offset + 1}-{end} of {len(lines)}]"
+    if end < len(lines):
+        header += f" (call again with offset={end} for more)"
+    return header + "\n" + "\n".join(chunk)
@@ -0,0 +1,90 @@
+from typing import Annotated, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+
+from analysis.benchmark import format_benchmark, format_benchmark_table, run_benchmark
+from analysis.code_artifact import get_code_artifact
+from config.settings import get_settings
+from session.snapshots import code_from_args
+from tools.persistent_python_repl import ExecutionTimeout, _repl_for
+
+_DEFAULT_SIZES = [100, 1000, 10000]
+_MAX_SIZES = 6
+_MAX_REPEATS = 15
+# Extra time a benchmark may run past its budget before a call that never returns is interrupted
+_TIME_LIMIT_MARGIN_S = 10.0
+
+
+@tool(
+    "benchmark_solutions",
+    description=(
+        "Compare the speed of two or more solution functions on the same inputs. Define the functions "
+        "with code or snapshot_id (run in the session's REPL first), name them in variants (the first is "
+        "the baseline), and give args_expr, an expression using n that returns the argument tuple, e.g. "
+        "(list(range(n)), n - 1). Returns a median/IQR/speedup table per size and whether outputs agree."
+    ),
+)
+def benchmark_solutions(
+    variants: List[str],
+    args_expr: str,
+    config: RunnableConfig,
+    code: str = "",
+    snapshot_id: str = "",
+    sizes: Optional[List[int]] = None,
+    repeats: int = 5,
+    state: Annotated[dict, InjectedState] = None,
+) -> str:
+    """Benchmark solution variants side by side in the session's sandbox.
+
+    Args:
+        variants (List[str]): Names of the functions to compare; the first is the baseline.
+        args_expr (str): Expression using ``n`` that evaluates to the positional arguments.
+        code (str): Code defining the variants (runs after the snapshot, if any).
+        snapshot_id (str): ID of a submitted code snapshot to run first.
+        sizes (List[int]): Input sizes to measure, ascending.
+        repeats (int): Timed samples per variant and size.
+
+    Returns:
+        str: A markdown results table followed by one line of chart data.
+    """
+    if len(variants) < 2:
+        return "Name at least two functions in variants to compare."
+    try:
+        code = code_from_args(code, snapshot_id, state)
+    except ValueError as e:
+        return str(e)
+    sizes = sorted({n for n in (sizes or _DEFAULT_SIZES) if n > 0})[:_MAX_SIZES]
+    repeats = max(1, min(repeats, _MAX_REPEATS))
+
+    repl = _repl_for(config)
+    setup_output = repl.execute(code) if code.strip() else ""
+    functions = {name: repl.lookup_callable(name) for name in variants}
+    missing = [name for name, function in functions.items() if function is None]
+    if missing:
+        defined = get_code_artifact(code).signatures
+        hint = f" (the code defines {', '.join(defined)})" if defined else ""
+        return f"Not defined as functions: {', '.join(missing)}{hint}\n{setup_output}".strip()
+    try:
+        make_args = repl.compile_lambda("n", args_expr, "<args_expr>")
+    except SyntaxError as e:
+        return f"Invalid args_expr: {e}"
+
+    time_budget_s = get_settings().benchmark_time_budget_s
+    try:
+        # The budget is checked between calls; the limit stops a single call that never returns
+        with repl.captured_output(time_limit_s=time_budget_s + _TIME_LIMIT_MARGIN_S):
+            report = run_benchmark(
+                functions,
+                make_args,
+                sizes,
+                repeats=repeats,
+                time_budget_s=time_budget_s,
+            )
+    except ExecutionTimeout:
+        return f"Benchmark stopped: a call was still running {time_budget_s + _TIME_LIMIT_MARGIN_S:g}s in (infinite loop?)"
+    except Exception as e:
+        return f"Benchmark failed: {type(e).__name__}: {e}"
+    report["snapshot"] = snapshot_id.strip().strip("`") or None
+    return format_benchmark_table(report) + "\n\n" + format_benchmark(report)
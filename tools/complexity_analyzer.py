@@ -1,41 +1,81 @@
+import json
+from typing import Annotated
 from langchain_core.tools import tool
-from models.llm import get_llm
+from langgraph.prebuilt import InjectedState
+from analysis.cache import get_result_cache
+from analysis.complexity_schema import ComplexityAnalysis, from_static, to_compact_json
+from analysis.code_artifact import CodeArtifact, get_code_artifact
+from analysis.static_complexity import format_static_report
+from models.llm import get_structured_llm
+from models.prompt_cache import PromptPrefix, invoke_with_prefix
+from session.snapshots import code_from_args
 
+# Instructions are a fixed prefix; the code and its static analysis form the variable tail.
+COMPLEXITY_PREFIX = PromptPrefix("complexity", """Analyze the time and space complexity of the code below.
+Respond only with the structured result: Big-O time and space, a one-sentence approach, at most 4 hotspots (line, short note, cost) and at most 3 short optimization suggestions. Keep every note brief.
+A local static analyzer's provisional result follows the code. Confirm it, or correct it if the heuristics got it wrong, and set confidence accordingly.""",
+    json.dumps(ComplexityAnalysis.model_json_schema(), sort_keys=True))
 
-@tool("complexity_analyzer", description="Analyze time and space complexity of code")
-def complexity_analyzer(code: str) -> str:
+
+@tool(
+    "complexity_analyzer",
+    description="Analyze time and space complexity of code. Pass snapshot_id to analyze a submitted code snapshot.",
+)
+def complexity_analyzer(
+    code: str = "",
+    snapshot_id: str = "",
+    state: Annotated[dict, InjectedState] = None,
+) -> str:
     """Analyze the time and space complexity of the given code.
     
     Args:
         code (str): The code to analyze for complexity.
+        snapshot_id (str): ID of a submitted code snapshot to analyze instead of ``code``.
         
     Returns:
-        str: Analysis of time and space complexity with optimization suggestions.
+        str: Compact JSON with time, space, approach, hotspots and suggestions.
     """
-    llm = get_llm()
+    try:
+        code = code_from_args(code, snapshot_id, state)
+    except ValueError as e:
+        return str(e)
     
-    prompt = f"""Analyze the time and space complexity of this code. Format your response clearly with the following structure:
-
-**Time Complexity:** O(n) - Brief explanation of why
-- Detailed explanation of the time complexity analysis
+    # Structured results are comparable across runs, so identical code is analyzed once.
+    # Keyed by the exact source (not the fingerprint): hotspot line numbers depend on it.
+    artifact = get_code_artifact(code)
+    try:
+        return get_result_cache().get_or_compute(("complexity", artifact.hash), lambda: _analyze(artifact))
+    except _StructuredOutputFailed as failed:
+        # Fall back to the local result rather than failing the tool call; not cached, so the next call retries
+        print(f"⚠️ Structured complexity output failed: {failed}")
+        static = artifact.static_complexity
+        if "error" in static:
+            return format_static_report(static)
+        return to_compact_json(from_static(static))
 
-**Space Complexity:** O(n) - Brief explanation of why  
-- Detailed explanation of the space complexity analysis
 
-**Algorithm Approach:**
-- Brief description of the algorithm and how it works
+class _StructuredOutputFailed(Exception):
+    """The model's complexity analysis could not be parsed into ComplexityAnalysis."""
 
-**Optimization Suggestions:**
-- Any potential optimizations or alternative approaches
-- Trade-offs between different solutions
 
-Code to analyze:
+def _analyze(artifact: CodeArtifact) -> str:
+    # A local static pass settles the common cases; the LLM confirms or corrects it.
+    code = artifact.source
+    static = artifact.static_complexity
+    static_report = format_static_report(static)
+    
+    tail = f"""Code to analyze:
 ```
 {code}
 ```
 
-Please provide a clear, well-structured analysis that's easy to read."""
+Provisional static analysis:
+{static_report}"""
     
-    response = llm.invoke(prompt)
+    llm = get_structured_llm("complexity", ComplexityAnalysis)
+    response = invoke_with_prefix(llm, COMPLEXITY_PREFIX, tail)
     
-    return response.content
+    parsed = response["parsed"]
+    if parsed is None:
+        raise _StructuredOutputFailed(response["parsing_error"])
+    return to_compact_json({**parsed.model_dump(), "source": "llm"})
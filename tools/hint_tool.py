@@ -1,20 +1,165 @@
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Annotated, Dict, List, Optional
+
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from models.llm import get_llm
+from langgraph.prebuilt import InjectedState
+from pydantic import BaseModel, Field
+
+from analysis.cache import get_result_cache
+from analysis.code_artifact import get_code_artifact
+from models.llm import get_structured_llm
+from models.prompt_cache import PromptPrefix, invoke_with_prefix
+from session.artifact_store import session_key
+from session.snapshots import current_code
+
+
+class HintLadder(BaseModel):
+    """Progressively stronger hints for one problem, generated in a single call."""
+    nudge: str = Field(description="A guiding question or observation; names no algorithm")
+    approach: str = Field(description="The key idea or technique to use, without code")
+    near_solution: str = Field(description="A step-by-step outline close to the solution, still without code")
+
+
+HINT_LEVELS = ("nudge", "approach", "near_solution")
+_LEVEL_TITLES = {"nudge": "Nudge", "approach": "Approach", "near_solution": "Almost there"}
+
+HINT_PREFIX = PromptPrefix(
+    "hint",
+    "Write three progressively stronger hints for this DSA problem without solving it: "
+    "a nudge, then the key approach, then a near-solution outline. Never include code.",
+    json.dumps(HintLadder.model_json_schema(), sort_keys=True),
+)
+
+
+class HintProgress:
+    """How many hints of each problem's ladder a conversation has already seen."""
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_entries: (conversation, problem) pairs kept; the least recently used is dropped beyond this
+        """
+        self.max_entries = max_entries
+        self._revealed: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def next_level(self, key: tuple, levels: int) -> int:
+        """Return the index of the next hint to reveal for ``key`` and advance it."""
+        with self._lock:
+            level = min(self._revealed.get(key, 0), levels - 1)
+            self._revealed[key] = level + 1
+            self._revealed.move_to_end(key)
+            while len(self._revealed) > self.max_entries:
+                self._revealed.popitem(last=False)
+            return level
+
+    def export(self, session_id: str) -> Dict[tuple, int]:
+        """Return a session's progress (key -> hints revealed), e.g. to restore it later."""
+        with self._lock:
+            return {k: v for k, v in self._revealed.items() if k[0] == session_id}
+
+    def restore(self, progress: Dict[tuple, int]) -> None:
+        """Reinstate progress returned by ``export``."""
+        with self._lock:
+            self._revealed.update(progress)
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session's progress."""
+        with self._lock:
+            for key in [k for k in self._revealed if k[0] == session_id]:
+                del self._revealed[key]
+
+
+_hint_progress = HintProgress()
+
+
+def get_hint_progress() -> HintProgress:
+    return _hint_progress
 
 
-@tool("generate_hint", description="Generate a helpful hint for a DSA problem without solving it.")
-def generate_hint(question: str) -> str:
+@tool(
+    "generate_hint",
+    description=(
+        "Generate a helpful hint for a DSA problem without solving it. Repeated calls for the "
+        "same problem reveal progressively stronger hints."
+    ),
+)
+def generate_hint(question: str, config: RunnableConfig, state: Annotated[dict, InjectedState] = None) -> str:
     """Generate a helpful hint for a DSA problem without solving it.
-    
+
+    The whole ladder (nudge, approach, near-solution) is generated once per
+    problem and cached; each call reveals the conversation's next level.
+
     Args:
         question (str): The DSA problem to generate a hint for.
-        
+
     Returns:
-        str: A helpful hint for the DSA problem.
+        str: The next hint for the DSA problem.
     """
-    llm = get_llm()
-    
-    prompt = f"Give a helpful hint for this DSA problem without solving it: {question}"
-    response = llm.invoke(prompt)
-    
-    return response.content
+    problem = _problem_key(question, state)
+    try:
+        ladder = get_result_cache().get_or_compute(("hint_ladder", problem), lambda: _generate_ladder(question))
+    except _LadderFailed as failed:
+        # Not cached and no level used up, so the next request retries the full ladder
+        return f"💡 Hint: {failed.text}"
+
+    configurable = (config or {}).get("configurable", {})
+    key = (session_key(config), configurable.get("thread_id", "default"), problem)
+    level = get_hint_progress().next_level(key, len(ladder))
+
+    hint = f"💡 Hint {level + 1}/{len(ladder)} ({ladder[level]['title']}): {ladder[level]['text']}"
+    if level == len(ladder) - 1:
+        hint += "\n\n(That was the last hint; the next step is writing the code.)"
+    return hint
+
+
+class _LadderFailed(Exception):
+    """The structured ladder could not be parsed; ``text`` is the model's raw answer."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.text = text
+
+
+def _normalize(text: str) -> str:
+    """Lowercase words separated by single spaces (identifiers split at underscores)."""
+    return " " + " ".join(re.sub(r"[\W_]+", " ", text).split()).lower() + " "
+
+
+def _problem_key(question: str, state: Optional[dict]) -> tuple:
+    """
+    Identify the problem a hint request is about, so rephrased requests share a ladder.
+
+    When the question refers to the student's current code (its recognized
+    problem or one of its function names), the code's problem, or else its
+    structural fingerprint, is the key. Otherwise the normalized question is.
+    """
+    question_text = _normalize(question)
+    code = current_code(state or {})
+    if code:
+        artifact = get_code_artifact(code)
+        mentions = {_normalize(signature.split("(", 1)[0]) for signature in artifact.signatures}
+        if artifact.problem:
+            mentions.add(_normalize(artifact.problem.split(":", 1)[0]))
+        if any(mention.strip() and mention in question_text for mention in mentions):
+            return ("problem", artifact.problem) if artifact.problem else ("code", artifact.fingerprint)
+    return ("question", question_text.strip())
+
+
+def _generate_ladder(question: str) -> List[dict]:
+    llm = get_structured_llm("hint", HintLadder)
+
+    response = invoke_with_prefix(llm, HINT_PREFIX, f"Problem: {question}")
+
+    parsed = response["parsed"]
+    if parsed is None:
+        # Answer with whatever text came back, without caching it as this problem's ladder
+        print(f"⚠️ Structured hint ladder failed: {response['parsing_error']}")
+        raise _LadderFailed(str(response["raw"].content))
+    return [{"title": _LEVEL_TITLES[level], "text": getattr(parsed, level)} for level in HINT_LEVELS]
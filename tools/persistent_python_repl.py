@@ -1,29 +1,240 @@
+import builtins
+import ctypes
+import itertools
+import reprlib
 import sys
 import io
+import threading
+import time
 import traceback
-from contextlib import redirect_stdout, redirect_stderr
-from typing import Dict, Any
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Annotated, Callable, Dict, Any, Iterator, List, Literal, Optional
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+from analysis.code_artifact import get_code_artifact
+from analysis.profiling import USER_FILENAME, LineProfiler, MemoryProfiler, format_profile
+from session.artifact_store import session_key
+from session.snapshots import code_from_args
+
+# tracemalloc is process-wide, so memory profiles of concurrent sessions must not overlap.
+_memory_profile_lock = threading.Lock()
+
+
+class ExecutionTimeout(BaseException):
+    """Raised inside user code that runs past its time limit.
+
+    Derives from BaseException so ``except Exception`` in user code does not swallow it.
+    """
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout/sys.stderr replacement that writes to the calling thread's capture buffer, if any.
+
+    Swapping sys.stdout per execution is process-wide and would mix the
+    output of concurrent sessions; this routes each thread's writes instead.
+    """
+
+    def __init__(self, name: str, fallback):
+        self.name = name
+        self.fallback = fallback
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "buffer", None) or self.fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def writable(self) -> bool:
+        return True
+
+
+_stdout = _ThreadOutput("stdout", sys.stdout)
+_stderr = _ThreadOutput("stderr", sys.stderr)
+_install_lock = threading.Lock()
+
+
+def _install_thread_output() -> None:
+    """Route sys.stdout/sys.stderr through the per-thread proxies (again, if something replaced them)."""
+    with _install_lock:
+        if sys.stdout is not _stdout:
+            _stdout.fallback, sys.stdout = sys.stdout, _stdout
+        if sys.stderr is not _stderr:
+            _stderr.fallback, sys.stderr = sys.stderr, _stderr
+
+
+@contextmanager
+def _capture_thread_output(stdout: io.StringIO, stderr: io.StringIO) -> Iterator[None]:
+    """Capture prints of the current thread only (other sessions keep their own)."""
+    _install_thread_output()
+    previous = (getattr(_stdout.local, "buffer", None), getattr(_stderr.local, "buffer", None))
+    _stdout.local.buffer, _stderr.local.buffer = stdout, stderr
+    try:
+        yield
+    finally:
+        _stdout.local.buffer, _stderr.local.buffer = previous
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Raise ExecutionTimeout in the current thread once ``seconds`` have passed.
+
+    The exception is delivered between Python bytecodes, so a long-running
+    C call (e.g. ``time.sleep``) is interrupted only when it returns.
+    """
+    if not seconds:
+        yield
+        return
+    thread_id = threading.get_ident()
+    lock = threading.Lock()
+    state = {"active": True, "fired": False}
+
+    def fire() -> None:
+        with lock:
+            if state["active"]:
+                state["fired"] = True
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(ExecutionTimeout))
+
+    timer = threading.Timer(seconds, fire)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    finally:
+        with lock:
+            state["active"] = False
+            if state["fired"]:
+                # Clear the exception in case it is still pending (the code finished just in time)
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), None)
+        timer.cancel()
+
+
+# Modules preloaded into every namespace; never reported or evicted.
+_PRELOADED = ("sys", "os", "math", "random", "json", "datetime")
+
+_preview_repr = reprlib.Repr()
+_preview_repr.maxstring = 40
+_preview_repr.maxother = 40
+_preview_repr.maxlist = _preview_repr.maxtuple = _preview_repr.maxset = 5
+_preview_repr.maxdict = 3
+_preview_repr.maxlevel = 2
+
+
+def preview(value: Any) -> str:
+    """Describe a value cheaply: type, length or shape, and a size-bounded repr."""
+    kind = type(value).__name__
+    shape = getattr(value, "shape", None)
+    if isinstance(shape, tuple):
+        return f"{kind} shape={shape} dtype={getattr(value, 'dtype', '?')}"
+    try:
+        length = f" len={len(value)}" if hasattr(value, "__len__") else ""
+    except TypeError:
+        length = ""
+    return f"{kind}{length} = {_preview_repr.repr(value)}"
+
+
+def estimate_size(value: Any, max_items: int = 1000) -> int:
+    """
+    Estimate the memory held by a value in bytes.
+
+    Walks containers breadth-first but visits at most ``max_items`` objects;
+    the rest of a large container is extrapolated from the visited sample,
+    so a million-element list costs the same to measure as a small one.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes + sys.getsizeof(value)
+    total, visited, seen = 0, 0, set()
+    queue = [(value, 1.0)]
+    while queue and visited < max_items:
+        obj, weight = queue.pop(0)
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        visited += 1
+        try:
+            total += sys.getsizeof(obj) * weight
+        except TypeError:
+            continue
+        if isinstance(obj, dict):
+            children = [item for pair in obj.items() for item in pair]
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            children = list(obj) if len(obj) <= max_items else list(itertools.islice(obj, max_items))
+        else:
+            continue
+        if children:
+            size = len(obj) * (2 if isinstance(obj, dict) else 1)
+            sample = children[:max(1, max_items // 10)]
+            # Each sampled child stands in for its share of the unsampled ones
+            child_weight = weight * size / len(sample)
+            queue.extend((child, child_weight) for child in sample)
+    return int(total)
+
+
+def _format_bytes(size: float) -> str:
+    return f"{size / 1024 ** 2:.1f} MB" if size >= 1024 ** 2 else f"{size / 1024:.1f} KB"
 
 
 class PersistentPythonREPLTool:
     """A persistent Python REPL that maintains state across executions."""
     
-    def __init__(self):
-        """Initialize the persistent Python REPL with a global namespace."""
+    def __init__(
+        self,
+        max_namespace_bytes: Optional[int] = None,
+        max_object_bytes: Optional[int] = None,
+        stale_after_s: Optional[float] = None,
+        max_run_s: Optional[float] = None,
+    ):
+        """Initialize the persistent Python REPL with a global namespace.
+        
+        Args:
+            max_namespace_bytes: Evict least recently used data once user variables exceed this (None: no limit)
+            max_object_bytes: Evict any single variable larger than this (None: no limit)
+            stale_after_s: Evict data variables not used for this long (None: never)
+            max_run_s: Interrupt an execution running longer than this (None: no limit)
+        """
+        self.max_namespace_bytes = max_namespace_bytes
+        self.max_object_bytes = max_object_bytes
+        self.stale_after_s = stale_after_s
+        self.max_run_s = max_run_s
+        # Executions of one session run one at a time; different sessions run concurrently.
+        self._lock = threading.RLock()
+        self._init_namespace()
+    
+    def _init_namespace(self) -> None:
         self.global_namespace: Dict[str, Any] = {
             "__name__": "__main__",
             "__doc__": None,
             "__builtins__": __builtins__,
         }
+        # Name -> last time it was assigned or referenced by executed code
+        self._last_used: Dict[str, float] = {}
         # Import commonly used modules into the namespace
-        exec("import sys, os, math, random, json, datetime", self.global_namespace)
+        exec(f"import {', '.join(_PRELOADED)}", self.global_namespace)
     
-    def execute(self, code: str) -> str:
+    def execute(
+        self,
+        code: str,
+        mode: str = "run",
+        report_extra: Optional[Dict[str, Any]] = None,
+        growth_call: str = "",
+    ) -> str:
         """Execute Python code in the persistent namespace.
         
         Args:
             code (str): Python code to execute.
+            mode (str): "run", "profile" to also report the hottest lines, or
+                "memory" to also report peak memory and allocation sites.
+            report_extra: Fields added to the profile report (e.g. the snapshot ID)
+            growth_call (str): Memory mode: expression using ``n`` whose peak memory
+                is measured at doubling sizes of n after the code has run.
             
         Returns:
             str: Output from the code execution including any errors.
@@ -31,11 +242,27 @@ class PersistentPythonREPLTool:
         # Capture stdout and stderr
         stdout_capture = io.StringIO()
         stderr_capture = io.StringIO()
+        profiler = None
+        if mode == "profile":
+            profiler = LineProfiler()
+        elif mode == "memory":
+            profiler = MemoryProfiler()
         
         try:
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                # Execute the code in the persistent namespace
-                exec(code, self.global_namespace)
+            with self._lock, _capture_thread_output(stdout_capture, stderr_capture), _time_limit(self.max_run_s):
+                # Execute the code in the persistent namespace (parsed and compiled once per source)
+                compiled = get_code_artifact(code).compiled or compile(code, USER_FILENAME, "exec")
+                if isinstance(profiler, LineProfiler):
+                    with profiler:
+                        exec(compiled, self.global_namespace)
+                elif isinstance(profiler, MemoryProfiler):
+                    self._execute_memory_profiled(profiler, compiled, growth_call)
+                else:
+                    exec(compiled, self.global_namespace)
+        except ExecutionTimeout:
+            stderr_capture.write(
+                f"ExecutionTimeout: stopped after {self.max_run_s:g}s (infinite loop, or too slow for this input?)\n"
+            )
         except Exception as e:
             # Capture the full traceback
             error_output = traceback.format_exc()
@@ -54,15 +281,124 @@ class PersistentPythonREPLTool:
                 output += "\n"
             output += stderr_output
         
+        if profiler is not None:
+            if output:
+                output += "\n"
+            output += format_profile({**profiler.report(code), **(report_extra or {})})
+        
+        self._touch(code)
+        evicted = self.evict()
+        if evicted:
+            if output:
+                output += "\n"
+            output += "⚠️ Freed REPL memory by deleting: " + "; ".join(evicted)
+        
         return output if output else "Code executed successfully (no output)"
     
+    @contextmanager
+    def captured_output(self, time_limit_s: Optional[float] = None) -> Iterator[io.StringIO]:
+        """
+        Hold the session's execution lock and capture stdout/stderr while calling namespace functions directly.
+        
+        Args:
+            time_limit_s: Raise ExecutionTimeout in the block after this long (default: ``max_run_s``)
+        
+        Raises:
+            ExecutionTimeout: If the block runs past the time limit
+        """
+        capture = io.StringIO()
+        with self._lock, _capture_thread_output(capture, capture), _time_limit(time_limit_s or self.max_run_s):
+            yield capture
+    
+    def lookup_callable(self, name: str) -> Optional[Callable[..., Any]]:
+        """Return the namespace function (or builtin) called ``name``, or None."""
+        value = self.global_namespace.get(name, getattr(builtins, name, None))
+        return value if callable(value) else None
+    
+    def compile_lambda(self, params: str, expression: str, filename: str) -> Callable[..., Any]:
+        """
+        Turn an expression into a function of ``params`` that sees the namespace as its globals.
+        
+        Unlike eval() with a separate locals dict, the parameters are also
+        visible inside comprehensions, e.g. ``[i for i in range(n)]``.
+        
+        Raises:
+            SyntaxError: If the expression does not compile
+        """
+        return eval(compile(f"lambda {params}: ({expression}\n)", filename, "eval"), self.global_namespace)
+    
+    def _execute_memory_profiled(self, profiler: MemoryProfiler, compiled, growth_call: str) -> None:
+        with _memory_profile_lock, profiler.tracing():
+            profiler.measure(lambda: exec(compiled, self.global_namespace))
+            if growth_call.strip():
+                profiler.measure_growth(
+                    self.compile_lambda("n", growth_call, "<growth_call>"),
+                    max_bytes=self.max_object_bytes or 32 * 1024 ** 2,
+                )
+    
+    def _user_vars(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.global_namespace.items()
+                if not k.startswith('_') and k not in _PRELOADED}
+    
+    def _touch(self, code: str) -> None:
+        """Mark variables assigned or referenced by the executed code as recently used."""
+        now = time.monotonic()
+        names = get_code_artifact(code).names
+        for name in self._user_vars():
+            if name in names or name not in self._last_used:
+                self._last_used[name] = now
+        for name in list(self._last_used):
+            if name not in self.global_namespace:
+                del self._last_used[name]
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Return the estimated size in bytes of each user data variable."""
+        return {
+            name: estimate_size(value) for name, value in self._user_vars().items()
+            if not callable(value) and not isinstance(value, types.ModuleType)
+        }
+    
+    def evict(self) -> List[str]:
+        """
+        Delete oversized, stale, then least recently used data variables per the limits.
+        
+        Functions, classes and modules are never evicted.
+        
+        Returns:
+            List[str]: One description per deleted variable (empty if none)
+        """
+        if self.max_namespace_bytes is None and self.max_object_bytes is None and self.stale_after_s is None:
+            return []
+        sizes = self.memory_usage()
+        now = time.monotonic()
+        evicted = []
+        
+        def drop(name: str, reason: str) -> None:
+            del self.global_namespace[name]
+            self._last_used.pop(name, None)
+            evicted.append(f"`{name}` ({_format_bytes(sizes.pop(name))}, {reason})")
+        
+        for name, size in list(sizes.items()):
+            if self.max_object_bytes is not None and size > self.max_object_bytes:
+                drop(name, f"over the {_format_bytes(self.max_object_bytes)} per-variable limit")
+            elif self.stale_after_s is not None and now - self._last_used.get(name, now) > self.stale_after_s:
+                drop(name, f"unused for over {self.stale_after_s / 60:.0f} min")
+        if self.max_namespace_bytes is not None:
+            for name in sorted(sizes, key=lambda n: self._last_used.get(n, 0.0)):
+                if sum(sizes.values()) <= self.max_namespace_bytes:
+                    break
+                drop(name, f"session over its {_format_bytes(self.max_namespace_bytes)} memory limit")
+        if evicted:
+            print(f"🧹 REPL eviction: {'; '.join(evicted)}")
+        return evicted
+    
     def reset(self) -> str:
         """Reset the persistent namespace to initial state.
         
         Returns:
             str: Confirmation message.
         """
-        self.__init__()
+        self._init_namespace()
         return "Python REPL namespace has been reset."
     
     def get_namespace_info(self) -> str:
@@ -71,33 +407,110 @@ class PersistentPythonREPLTool:
         Returns:
             str: Information about variables and functions in the namespace.
         """
-        user_vars = {k: v for k, v in self.global_namespace.items() 
-                    if not k.startswith('_') and k not in ['sys', 'os', 'math', 'random', 'json', 'datetime']}
+        user_vars = self._user_vars()
         
         if not user_vars:
             return "No user-defined variables in namespace."
         
-        info = "Current namespace variables:\n"
+        sizes = self.memory_usage()
+        info = f"Current namespace variables (~{_format_bytes(sum(sizes.values()))} of data):\n"
         for name, value in user_vars.items():
-            value_type = type(value).__name__
-            if callable(value):
-                info += f"  {name}: {value_type}\n"
+            if callable(value) or isinstance(value, types.ModuleType):
+                info += f"  {name}: {type(value).__name__}\n"
             else:
-                # Truncate long values
-                value_str = str(value)
-                if len(value_str) > 50:
-                    value_str = value_str[:50] + "..."
-                info += f"  {name}: {value_type} = {value_str}\n"
+                info += f"  {name}: {preview(value)} (~{_format_bytes(sizes[name])})\n"
         
         return info
 
 
-# Create a global instance for persistence
-_persistent_repl = PersistentPythonREPLTool()
+class REPLPool:
+    """Persistent REPLs keyed by session, shared by every frontend in the process."""
+    
+    def __init__(self, max_sessions: int = 64, **repl_limits):
+        """
+        Initialize the pool.
+        
+        Args:
+            max_sessions: REPLs kept alive; the least recently used is dropped beyond this
+            repl_limits: Memory limits passed to each PersistentPythonREPLTool
+        """
+        self.max_sessions = max_sessions
+        self.repl_limits = repl_limits
+        self._repls: "OrderedDict[str, PersistentPythonREPLTool]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, session_id: str) -> PersistentPythonREPLTool:
+        """Return the REPL for a session, creating it if needed."""
+        with self._lock:
+            repl = self._repls.get(session_id)
+            if repl is None:
+                repl = self._repls[session_id] = PersistentPythonREPLTool(**self.repl_limits)
+                while len(self._repls) > self.max_sessions:
+                    self._repls.popitem(last=False)
+            self._repls.move_to_end(session_id)
+            return repl
+    
+    def peek(self, session_id: str) -> Optional[PersistentPythonREPLTool]:
+        """Return the REPL for a session if it exists, without creating it or marking it used."""
+        with self._lock:
+            return self._repls.get(session_id)
+    
+    def drop(self, session_id: str) -> None:
+        """Discard a session's REPL."""
+        with self._lock:
+            self._repls.pop(session_id, None)
+    
+    def __len__(self) -> int:
+        return len(self._repls)
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Return the estimated bytes of user data held by each session's REPL."""
+        with self._lock:
+            repls = list(self._repls.items())
+        return {session_id: sum(repl.memory_usage().values()) for session_id, repl in repls}
+
+
+_repl_pool = None
+
+
+def get_repl_pool() -> REPLPool:
+    global _repl_pool
+    if _repl_pool is None:
+        from config.settings import get_settings
+        
+        settings = get_settings()
+        _repl_pool = REPLPool(
+            max_namespace_bytes=int(settings.repl_namespace_max_mb * 1024 ** 2),
+            max_object_bytes=int(settings.repl_object_max_mb * 1024 ** 2),
+            stale_after_s=settings.repl_stale_after_s or None,
+            max_run_s=settings.repl_max_run_s or None,
+        )
+    return _repl_pool
+
+
+def _repl_for(config: RunnableConfig) -> PersistentPythonREPLTool:
+    """Pick the caller's REPL from the graph config (session_id, else thread_id)."""
+    return get_repl_pool().get(session_key(config))
 
 
-@tool("python_repl", description="Execute Python code in a persistent REPL environment")
-def python_repl(code: str) -> str:
+@tool(
+    "python_repl",
+    description=(
+        "Execute Python code in a persistent REPL environment. Pass snapshot_id to run a "
+        "submitted code snapshot first; code then runs after it (e.g. test cases). "
+        "mode='profile' also measures the hottest lines (hits, ms, % of run time); mode='memory' "
+        "measures peak memory and allocation sites, and with growth_call (an expression using n, "
+        "e.g. solve(list(range(n)))) how peak memory grows with n."
+    ),
+)
+def python_repl(
+    config: RunnableConfig,
+    code: str = "",
+    snapshot_id: str = "",
+    mode: Literal["run", "profile", "memory"] = "run",
+    growth_call: str = "",
+    state: Annotated[dict, InjectedState] = None,
+) -> str:
     """Execute Python code in a persistent REPL environment.
     
     This tool maintains state across multiple executions, allowing for
@@ -106,28 +519,38 @@ def python_repl(code: str) -> str:
     
     Args:
         code (str): Python code to execute.
+        snapshot_id (str): ID of a submitted code snapshot to run before ``code``.
+        mode (str): "run", "profile" to append a line profile of the execution, or
+            "memory" to append peak memory and allocation sites.
+        growth_call (str): Memory mode: expression using ``n`` measured at doubling sizes.
         
     Returns:
         str: Output from the code execution including any errors.
     """
-    return _persistent_repl.execute(code)
+    try:
+        code = code_from_args(code, snapshot_id, state)
+    except ValueError as e:
+        return str(e)
+    # Line numbers match the snapshot, which runs first; the UI highlights them in the editor
+    report_extra = {"snapshot": snapshot_id.strip().strip("`")} if snapshot_id.strip() else None
+    return _repl_for(config).execute(code, mode=mode, report_extra=report_extra, growth_call=growth_call)
 
 
 @tool("python_repl_reset", description="Reset the Python REPL environment")
-def python_repl_reset() -> str:
+def python_repl_reset(config: RunnableConfig) -> str:
     """Reset the Python REPL environment to initial state.
     
     Returns:
         str: Confirmation message.
     """
-    return _persistent_repl.reset()
+    return _repl_for(config).reset()
 
 
 @tool("python_repl_info", description="Get information about the current Python REPL namespace")
-def python_repl_info() -> str:
+def python_repl_info(config: RunnableConfig) -> str:
     """Get information about the current Python REPL namespace.
     
     Returns:
         str: Information about variables and functions in the namespace.
     """
-    return _persistent_repl.get_namespace_info()
+    return _repl_for(config).get_namespace_info()
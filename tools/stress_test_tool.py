@@ -0,0 +1,106 @@
+import json
+from typing import Annotated, List
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+
+from analysis.code_artifact import get_code_artifact
+from analysis.stress import ArgSpec, make_checker, run_stress_test
+from config.settings import get_settings
+from session.snapshots import code_from_args
+from tools.persistent_python_repl import ExecutionTimeout, _repl_for
+
+_MAX_CASES = 100_000
+
+
+@tool(
+    "stress_test",
+    description=(
+        "Stress-test a function with thousands of random inputs built from specs (one per positional "
+        "argument: ints, int lists with value ranges/order/uniqueness, strings, graphs as adjacency lists). "
+        "Checks each result against a reference function and/or property_expr (a boolean expression "
+        "using args and result, e.g. result == sorted(args[0])). Stops at the first failure and shrinks "
+        "it to a minimal counterexample. Define the functions with code or snapshot_id first."
+    ),
+)
+def stress_test(
+    function: str,
+    specs: List[ArgSpec],
+    config: RunnableConfig,
+    reference: str = "",
+    property_expr: str = "",
+    code: str = "",
+    snapshot_id: str = "",
+    max_cases: int = 5000,
+    seed: int = 0,
+    state: Annotated[dict, InjectedState] = None,
+) -> str:
+    """Run randomized cases against a function in the session's sandbox.
+
+    Args:
+        function (str): Name of the function under test.
+        specs (List[ArgSpec]): How to generate each positional argument.
+        reference (str): Name of a trusted function to compare results with.
+        property_expr (str): Boolean expression over ``args`` and ``result`` every case must satisfy.
+        code (str): Code defining the functions (runs after the snapshot, if any).
+        snapshot_id (str): ID of a submitted code snapshot to run first.
+        max_cases (int): Cases to try at most.
+        seed (int): Random seed; rerun with the same seed to reproduce a failure.
+
+    Returns:
+        str: A one-line summary followed by the compact JSON report.
+    """
+    if not reference and not property_expr:
+        return "Give a reference function or a property_expr to check results against."
+    try:
+        code = code_from_args(code, snapshot_id, state)
+    except ValueError as e:
+        return str(e)
+
+    repl = _repl_for(config)
+    setup_output = repl.execute(code) if code.strip() else ""
+    missing = [name for name in (function, reference) if name and repl.lookup_callable(name) is None]
+    if missing:
+        defined = get_code_artifact(code).signatures
+        hint = f" (the code defines {', '.join(defined)})" if defined else ""
+        return f"Not defined as functions: {', '.join(missing)}{hint}\n{setup_output}".strip()
+    prop = None
+    if property_expr:
+        try:
+            prop = repl.compile_lambda("args, result", property_expr, "<property_expr>")
+        except SyntaxError as e:
+            return f"Invalid property_expr: {e}"
+
+    check = make_checker(
+        repl.lookup_callable(function), repl.lookup_callable(reference) if reference else None, prop
+    )
+
+    def run_batch(run):
+        # Hold the sandbox only per batch, so other sessions' code can interleave
+        with repl.captured_output():
+            return run()
+
+    try:
+        report = run_stress_test(
+            check,
+            specs,
+            max_cases=max(1, min(max_cases, _MAX_CASES)),
+            time_budget_s=get_settings().stress_time_budget_s,
+            seed=seed,
+            run_batch=run_batch,
+        )
+    except ExecutionTimeout:
+        return f"Stress test stopped: a batch of cases ran past {repl.max_run_s:g}s (infinite loop?)"
+    except Exception as e:
+        return f"Stress test failed to run (check the reference and property_expr): {type(e).__name__}: {e}"
+
+    if report["passed"]:
+        summary = f"✅ {report['cases']} random cases passed ({report['cases_per_s']:,} cases/s, seed {seed})"
+    else:
+        failure = report["failure"]
+        summary = (
+            f"❌ {failure['kind']} after {report['cases']} cases ({report['cases_per_s']:,} cases/s, seed {seed}); "
+            f"minimal counterexample: {function}{failure['args']}"
+        )
+    return summary + "\n" + json.dumps(report, separators=(",", ":"))
@@ -1,5 +1,12 @@
 from langchain_core.tools import tool
+from analysis.cache import get_result_cache
 from models.llm import get_llm
+from models.prompt_cache import PromptPrefix, invoke_with_prefix
+
+TEST_CASE_PREFIX = PromptPrefix(
+    "test_case",
+    "Create 3 test cases for this DSA problem without solving it.",
+)
 
 
 @tool("generate_test_cases", description="Generate test cases for DSA problems without solving them.")
@@ -12,9 +19,15 @@ def generate_test_cases(problem_description: str) -> str:
     Returns:
         str: Generated test cases for the problem.
     """
-    llm = get_llm()
+    # Same problem (ignoring whitespace/case) -> same cached cases, including
+    # ones generated speculatively while the user was typing.
+    cache_key = ("test_cases", " ".join(problem_description.split()).lower())
+    return get_result_cache().get_or_compute(cache_key, lambda: _generate_test_cases(problem_description))
+
+
+def _generate_test_cases(problem_description: str) -> str:
+    llm = get_llm("test_case")
     
-    prompt = f"Create 3 test cases for this DSA problem without solving it: {problem_description}"
-    response = llm.invoke(prompt)
+    response = invoke_with_prefix(llm, TEST_CASE_PREFIX, f"Problem: {problem_description}")
     
     return response.content
@@ -2,12 +2,18 @@ from .hint_tool import generate_hint
 from .test_case_tool import generate_test_cases
 from .complexity_analyzer import complexity_analyzer
 from .persistent_python_repl import python_repl
+from .artifact_tool import retrieve_artifact
+from .benchmark_tool import benchmark_solutions
+from .stress_test_tool import stress_test
 
 ALL_TOOLS = [
     generate_hint,
     generate_test_cases,
     complexity_analyzer,
     python_repl,
+    retrieve_artifact,
+    benchmark_solutions,
+    stress_test,
 ]
 
 def get_all_tools():
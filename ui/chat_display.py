@@ -1,6 +1,19 @@
+import html
 import streamlit as st
-from typing import List, Dict, Any
+from typing import Iterable, Dict, Any
 from datetime import datetime
+from analysis.benchmark import chart_data
+
+# Internal tool names -> names shown in the chat's tool notices.
+TOOL_DISPLAY_NAMES = {
+    'python_repl': 'Code Executor',
+    'generate_hint': 'Hint Generator',
+    'complexity_analyzer': 'Complexity Analyzer',
+    'generate_test_cases': 'Test Case Generator',
+    'benchmark_solutions': 'Benchmark',
+    'stress_test': 'Stress Tester',
+    'persistent_python_repl': 'Code Executor'
+}
 
 
 class ChatDisplay:
@@ -11,19 +24,20 @@ class ChatDisplay:
         self.user_avatar = "👤"
         self.assistant_avatar = "🤖"
         
-    def render_messages(self, messages: List[Dict[str, Any]]) -> None:
+    def render_messages(self, messages: Iterable[Dict[str, Any]]) -> None:
         """
-        Render a list of chat messages with proper styling.
+        Render chat messages with proper styling.
         
         Args:
-            messages: List of message dictionaries with 'role' and 'content' keys
+            messages: Message dictionaries with 'role' and 'content' keys (e.g. a message log projection)
         """
-        if not messages:
-            self._render_empty_state()
-            return
-            
+        rendered = False
         for message in messages:
             self._render_message(message)
+            rendered = True
+        
+        if not rendered:
+            self._render_empty_state()
     
     def _render_empty_state(self) -> None:
         """Render the empty chat state."""
@@ -38,10 +52,17 @@ class ChatDisplay:
         """
         role = message.get("role", "user")
         content = message.get("content", "")
+        if message.get("tool_name"):
+            content = f"🔧 Using {TOOL_DISPLAY_NAMES.get(message['tool_name'], message['tool_name'])}..."
         timestamp = message.get("timestamp", datetime.now().strftime("%H:%M"))
         is_tool_result = message.get("tool_result", False)
         
-        if role == "user":
+        if message.get("benchmark"):
+            self._render_benchmark(message["benchmark"])
+        
+        if message.get("complexity"):
+            self._render_complexity_message(message["complexity"], content, timestamp)
+        elif role == "user":
             self._render_user_message(content, timestamp)
         elif role == "assistant":
             if is_tool_result:
@@ -84,43 +105,65 @@ class ChatDisplay:
         elif not isinstance(content, str):
             content = str(content)
         
-        # Check if this is a complexity analysis or structured output
-        if "complexity" in content.lower() or "time complexity" in content.lower():
-            self._render_structured_message(content, timestamp, "📊 Complexity Analysis")
-        else:
-            st.markdown(
-                f"""
+        st.markdown(
+            f"""
+            <div style="
+                display: flex;
+                justify-content: flex-start;
+                margin: 8px 0;
+            ">
                 <div style="
-                    display: flex;
-                    justify-content: flex-start;
-                    margin: 8px 0;
+                    background-color: #f8f9fa;
+                    color: #212529;
+                    padding: 8px 12px;
+                    border-radius: 12px;
+                    max-width: 75%;
+                    box-shadow: 0 1px 4px rgba(0,0,0,0.08);
+                    border: 1px solid #e9ecef;
                 ">
-                    <div style="
-                        background-color: #f8f9fa;
-                        color: #212529;
-                        padding: 8px 12px;
-                        border-radius: 12px;
-                        max-width: 75%;
-                        box-shadow: 0 1px 4px rgba(0,0,0,0.08);
-                        border: 1px solid #e9ecef;
-                    ">
-                        <div style="display: flex; align-items: center; margin-bottom: 4px;">
-                            <span style="font-size: 14px; margin-right: 6px;">{self.assistant_avatar}</span>
-                            <span style="font-weight: 600; color: #495057; font-size: 13px;">Assistant</span>
-                            <span style="font-size: 10px; color: #6c757d; margin-left: auto;">{timestamp}</span>
-                        </div>
-                        <div style="font-size: 13px; line-height: 1.4;">{content}</div>
+                    <div style="display: flex; align-items: center; margin-bottom: 4px;">
+                        <span style="font-size: 14px; margin-right: 6px;">{self.assistant_avatar}</span>
+                        <span style="font-weight: 600; color: #495057; font-size: 13px;">Assistant</span>
+                        <span style="font-size: 10px; color: #6c757d; margin-left: auto;">{timestamp}</span>
                     </div>
+                    <div style="font-size: 13px; line-height: 1.4;">{content}</div>
                 </div>
-                """,
-                unsafe_allow_html=True
-            )
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
     
-    def _render_structured_message(self, content: str, timestamp: str, title: str) -> None:
-        """Render a structured message like complexity analysis with proper formatting."""
-        # Format content for better display
-        formatted_content = self._format_analysis_content(content)
+    def _render_complexity_message(self, data: Dict[str, Any], content: str, timestamp: str) -> None:
+        """
+        Render a structured complexity result as a card, followed by any assistant prose.
+        
+        Args:
+            data: Complexity result (time, space, approach, hotspots, suggestions, confidence, source)
+            content: Assistant text sent alongside the result (may be empty)
+            timestamp: Message timestamp
+        """
+        badge = (
+            '<span style="background-color: #e3f2fd; padding: 2px 6px; border-radius: 3px; '
+            'font-family: monospace; color: #1976d2;"><strong>{}</strong></span>'
+        )
+        rows = [
+            f"<div><strong>Time:</strong> {badge.format(html.escape(data['time']))}"
+            f" &nbsp; <strong>Space:</strong> {badge.format(html.escape(data['space']))}</div>"
+        ]
+        if data.get("approach"):
+            rows.append(f"<div style=\"margin-top: 6px;\">{html.escape(data['approach'])}</div>")
+        if data.get("hotspots"):
+            items = "".join(
+                f"<li>{'Line ' + str(h['line']) + ': ' if h.get('line') else ''}{html.escape(h['note'])} "
+                f"{badge.format(html.escape(h['cost']))}</li>"
+                for h in data["hotspots"]
+            )
+            rows.append(f"<div style=\"margin-top: 6px;\"><strong>Hotspots</strong><ul style=\"margin: 2px 0;\">{items}</ul></div>")
+        if data.get("suggestions"):
+            items = "".join(f"<li>{html.escape(suggestion)}</li>" for suggestion in data["suggestions"])
+            rows.append(f"<div style=\"margin-top: 6px;\"><strong>Suggestions</strong><ul style=\"margin: 2px 0;\">{items}</ul></div>")
         
+        source = "Local static analysis" if data.get("source") == "static" else "Model analysis"
         st.markdown(
             f"""
             <div style="
@@ -140,47 +183,40 @@ class ChatDisplay:
                 ">
                     <div style="display: flex; align-items: center; margin-bottom: 12px;">
                         <span style="font-size: 16px; margin-right: 8px;">{self.assistant_avatar}</span>
-                        <span style="font-weight: 600; color: #495057;">{title}</span>
+                        <span style="font-weight: 600; color: #495057;">📊 Complexity Analysis</span>
+                    </div>
+                    <div style="font-size: 14px; line-height: 1.6;">{"".join(rows)}</div>
+                    <div style="font-size: 11px; color: #6c757d; margin-top: 8px;">
+                        {source} · confidence: {html.escape(str(data.get("confidence", "")))} · {timestamp}
                     </div>
-                    <div style="font-size: 14px; line-height: 1.6;">{formatted_content}</div>
-                    <div style="font-size: 11px; color: #6c757d; margin-top: 8px;">{timestamp}</div>
                 </div>
             </div>
             """,
             unsafe_allow_html=True
         )
+        if content:
+            self._render_assistant_message(content, timestamp)
     
-    def _format_analysis_content(self, content: str) -> str:
-        """Format analysis content for better readability."""
-        import re
-        import html
-        
-        # Ensure content is a string
-        if isinstance(content, list):
-            content = "\n".join(str(item) for item in content)
-        elif not isinstance(content, str):
-            content = str(content)
-        
-        # Escape HTML to prevent rendering issues
-        content = html.escape(content)
-        
-        # Convert markdown-style headers to HTML
-        content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-        
-        # Format bullet points
-        content = re.sub(r'^- ', r'• ', content, flags=re.MULTILINE)
-        content = re.sub(r'^(\d+)\.\s', r'• ', content, flags=re.MULTILINE)
-        
-        # Format O() notation with highlighting
-        content = re.sub(r'O\(([^)]+)\)', r'<span style="background-color: #e3f2fd; padding: 2px 4px; border-radius: 3px; font-family: monospace; color: #1976d2;"><strong>O(\1)</strong></span>', content)
-        
-        # Format code blocks
-        content = re.sub(r'```(.*?)```', r'<div style="background-color: #f5f5f5; padding: 8px; border-radius: 4px; margin: 4px 0; font-family: monospace; border-left: 3px solid #2196f3;">\1</div>', content, flags=re.DOTALL)
-        
-        # Add line breaks for better spacing
-        content = re.sub(r'\n', '<br>', content)
+    def _render_benchmark(self, data: Dict[str, Any]) -> None:
+        """
+        Render a benchmark result as a median-time table and a scaling chart.
         
-        return content.strip()
+        Args:
+            data: Benchmark report (variants, sizes, results, agree, mismatches)
+        """
+        with st.container(border=True):
+            st.markdown("**⏱️ Benchmark** · median ms per call")
+            series = chart_data(data)
+            table = {
+                name: [series[name].get(n) for n in data["sizes"]] for name in data["variants"]
+            }
+            st.dataframe({"n": data["sizes"], **table}, hide_index=True, use_container_width=True)
+            if len(data["sizes"]) > 1:
+                st.line_chart({"n": data["sizes"], **table}, x="n")
+            if data.get("agree"):
+                st.caption("✅ All variants returned the same results")
+            else:
+                st.caption("⚠️ Variants returned different results")
     
     def _render_system_message(self, content: str, timestamp: str) -> None:
         """Render a system message."""
@@ -22,10 +22,6 @@ class ChatInput:
         Returns:
             The submitted message if any, None otherwise
         """
-        # Initialize session state if needed
-        if "messages" not in st.session_state:
-            st.session_state.messages = []
-        
         # Create input form
         with st.form(key="chat_input_form", clear_on_submit=True):
             col1, col2 = st.columns([4, 1])
@@ -77,7 +73,7 @@ class ChatInput:
             ]
         
         # Display examples with better styling
-        if not st.session_state.get("messages", []):
+        if not st.session_state.get("message_log"):
             st.markdown("<h4 style='margin-bottom: 10px;'>💡 Try these examples:</h4>", unsafe_allow_html=True)
             
             # Use 2x2 grid for better layout
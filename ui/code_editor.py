@@ -1,18 +1,32 @@
 import streamlit as st
-from typing import Optional, Callable
+from typing import Dict, Optional, Callable, Tuple
+from analysis.profiling import hot_lines
+from session.snapshots import snapshot_id
 
 
 class CodeEditor:
     """Component for code input, execution, and analysis."""
     
-    def __init__(self, on_run_code: Optional[Callable[[str], None]] = None):
+    def __init__(
+        self,
+        on_run_code: Optional[Callable[[str], None]] = None,
+        on_code_change: Optional[Callable[[str], None]] = None,
+        use_component: bool = True,
+        sync_debounce_ms: int = 1000,
+    ):
         """
         Initialize the code editor component.
         
         Args:
             on_run_code: Optional callback function to handle code execution
+            on_code_change: Optional callback invoked with the new code whenever it is edited
+            use_component: Edit in the browser-side editor component instead of st.text_area
+            sync_debounce_ms: Idle time before the editor component syncs edits to the server
         """
         self.on_run_code = on_run_code
+        self.on_code_change = on_code_change
+        self.use_component = use_component
+        self.sync_debounce_ms = sync_debounce_ms
         self.default_code = '''def two_sum(nums, target):
     """
     Given an array of integers nums and an integer target,
@@ -31,6 +45,12 @@ print(f"Result: {result}")'''
         """
         Render the code editor with run button.
         
+        Meant to run inside a fragment: Clear, Example and template actions
+        update the editor from widget callbacks, so they cost a single
+        fragment rerun and no explicit st.rerun(). With the editor component,
+        typing costs no reruns at all; the server sees the code after an idle
+        pause, when the editor loses focus (e.g. clicking Run) or on Ctrl+Enter.
+        
         Returns:
             The code to execute if run button was clicked, None otherwise
         """
@@ -38,19 +58,32 @@ print(f"Result: {result}")'''
         if "current_code" not in st.session_state:
             st.session_state.current_code = self.default_code
         
-        # Code input area (full width) - good readability height
-        code = st.text_area(
-            "Write your algorithm here:",
-            value=st.session_state.current_code,
-            height=400,  # Fixed height for better readability
-            key="code_editor",
-            help="Write your Python code here. Click 'Run & Analyze' to execute and get AI feedback.",
-            placeholder="def solution():\n    # Your code here\n    pass"
-        )
+        if self.use_component:
+            code, run_requested = self._render_component()
+        else:
+            code, run_requested = self._render_text_area(), False
         
         # Update session state
         st.session_state.current_code = code
         
+        hot = self._hot_lines()
+        if hot:
+            st.caption("🔥 Hot lines (measured): " + " · ".join(f"L{line} {pct:.0f}%" for line, pct in hot.items()))
+        memory = self._profile_for_code("memory_profile")
+        if memory:
+            summary = f"🧠 Peak memory: {memory['peak_kb']:,.0f} KB"
+            if memory.get("growth_exponent"):
+                summary += f" · grows ~n^{memory['growth_exponent']:g}"
+            if memory.get("stopped"):
+                summary += f" · stopped early: {memory['stopped']}"
+            st.caption(summary)
+        
+        # Notify listeners (e.g. speculative pre-analysis) about edits and loaded templates
+        if code.strip() and code != st.session_state.get("last_notified_code"):
+            st.session_state.last_notified_code = code
+            if self.on_code_change:
+                self.on_code_change(code.strip())
+        
         # Action buttons row
         col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
         
@@ -70,7 +103,7 @@ print(f"Result: {result}")'''
                     use_container_width=True,
                     help="Execute code, analyze complexity, and get AI feedback",
                     key="run_analyze_btn"
-                ):
+                ) or run_requested:
                     if code.strip():
                         # Call the callback if provided
                         if self.on_run_code:
@@ -78,33 +111,93 @@ print(f"Result: {result}")'''
                         return code.strip()
         
         with col2:
-            if st.button("🗑️ Clear", use_container_width=True, help="Clear the editor"):
-                st.session_state.current_code = ""
-                st.rerun()
+            st.button("🗑️ Clear", use_container_width=True, help="Clear the editor",
+                      on_click=self._load_code, args=("",))
         
         with col3:
-            if st.button("📝 Example", use_container_width=True, help="Load example"):
-                st.session_state.current_code = self.default_code
-                st.rerun()
+            st.button("📝 Example", use_container_width=True, help="Load example",
+                      on_click=self._load_code, args=(self.default_code,))
         
         with col4:
             # Template dropdown
             template_options = ["Select Template", "Two Sum", "Binary Search", "DFS", "BFS", "Dynamic Programming"]
-            selected_template = st.selectbox(
+            st.selectbox(
                 "Templates",
                 template_options,
                 key="code_template_select",
-                label_visibility="collapsed"
+                label_visibility="collapsed",
+                on_change=self._load_template,
             )
-            
-            if selected_template != "Select Template":
-                template_code = self._get_template_code(selected_template)
-                if template_code:
-                    st.session_state.current_code = template_code
-                    st.rerun()
         
         return None
     
+    def _render_component(self) -> Tuple[str, bool]:
+        """Render the browser-side editor; return its last synced code and whether Ctrl+Enter asked to run it."""
+        from ui.editor_component import code_editor
+        
+        if "code_editor_version" not in st.session_state:
+            st.session_state.code_editor_version = 0
+        version = st.session_state.code_editor_version
+        
+        value = code_editor(
+            st.session_state.current_code,
+            version=version,
+            key="code_editor_component",
+            debounce_ms=self.sync_debounce_ms,
+            height=400,
+            placeholder="def solution():\n    # Your code here\n    pass",
+            highlights=self._hot_lines(),
+        )
+        
+        # Ignore syncs of contents that a Clear/Example/template load has since replaced
+        if not value or value.get("version") != version:
+            return st.session_state.current_code, False
+        
+        run_nonce = value.get("run") or 0
+        run_requested = run_nonce != st.session_state.get("code_editor_run_nonce", 0)
+        st.session_state.code_editor_run_nonce = run_nonce
+        return value["code"], run_requested
+    
+    def _profile_for_code(self, state_key: str) -> Optional[dict]:
+        """The last profile stored under ``state_key``, if it was taken of the code now in the editor."""
+        profile = st.session_state.get(state_key)
+        if not profile or profile.get("snapshot") != snapshot_id(st.session_state.current_code.strip()):
+            return None
+        return profile
+    
+    def _hot_lines(self) -> Dict[int, float]:
+        """Hot lines of the last line profile of the code now in the editor."""
+        return hot_lines(self._profile_for_code("code_profile"))
+    
+    def _render_text_area(self) -> str:
+        """Render the plain st.text_area editor, which reruns on every committed edit."""
+        # The widget state is the source of truth; actions update it from callbacks
+        if "code_editor" not in st.session_state:
+            st.session_state.code_editor = st.session_state.current_code
+        
+        # Code input area (full width) - good readability height
+        return st.text_area(
+            "Write your algorithm here:",
+            height=400,  # Fixed height for better readability
+            key="code_editor",
+            help="Write your Python code here. Click 'Run & Analyze' to execute and get AI feedback.",
+            placeholder="def solution():\n    # Your code here\n    pass"
+        )
+    
+    def _load_code(self, code: str) -> None:
+        """Widget callback: replace the editor contents."""
+        st.session_state.current_code = code
+        st.session_state.code_editor = code
+        # Makes the editor component adopt the new contents
+        st.session_state.code_editor_version = st.session_state.get("code_editor_version", 0) + 1
+    
+    def _load_template(self) -> None:
+        """Selectbox callback: load the chosen template and reset the selection."""
+        template_code = self._get_template_code(st.session_state.code_template_select)
+        if template_code:
+            self._load_code(template_code)
+        st.session_state.code_template_select = "Select Template"
+    
     def _get_template_code(self, template_name: str) -> str:
         """Get code template by name."""
         templates = {
@@ -163,7 +256,7 @@ def bfs(graph, start):
         Args:
             code: The code to set in the editor
         """
-        st.session_state.current_code = code
+        self._load_code(code)
     
     def get_code(self) -> str:
         """
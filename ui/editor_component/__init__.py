@@ -0,0 +1,50 @@
+import os
+from typing import Any, Dict, Optional
+
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+
+_component = components.declare_component("dsa_code_editor", path=_FRONTEND_DIR)
+
+
+def code_editor(
+    code: str,
+    version: int,
+    key: str,
+    debounce_ms: int = 1000,
+    height: int = 400,
+    placeholder: str = "",
+    highlights: Optional[Dict[int, float]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Render the client-side code editor.
+
+    Typing, indentation and syntax highlighting happen in the browser. The
+    code is sent back (triggering a rerun) only after ``debounce_ms`` of
+    inactivity, when the editor loses focus, or on Ctrl/Cmd+Enter.
+
+    Args:
+        code: Contents to show; only applied when ``version`` changes
+        version: Bumped by the server whenever it replaces the contents
+        key: Widget key
+        debounce_ms: Idle time before edits are synced to the server
+        height: Editor height in pixels
+        placeholder: Text shown while the editor is empty
+        highlights: {line: percent of run time} for lines to mark as hot
+
+    Returns:
+        None until the first sync, then ``{"code", "version", "run"}`` where
+        ``run`` changes each time the user asks to run the code from the keyboard
+    """
+    return _component(
+        code=code,
+        version=version,
+        debounce_ms=debounce_ms,
+        height=height,
+        placeholder=placeholder,
+        # JSON object keys must be strings
+        highlights={str(line): pct for line, pct in (highlights or {}).items()},
+        key=key,
+        default=None,
+    )
@@ -0,0 +1,21 @@
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+
+def rerun(scope: str = "fragment") -> None:
+    """
+    Rerun the calling fragment, or the whole app.
+
+    Fragment-scoped reruns are only allowed while Streamlit is rerunning just
+    that fragment; when a fragment's action fires during a full-app run
+    (e.g. the first render or a coalesced rerun) the whole app is rerun instead.
+
+    Args:
+        scope: "fragment" or "app"
+    """
+    if scope == "fragment":
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            pass
+    st.rerun()
@@ -19,10 +19,13 @@ class Sidebar:
         """
         Render the sidebar with UI configuration options only.
         
+        Call inside ``with st.sidebar:``; elements are written to the current
+        container so the sidebar can run as its own fragment.
+        
         Returns:
             Dictionary containing the current configuration values
         """
-        st.sidebar.title("⚙️ Settings")
+        st.title("⚙️ Settings")
         
         # Display backend configuration (read-only)
         self._render_backend_info()
@@ -41,33 +44,81 @@ class Sidebar:
     
     def _render_backend_info(self) -> None:
         """Render backend configuration info (read-only)."""
-        st.sidebar.subheader("🔧 Backend Configuration")
+        st.subheader("🔧 Backend Configuration")
+        
+        from models.router import get_model_router
         
         # Display current backend settings (read-only)
-        with st.sidebar.container():
-            st.markdown("**Provider:** Google Gemini")
+        with st.container():
+            backend = get_model_router().backend_for(self.settings.model_name)
+            st.markdown(f"**Provider:** {backend.label}")
             st.markdown(f"**Model:** {self.settings.model_name}")
+            st.markdown(f"**Cheap Model:** {self.settings.cheap_model_name}")
+            if self.settings.local_model_name:
+                st.markdown(f"**Local Model:** {self.settings.local_model_name}")
             st.markdown(f"**App:** {self.settings.app_title}")
             
             # Show API key status (without revealing the key)
-            if hasattr(self.settings, 'google_api_key') and self.settings.google_api_key:
+            if backend.name != "gemini":
+                st.markdown(f"**Endpoint:** {self.settings.openai_base_url}")
+            elif hasattr(self.settings, 'google_api_key') and self.settings.google_api_key:
                 st.markdown("**API Key:** ✅ Configured")
             else:
                 st.markdown("**API Key:** ❌ Not configured")
+        
+        self._render_model_routes()
+    
+    def _render_model_routes(self) -> None:
+        """Render the current model route for each task."""
+        from models.batching import get_llm_batcher
+        from models.prompt_cache import get_prefix_registry
+        from models.rate_limiter import get_rate_limiter
+        from models.router import get_model_router
+        
+        with st.expander("🔀 Model Routing"):
+            for task, route in get_model_router().stats().items():
+                model = self.settings.cheap_model_name if route["downgraded"] else route["primary"]
+                status = " ⬇️ downgraded" if route["downgraded"] else ""
+                st.markdown(f"**{task}:** {model}{status}")
+                if route["calls"]:
+                    st.caption(f"{route['calls']} calls · ~{route['avg_latency_ms']} ms")
+            
+            prompt_cache = get_prefix_registry().stats()
+            if prompt_cache["input_tokens"]:
+                st.caption(
+                    f"Prompt cache: {prompt_cache['cached_input_tokens']:,} of "
+                    f"{prompt_cache['input_tokens']:,} input tokens cached ({prompt_cache['cached_ratio']:.0%})"
+                )
+            
+            batching = get_llm_batcher().stats()
+            if batching["batches"]:
+                st.caption(
+                    f"Batching: {batching['requests']} tool calls in {batching['batches']} dispatches · "
+                    f"queue p95 {batching['queue_ms_p95']} ms"
+                )
+            
+            limiter = get_rate_limiter()
+            if limiter is not None:
+                saturation = limiter.saturation()
+                status = "⚠️ saturated" if saturation["saturated"] else "ok"
+                st.caption(
+                    f"Rate limit: {status} · est. wait {saturation['estimated_wait_s']}s · "
+                    f"{saturation['queued']} queued"
+                )
     
     def _render_chat_section(self) -> None:
         """Render chat configuration section."""
-        st.sidebar.subheader("💬 Chat Settings")
+        st.subheader("💬 Chat Settings")
         
         # Auto-scroll
-        auto_scroll = st.sidebar.checkbox(
+        auto_scroll = st.checkbox(
             "Auto-scroll to bottom",
             value=True,
             help="Automatically scroll to the latest message"
         )
         
         # Show timestamps
-        show_timestamps = st.sidebar.checkbox(
+        show_timestamps = st.checkbox(
             "Show timestamps",
             value=True,
             help="Display timestamps for each message"
@@ -80,14 +131,14 @@ class Sidebar:
     
     def _render_thread_section(self) -> None:
         """Render thread management section."""
-        st.sidebar.subheader("🧵 Thread Management")
+        st.subheader("🧵 Thread Management")
         
         # Current thread info
         current_thread = st.session_state.get("current_thread_id", "default")
-        st.sidebar.info(f"Current Thread: {current_thread}")
+        st.info(f"Current Thread: {current_thread}")
         
         # Thread actions
-        col1, col2 = st.sidebar.columns(2)
+        col1, col2 = st.columns(2)
         
         with col1:
             if st.button("🆕 New Thread", help="Start a new conversation thread"):
@@ -99,7 +150,7 @@ class Sidebar:
         
         # Thread list (if available)
         if "thread_list" in st.session_state and st.session_state.thread_list:
-            selected_thread = st.sidebar.selectbox(
+            selected_thread = st.selectbox(
                 "Switch Thread",
                 options=st.session_state.thread_list,
                 help="Switch to a different conversation thread"
@@ -110,7 +161,7 @@ class Sidebar:
     
     def _render_advanced_section(self) -> None:
         """Render advanced settings section."""
-        with st.sidebar.expander("🔧 Advanced Settings"):
+        with st.expander("🔧 Advanced Settings"):
             # Streaming
             enable_streaming = st.checkbox(
                 "Enable Streaming",
@@ -144,7 +195,7 @@ class Sidebar:
         import uuid
         new_thread_id = str(uuid.uuid4())[:8]
         st.session_state.current_thread_id = new_thread_id
-        st.session_state.messages = []
+        st.session_state.message_log.clear()
         
         # Add to thread list
         if "thread_list" not in st.session_state:
@@ -158,7 +209,7 @@ class Sidebar:
     
     def _clear_current_chat(self) -> None:
         """Clear the current conversation."""
-        st.session_state.messages = []
+        st.session_state.message_log.clear()
         st.success("Chat cleared!")
         st.rerun()
     
@@ -166,7 +217,7 @@ class Sidebar:
         """Switch to a different thread."""
         st.session_state.current_thread_id = thread_id
         # Load thread messages (implement as needed)
-        st.session_state.messages = []
+        st.session_state.message_log.clear()
         st.success(f"Switched to thread: {thread_id}")
         st.rerun()
     
@@ -183,14 +234,17 @@ class Sidebar:
     
     def render_model_status(self) -> None:
         """Render model status indicator using backend configuration."""
+        from models.router import get_model_router
+        
         status_color = "🟢"
-        st.sidebar.markdown(f"{status_color} **Google Gemini** - {self.settings.model_name}")
+        backend = get_model_router().backend_for(self.settings.model_name)
+        st.markdown(f"{status_color} **{backend.label}** - {self.settings.model_name}")
     
     def render_usage_stats(self) -> None:
         """Render usage statistics."""
         if st.session_state.get("debug_mode", False):
-            with st.sidebar.expander("📊 Usage Stats"):
-                messages_count = len(st.session_state.get("messages", []))
+            with st.expander("📊 Usage Stats"):
+                messages_count = len(st.session_state.get("message_log") or [])
                 st.metric("Messages", messages_count)
                 
                 tokens_used = st.session_state.get("total_tokens_used", 0)